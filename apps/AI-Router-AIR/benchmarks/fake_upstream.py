@@ -0,0 +1,150 @@
+"""Fake OpenAI-compatible upstream used to benchmark AIR proxy overhead.
+
+Serves `/v1/models`, `/v1/chat/completions` (streaming and not) and
+`/v1/audio/speech` with a configurable first-token latency, token rate,
+tokens per SSE chunk and audio payload size, so the only variable between a
+direct run and a run through AIR is the proxy itself.
+
+Run standalone with:
+    python -m benchmarks.fake_upstream --port 5599 --latency-ms 20 --tokens-per-second 400
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+FAKE_MODEL_ID = "bench-model"
+FAKE_TTS_MODEL_ID = "bench-tts"
+
+
+@dataclass(slots=True)
+class FakeUpstreamConfig:
+    """Timing and payload shape of the fake upstream."""
+
+    latency_ms: float = 20.0
+    tokens_per_second: float = 400.0
+    completion_tokens: int = 64
+    chunk_tokens: int = 1
+    audio_bytes: int = 64 * 1024
+    audio_chunk_bytes: int = 4096
+
+
+def _completion_payload(model: str, content: str, completion_tokens: int) -> dict:
+    """Build a non-streaming chat completion body with usage counters."""
+    return {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 8, "completion_tokens": completion_tokens, "total_tokens": 8 + completion_tokens},
+    }
+
+
+def _chunk_payload(model: str, content: str) -> str:
+    """Encode one streamed delta as an SSE data line."""
+    body = {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion.chunk",
+        "model": model,
+        "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+    }
+    return f"data: {json.dumps(body, separators=(',', ':'))}\n\n"
+
+
+def create_app(config: FakeUpstreamConfig | None = None) -> FastAPI:
+    """Create the fake upstream FastAPI app for the given timing configuration."""
+    config = config or FakeUpstreamConfig()
+    app = FastAPI(title="AIR benchmark fake upstream")
+    token_delay = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+    @app.get("/v1/models")
+    async def list_models():
+        """Advertise one chat model and one TTS model."""
+        return {
+            "object": "list",
+            "data": [
+                {"id": FAKE_MODEL_ID, "object": "model", "max_model_len": 32768},
+                {"id": FAKE_TTS_MODEL_ID, "object": "model", "task": "text-to-speech"},
+            ],
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        """Answer after the configured latency, streaming tokens at the configured rate."""
+        body = await request.json()
+        model = str(body.get("model") or FAKE_MODEL_ID)
+        await asyncio.sleep(config.latency_ms / 1000)
+
+        if not body.get("stream"):
+            await asyncio.sleep(token_delay * config.completion_tokens)
+            content = " ".join(["tok"] * config.completion_tokens)
+            return JSONResponse(_completion_payload(model, content, config.completion_tokens))
+
+        async def stream():
+            """Emit chunk_tokens tokens per SSE event, then the [DONE] marker."""
+            emitted = 0
+            while emitted < config.completion_tokens:
+                batch = min(config.chunk_tokens, config.completion_tokens - emitted)
+                await asyncio.sleep(token_delay * batch)
+                emitted += batch
+                yield _chunk_payload(model, "tok " * batch)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.post("/v1/audio/speech")
+    async def audio_speech(request: Request):
+        """Return audio_bytes of fake audio, streamed in audio_chunk_bytes pieces when asked."""
+        body = await request.json()
+        await asyncio.sleep(config.latency_ms / 1000)
+        payload = b"\x00" * config.audio_bytes
+
+        if not body.get("stream"):
+            return Response(content=payload, media_type="audio/mpeg")
+
+        async def stream():
+            """Yield the audio payload in fixed-size chunks."""
+            for offset in range(0, len(payload), config.audio_chunk_bytes):
+                yield payload[offset:offset + config.audio_chunk_bytes]
+                await asyncio.sleep(0)
+
+        return StreamingResponse(stream(), media_type="audio/mpeg")
+
+    return app
+
+
+def main() -> None:
+    """Parse CLI options and serve the fake upstream with uvicorn."""
+    import uvicorn
+
+    defaults = FakeUpstreamConfig()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5599)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--completion-tokens", type=int, default=defaults.completion_tokens)
+    parser.add_argument("--chunk-tokens", type=int, default=defaults.chunk_tokens)
+    parser.add_argument("--audio-bytes", type=int, default=defaults.audio_bytes)
+    parser.add_argument("--audio-chunk-bytes", type=int, default=defaults.audio_chunk_bytes)
+    args = parser.parse_args()
+
+    config = FakeUpstreamConfig(
+        latency_ms=args.latency_ms,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        chunk_tokens=args.chunk_tokens,
+        audio_bytes=args.audio_bytes,
+        audio_chunk_bytes=args.audio_chunk_bytes,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
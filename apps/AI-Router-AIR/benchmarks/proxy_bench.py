@@ -0,0 +1,414 @@
+"""Measure the latency, throughput and memory AIR adds on top of an upstream.
+
+Starts the fake upstream from `benchmarks.fake_upstream` and an AIR server
+pointed at it (both as subprocesses), then runs every scenario twice with the
+same concurrent load: once straight at the upstream and once through AIR.
+The difference between the two runs is the proxy overhead.
+
+Reported per scenario:
+- added p50/p95/p99 latency (and time to first chunk for streams)
+- added mean delay between streamed chunks
+- requests per second per core, i.e. requests served per AIR CPU-second
+- AIR resident memory growth
+
+Usage:
+    python -m benchmarks.proxy_bench                    # run and print the report
+    python -m benchmarks.proxy_bench --save-baseline    # also store it as the baseline
+    python -m benchmarks.proxy_bench --compare          # exit 1 on regressions vs the baseline
+
+CPU and memory sampling read /proc and are skipped on other platforms.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import httpx
+
+from benchmarks.fake_upstream import FAKE_MODEL_ID, FAKE_TTS_MODEL_ID, FakeUpstreamConfig
+
+AIR_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_BASELINE_PATH = AIR_ROOT / "benchmarks" / "baselines" / "proxy_bench.json"
+STARTUP_TIMEOUT_SECONDS = 30.0
+
+# Metrics where a larger value is a regression, with the absolute slack below which
+# differences are treated as noise.
+LOWER_IS_BETTER_FLOORS = {
+    "added_p50_ms": 2.0,
+    "added_p95_ms": 5.0,
+    "added_p99_ms": 10.0,
+    "added_first_chunk_p50_ms": 2.0,
+    "added_first_chunk_p95_ms": 5.0,
+    "added_chunk_gap_ms": 1.0,
+    "memory_growth_kb": 4096.0,
+}
+HIGHER_IS_BETTER = ("rps_per_core",)
+
+
+@dataclass(slots=True)
+class Scenario:
+    """One request shape driven against both the upstream and AIR."""
+
+    name: str
+    path: str
+    body: dict
+    stream: bool = False
+
+
+@dataclass(slots=True)
+class RunSamples:
+    """Raw timings collected for one scenario run."""
+
+    latencies_ms: list[float] = field(default_factory=list)
+    first_chunk_ms: list[float] = field(default_factory=list)
+    chunk_gaps_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    wall_seconds: float = 0.0
+
+
+SCENARIOS = [
+    Scenario(
+        name="chat",
+        path="/v1/chat/completions",
+        body={"model": FAKE_MODEL_ID, "messages": [{"role": "user", "content": "hello"}]},
+    ),
+    Scenario(
+        name="chat_stream",
+        path="/v1/chat/completions",
+        body={"model": FAKE_MODEL_ID, "messages": [{"role": "user", "content": "hello"}], "stream": True},
+        stream=True,
+    ),
+    Scenario(
+        name="speech",
+        path="/v1/audio/speech",
+        body={"model": FAKE_TTS_MODEL_ID, "input": "hello", "voice": "alloy"},
+    ),
+    Scenario(
+        name="speech_stream",
+        path="/v1/audio/speech",
+        body={"model": FAKE_TTS_MODEL_ID, "input": "hello", "voice": "alloy", "stream": True},
+        stream=True,
+    ),
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of values (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _mean(values: list[float]) -> float:
+    """Return the arithmetic mean of values (0.0 for an empty list)."""
+    return sum(values) / len(values) if values else 0.0
+
+
+def _free_port() -> int:
+    """Ask the OS for an unused localhost TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _process_cpu_seconds(pid: int) -> float | None:
+    """Return user+system CPU seconds consumed by pid, from /proc."""
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    # utime and stime are fields 14 and 15 of stat; index 11/12 after the command name
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _process_rss_kb(pid: int) -> int | None:
+    """Return the resident set size of pid in kB, from /proc."""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+async def _wait_until_ready(url: str, timeout: float = STARTUP_TIMEOUT_SECONDS) -> None:
+    """Poll url until it answers 200 or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(timeout=2.0) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+async def _one_request(client: httpx.AsyncClient, scenario: Scenario, samples: RunSamples) -> None:
+    """Send one scenario request and record its timings into samples."""
+    started = time.perf_counter()
+    try:
+        if not scenario.stream:
+            response = await client.post(scenario.path, json=scenario.body)
+            if response.status_code != 200:
+                samples.errors += 1
+                return
+        else:
+            last_chunk_at = None
+            async with client.stream("POST", scenario.path, json=scenario.body) as response:
+                if response.status_code != 200:
+                    samples.errors += 1
+                    return
+                async for chunk in response.aiter_raw():
+                    if not chunk:
+                        continue
+                    now = time.perf_counter()
+                    if last_chunk_at is None:
+                        samples.first_chunk_ms.append((now - started) * 1000)
+                    else:
+                        samples.chunk_gaps_ms.append((now - last_chunk_at) * 1000)
+                    last_chunk_at = now
+    except httpx.HTTPError:
+        samples.errors += 1
+        return
+    samples.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+
+async def run_load(base_url: str, scenario: Scenario, requests: int, concurrency: int) -> RunSamples:
+    """Drive `requests` scenario requests at base_url with `concurrency` in flight."""
+    samples = RunSamples()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for index in range(requests):
+            queue.put_nowait(index)
+
+        async def worker() -> None:
+            """Pull request slots off the queue until it is drained."""
+            while True:
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await _one_request(client, scenario, samples)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        samples.wall_seconds = time.perf_counter() - started
+    return samples
+
+
+def summarize(direct: RunSamples, proxied: RunSamples, cpu_seconds: float | None, rss_growth_kb: int | None) -> dict:
+    """Turn paired direct/proxied samples into the per-scenario report metrics."""
+    requests = len(proxied.latencies_ms)
+    metrics = {
+        "requests": requests,
+        "errors": proxied.errors,
+        "direct_p50_ms": round(percentile(direct.latencies_ms, 50), 3),
+        "proxied_p50_ms": round(percentile(proxied.latencies_ms, 50), 3),
+        "added_p50_ms": round(percentile(proxied.latencies_ms, 50) - percentile(direct.latencies_ms, 50), 3),
+        "added_p95_ms": round(percentile(proxied.latencies_ms, 95) - percentile(direct.latencies_ms, 95), 3),
+        "added_p99_ms": round(percentile(proxied.latencies_ms, 99) - percentile(direct.latencies_ms, 99), 3),
+        "rps": round(requests / proxied.wall_seconds, 2) if proxied.wall_seconds else 0.0,
+    }
+    if proxied.first_chunk_ms:
+        for pct in (50, 95, 99):
+            metrics[f"added_first_chunk_p{pct}_ms"] = round(
+                percentile(proxied.first_chunk_ms, pct) - percentile(direct.first_chunk_ms, pct), 3
+            )
+        metrics["added_chunk_gap_ms"] = round(_mean(proxied.chunk_gaps_ms) - _mean(direct.chunk_gaps_ms), 3)
+    if cpu_seconds:
+        metrics["air_cpu_seconds"] = round(cpu_seconds, 3)
+        metrics["rps_per_core"] = round(requests / cpu_seconds, 2)
+    if rss_growth_kb is not None:
+        metrics["memory_growth_kb"] = rss_growth_kb
+    return metrics
+
+
+def compare_to_baseline(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return a human-readable line for every metric that regressed beyond tolerance."""
+    regressions = []
+    for name, metrics in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric, floor in LOWER_IS_BETTER_FLOORS.items():
+            if metric not in metrics or metric not in previous:
+                continue
+            limit = max(previous[metric], 0.0) * (1 + tolerance) + floor
+            if metrics[metric] > limit:
+                regressions.append(f"{name}.{metric}: {metrics[metric]} > {round(limit, 3)} (baseline {previous[metric]})")
+        for metric in HIGHER_IS_BETTER:
+            if metric not in metrics or metric not in previous:
+                continue
+            limit = previous[metric] * (1 - tolerance)
+            if metrics[metric] < limit:
+                regressions.append(f"{name}.{metric}: {metrics[metric]} < {round(limit, 2)} (baseline {previous[metric]})")
+    return regressions
+
+
+def _start_upstream(port: int, config: FakeUpstreamConfig) -> subprocess.Popen:
+    """Launch the fake upstream on port as a subprocess."""
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.fake_upstream",
+            "--port", str(port),
+            "--latency-ms", str(config.latency_ms),
+            "--tokens-per-second", str(config.tokens_per_second),
+            "--completion-tokens", str(config.completion_tokens),
+            "--chunk-tokens", str(config.chunk_tokens),
+            "--audio-bytes", str(config.audio_bytes),
+            "--audio-chunk-bytes", str(config.audio_chunk_bytes),
+        ],
+        cwd=AIR_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _start_air(port: int, upstream_url: str, workdir: str) -> subprocess.Popen:
+    """Launch AIR on port with the fake upstream as its only LLM and TTS provider."""
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if not key.startswith(("LLM_", "TTS_", "STT_", "MODEL_"))
+    }
+    env.update({
+        "LLM_BASE_URL_1": upstream_url,
+        "TTS_BASE_URL_1": upstream_url,
+        "DISCOVERY_ENABLED": "false",
+        "PYTHONPATH": str(AIR_ROOT),
+    })
+    # Run from a scratch directory so a developer's .env does not add real providers
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def run_benchmark(config: FakeUpstreamConfig, requests: int, concurrency: int, warmup: int) -> dict:
+    """Start both servers, run every scenario direct and via AIR, and build the report."""
+    upstream_port, air_port = _free_port(), _free_port()
+    upstream_url = f"http://127.0.0.1:{upstream_port}"
+    air_url = f"http://127.0.0.1:{air_port}"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        upstream = _start_upstream(upstream_port, config)
+        air = _start_air(air_port, f"{upstream_url}/v1", workdir)
+        try:
+            await _wait_until_ready(f"{upstream_url}/v1/models")
+            await _wait_until_ready(f"{air_url}/health")
+            # Populate AIR's model registry before timing anything
+            await _wait_until_ready(f"{air_url}/v1/models/?refresh=true")
+
+            scenarios = {}
+            rss_start = _process_rss_kb(air.pid)
+            for scenario in SCENARIOS:
+                await run_load(upstream_url, scenario, warmup, concurrency)
+                await run_load(air_url, scenario, warmup, concurrency)
+
+                direct = await run_load(upstream_url, scenario, requests, concurrency)
+                cpu_before, rss_before = _process_cpu_seconds(air.pid), _process_rss_kb(air.pid)
+                proxied = await run_load(air_url, scenario, requests, concurrency)
+                cpu_after, rss_after = _process_cpu_seconds(air.pid), _process_rss_kb(air.pid)
+
+                cpu_seconds = cpu_after - cpu_before if cpu_before is not None and cpu_after is not None else None
+                rss_growth = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+                scenarios[scenario.name] = summarize(direct, proxied, cpu_seconds, rss_growth)
+            rss_end = _process_rss_kb(air.pid)
+        finally:
+            for process in (air, upstream):
+                process.terminate()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+    return {
+        "config": {"requests": requests, "concurrency": concurrency, "warmup": warmup, "upstream": asdict(config)},
+        "air_rss_start_kb": rss_start,
+        "air_rss_end_kb": rss_end,
+        "scenarios": scenarios,
+    }
+
+
+def _print_report(report: dict) -> None:
+    """Print the report as a compact table."""
+    columns = ("added_p50_ms", "added_p95_ms", "added_p99_ms", "added_first_chunk_p50_ms", "added_chunk_gap_ms", "rps_per_core", "memory_growth_kb", "errors")
+    print(f"{'scenario':<15}" + "".join(f"{column:>26}" for column in columns))
+    for name, metrics in report["scenarios"].items():
+        print(f"{name:<15}" + "".join(f"{str(metrics.get(column, '-')):>26}" for column in columns))
+    if report.get("air_rss_start_kb") is not None and report.get("air_rss_end_kb") is not None:
+        print(f"AIR RSS {report['air_rss_start_kb']} kB -> {report['air_rss_end_kb']} kB")
+
+
+def main() -> None:
+    """Parse CLI options, run the benchmark and handle baselines."""
+    defaults = FakeUpstreamConfig()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per scenario and target")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--completion-tokens", type=int, default=defaults.completion_tokens)
+    parser.add_argument("--chunk-tokens", type=int, default=defaults.chunk_tokens)
+    parser.add_argument("--audio-bytes", type=int, default=defaults.audio_bytes)
+    parser.add_argument("--audio-chunk-bytes", type=int, default=defaults.audio_chunk_bytes)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write this run to --baseline")
+    parser.add_argument("--compare", action="store_true", help="fail if this run regresses against --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression (0.2 = 20%%)")
+    parser.add_argument("--output", type=Path, help="also write the JSON report here")
+    args = parser.parse_args()
+
+    config = FakeUpstreamConfig(
+        latency_ms=args.latency_ms,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        chunk_tokens=args.chunk_tokens,
+        audio_bytes=args.audio_bytes,
+        audio_chunk_bytes=args.audio_chunk_bytes,
+    )
+    report = asyncio.run(run_benchmark(config, args.requests, args.concurrency, args.warmup))
+    _print_report(report)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+            sys.exit(2)
+        regressions = compare_to_baseline(report, json.loads(args.baseline.read_text()), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
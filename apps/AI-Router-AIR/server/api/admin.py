@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException
 from typing import List
 import httpx
 from server.core.config import settings
+from server.core.http_transport import upstream_transport
 from server.schemas.provider_schema import ProviderInput, ProviderConfig, ProviderStatus, AcceptProviderInput
 from server.services.provider_manager import provider_manager
 import logging
@@ -150,6 +151,17 @@ async def get_all_status():
         ))
     return results
 
+@router.get("/metrics")
+async def get_metrics():
+    """Return upstream connection pool metrics and per-model load counters."""
+    return {
+        "transport": upstream_transport.metrics(),
+        "model_load": {
+            model_id: {"in_flight": load.in_flight, "latency_ms": load.latency_ms, "completed": load.completed}
+            for model_id, load in provider_manager.model_load.items()
+        },
+    }
+
 @router.get("/discovered")
 async def get_discovered_providers():
     """Return newly discovered providers that are not yet configured."""
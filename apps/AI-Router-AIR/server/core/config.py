@@ -1,9 +1,9 @@
 """Application settings and provider loading for the AIR server."""
 
 import os
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from server.schemas.provider_schema import ProviderConfig
+from server.schemas.provider_schema import ModelAliasMember, ProviderConfig, UpstreamPoolOverride
 from server.core.env_manager import EnvFileManager
 
 class Settings(BaseSettings):
@@ -14,6 +14,26 @@ class Settings(BaseSettings):
     PROVIDERS: List[ProviderConfig] = []
     DISCOVERY_ENABLED: bool = True
     EXTRA_SCAN_PORTS: str = ""
+    # JSON map of alias -> ordered fallback chain, e.g.
+    # {"triage": [{"model": "qwen3-30b", "max_in_flight": 2, "max_latency_ms": 8000}, "qwen3-4b"]}
+    MODEL_ALIASES: Dict[str, List[ModelAliasMember]] = {}
+    # JSON map of model id -> max context tokens; overrides what providers advertise
+    MODEL_CONTEXT_WINDOWS: Dict[str, int] = {}
+    # Shared upstream connection pools (one pool per provider origin)
+    UPSTREAM_MAX_CONNECTIONS: int = 100
+    UPSTREAM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    UPSTREAM_KEEPALIVE_EXPIRY: float = 30.0
+    UPSTREAM_CONNECT_TIMEOUT: float = 10.0
+    UPSTREAM_READ_TIMEOUT: float = 300.0
+    UPSTREAM_WRITE_TIMEOUT: float = 300.0
+    UPSTREAM_POOL_TIMEOUT: float = 300.0
+    # Time allowed until response headers arrive; read timeout then applies per body chunk
+    UPSTREAM_FIRST_BYTE_TIMEOUT: float = 300.0
+    # Requires the optional h2 package (pip install "ai-router-air[http2]")
+    UPSTREAM_HTTP2: bool = False
+    # JSON map of provider name -> pool overrides, e.g.
+    # {"LLM Provider 1": {"max_connections": 8, "first_byte_timeout": 60, "http2": true}}
+    UPSTREAM_POOL_OVERRIDES: Dict[str, UpstreamPoolOverride] = {}
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,9 +1,57 @@
 """FastAPI dependencies for routing AIR requests to the right provider."""
 
+import json
+from typing import Any, Optional
+
 from fastapi import Request
 from server.services.provider_manager import provider_manager
 from server.schemas.provider_schema import ProviderConfig
-from server.core.exceptions import ProviderNotFoundError
+from server.core.exceptions import ContextLengthExceededError, ProviderNotFoundError
+
+# Rough characters-per-token ratio for English prose. It is only an estimate: code
+# and non-English text usually take more tokens per character, so the real count can
+# be higher, and the upstream remains the final judge of prompts that fit here.
+CHARS_PER_TOKEN_ESTIMATE = 4
+
+
+def estimate_prompt_tokens(body: Any) -> int:
+    """Cheaply estimate the prompt tokens of a chat/completions payload from its text length."""
+    if not isinstance(body, dict):
+        return 0
+
+    chars = 0
+    messages = body.get("messages")
+    if isinstance(messages, list):
+        for message in messages:
+            if not isinstance(message, dict):
+                continue
+            content = message.get("content")
+            if isinstance(content, str):
+                chars += len(content)
+            elif isinstance(content, list):
+                for part in content:
+                    if isinstance(part, dict) and isinstance(part.get("text"), str):
+                        chars += len(part["text"])
+
+    prompt = body.get("prompt")
+    if isinstance(prompt, str):
+        chars += len(prompt)
+
+    tools = body.get("tools")
+    if isinstance(tools, list) and tools:
+        chars += len(json.dumps(tools, separators=(",", ":")))
+
+    return chars // CHARS_PER_TOKEN_ESTIMATE
+
+
+def _select_model_replica(model: str, required_tokens: int) -> Optional[ProviderConfig]:
+    """Pick a provider hosting `model` with room for the prompt, rejecting early if none has it."""
+    provider = provider_manager.select_replica(model, required_tokens)
+    if provider is None:
+        largest_window = provider_manager.largest_context_window([model])
+        if largest_window is not None:
+            raise ContextLengthExceededError(model, required_tokens, largest_window)
+    return provider
 
 
 async def get_provider(request: Request) -> ProviderConfig:
@@ -25,8 +73,21 @@ async def get_provider(request: Request) -> ProviderConfig:
 
     if "chat/completions" in path or "completions" in path:
         model = body.get("model") if body else None
+        required_tokens = estimate_prompt_tokens(body)
+        if model and model in provider_manager.model_aliases:
+            route = provider_manager.resolve_model_alias(model, required_tokens)
+            if route:
+                # ProxyEngine rewrites the upstream model id and reports the choice from this
+                request.state.model_route = route
+                return route.provider
+            largest_window = provider_manager.largest_context_window(
+                [member.model for member in provider_manager.model_aliases[model]]
+            )
+            if largest_window is not None and largest_window < required_tokens:
+                raise ContextLengthExceededError(model, required_tokens, largest_window)
+            raise ProviderNotFoundError(f"No routable model found for alias: {model}")
         if model:
-            provider = provider_manager.get_provider_for_model(model)
+            provider = _select_model_replica(model, required_tokens) or provider_manager.get_provider_for_model(model)
             if provider:
                 return provider
 
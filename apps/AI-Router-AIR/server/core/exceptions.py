@@ -18,6 +18,18 @@ class ProviderUnavailableError(HTTPException):
     def __init__(self, detail: str = "Provider is currently unavailable"):
         super().__init__(status_code=503, detail=detail)
 
+class ContextLengthExceededError(HTTPException):
+    """Raised before forwarding when a prompt cannot fit any eligible model's context window."""
+
+    def __init__(self, model: str, required_tokens: int, context_window: int):
+        super().__init__(
+            status_code=400,
+            detail=(
+                f"Prompt needs about {required_tokens} tokens but the largest context window "
+                f"available for model '{model}' is {context_window} tokens"
+            ),
+        )
+
 class ProxyError(HTTPException):
     """Raised when forwarding a request to an upstream provider fails."""
 
@@ -0,0 +1,246 @@
+"""Shared upstream HTTP transport with per-provider connection pools for AIR."""
+
+import asyncio
+import importlib.util
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from server.core.config import settings
+from server.core.logging import logger
+
+
+def http2_available() -> bool:
+    """Return True when the optional h2 package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def origin_of(url: httpx.URL | str) -> str:
+    """Return the scheme://host:port origin a connection pool is keyed by."""
+    url = httpx.URL(url)
+    port = url.port or (443 if url.scheme == "https" else 80)
+    return f"{url.scheme}://{url.host}:{port}"
+
+
+@dataclass(slots=True)
+class PoolConfig:
+    """Effective limits and timeouts for one upstream connection pool."""
+
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry: float
+    first_byte_timeout: float
+    http2: bool
+
+
+@dataclass(slots=True)
+class PoolStats:
+    """Counters for one upstream connection pool.
+
+    `awaiting_first_byte` counts requests sent but still waiting for response
+    headers; `first_byte_ms` sums header latency over `responses` so the
+    metrics can report an average.
+    """
+
+    requests: int = 0
+    responses: int = 0
+    awaiting_first_byte: int = 0
+    connections_opened: int = 0
+    first_byte_timeouts: int = 0
+    errors: int = 0
+    first_byte_ms: float = 0.0
+
+
+@dataclass(slots=True)
+class UpstreamPool:
+    """One keepalive connection pool serving a single upstream origin."""
+
+    origin: str
+    provider_name: Optional[str]
+    config: PoolConfig
+    transport: httpx.AsyncHTTPTransport
+    stats: PoolStats
+
+    def connection_counts(self) -> Tuple[int, int]:
+        """Return (open, idle) connection counts from the underlying httpcore pool."""
+        connections = list(getattr(getattr(self.transport, "_pool", None), "connections", None) or [])
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return len(connections), idle
+
+    def as_metrics(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot of this pool's config and counters."""
+        stats = self.stats
+        open_connections, idle_connections = self.connection_counts()
+        return {
+            "origin": self.origin,
+            "provider": self.provider_name,
+            "http2": self.config.http2,
+            "max_connections": self.config.max_connections,
+            "max_keepalive_connections": self.config.max_keepalive_connections,
+            "keepalive_expiry": self.config.keepalive_expiry,
+            "first_byte_timeout": self.config.first_byte_timeout,
+            "open_connections": open_connections,
+            "idle_connections": idle_connections,
+            "connections_opened": stats.connections_opened,
+            "requests": stats.requests,
+            "awaiting_first_byte": stats.awaiting_first_byte,
+            "errors": stats.errors,
+            "first_byte_timeouts": stats.first_byte_timeouts,
+            "avg_first_byte_ms": round(stats.first_byte_ms / stats.responses, 2) if stats.responses else None,
+        }
+
+
+class UpstreamTransport(httpx.AsyncBaseTransport):
+    """
+    Route requests through one keepalive pool per upstream origin.
+
+    Pools are created lazily from the UPSTREAM_* settings, with overrides from
+    UPSTREAM_POOL_OVERRIDES for the provider whose base_url has that origin.
+    Closing a client built on this transport leaves the pools open so short-lived
+    clients still reuse warm connections; call `close_pools` on shutdown.
+    """
+
+    def __init__(self):
+        self._pools: Dict[str, UpstreamPool] = {}
+        self._warned_http2 = False
+
+    def _provider_for_origin(self, origin: str) -> Optional[str]:
+        """Return the name of the configured provider served from this origin, if any."""
+        for provider in settings.PROVIDERS:
+            try:
+                if origin_of(provider.base_url) == origin:
+                    return provider.name
+            except httpx.InvalidURL:
+                continue
+        return None
+
+    def _pool_config(self, provider_name: Optional[str]) -> PoolConfig:
+        """Merge global pool settings with the overrides for a provider."""
+        override = settings.UPSTREAM_POOL_OVERRIDES.get(provider_name) if provider_name else None
+
+        def pick(field: str, default: Any) -> Any:
+            value = getattr(override, field, None) if override is not None else None
+            return default if value is None else value
+
+        http2 = bool(pick("http2", settings.UPSTREAM_HTTP2))
+        if http2 and not http2_available():
+            if not self._warned_http2:
+                logger.warning("HTTP/2 requested for upstream pools but h2 is not installed; using HTTP/1.1")
+                self._warned_http2 = True
+            http2 = False
+
+        return PoolConfig(
+            max_connections=pick("max_connections", settings.UPSTREAM_MAX_CONNECTIONS),
+            max_keepalive_connections=pick("max_keepalive_connections", settings.UPSTREAM_MAX_KEEPALIVE_CONNECTIONS),
+            keepalive_expiry=pick("keepalive_expiry", settings.UPSTREAM_KEEPALIVE_EXPIRY),
+            first_byte_timeout=pick("first_byte_timeout", settings.UPSTREAM_FIRST_BYTE_TIMEOUT),
+            http2=http2,
+        )
+
+    def pool_for(self, url: httpx.URL | str) -> UpstreamPool:
+        """Return the pool for a URL's origin, creating it on first use."""
+        origin = origin_of(url)
+        pool = self._pools.get(origin)
+        if pool is None:
+            provider_name = self._provider_for_origin(origin)
+            config = self._pool_config(provider_name)
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=config.max_connections,
+                    max_keepalive_connections=config.max_keepalive_connections,
+                    keepalive_expiry=config.keepalive_expiry,
+                ),
+                http2=config.http2,
+            )
+            pool = UpstreamPool(origin, provider_name, config, transport, PoolStats())
+            self._pools[origin] = pool
+        return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """
+        Send a request on its origin's pool, enforcing the first-byte timeout.
+
+        The pooled transport returns as soon as response headers arrive, so
+        bounding this call bounds time-to-first-byte; body reads afterwards are
+        governed by the client's read timeout.
+        """
+        pool = self.pool_for(request.url)
+        stats = pool.stats
+        previous_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                stats.connections_opened += 1
+            if previous_trace is not None:
+                await previous_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        stats.requests += 1
+        stats.awaiting_first_byte += 1
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(
+                pool.transport.handle_async_request(request), timeout=pool.config.first_byte_timeout
+            )
+        except asyncio.TimeoutError as exc:
+            stats.first_byte_timeouts += 1
+            raise httpx.ReadTimeout(
+                f"No response headers from {pool.origin} within {pool.config.first_byte_timeout}s",
+                request=request,
+            ) from exc
+        except httpx.HTTPError:
+            stats.errors += 1
+            raise
+        finally:
+            stats.awaiting_first_byte -= 1
+
+        stats.responses += 1
+        stats.first_byte_ms += (time.perf_counter() - started) * 1000
+        return response
+
+    async def aclose(self) -> None:
+        """Keep shared pools open when an individual client is closed."""
+
+    async def close_pools(self) -> None:
+        """Close every pooled connection and forget the pools."""
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            await pool.transport.aclose()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return per-pool metrics plus the configured client timeouts."""
+        return {
+            "http2_available": http2_available(),
+            "timeouts": {
+                "connect": settings.UPSTREAM_CONNECT_TIMEOUT,
+                "read": settings.UPSTREAM_READ_TIMEOUT,
+                "write": settings.UPSTREAM_WRITE_TIMEOUT,
+                "pool": settings.UPSTREAM_POOL_TIMEOUT,
+                "first_byte": settings.UPSTREAM_FIRST_BYTE_TIMEOUT,
+            },
+            "pools": [pool.as_metrics() for pool in self._pools.values()],
+        }
+
+
+def upstream_timeout() -> httpx.Timeout:
+    """Build the client timeout from the separate connect/read/write/pool settings."""
+    return httpx.Timeout(
+        connect=settings.UPSTREAM_CONNECT_TIMEOUT,
+        read=settings.UPSTREAM_READ_TIMEOUT,
+        write=settings.UPSTREAM_WRITE_TIMEOUT,
+        pool=settings.UPSTREAM_POOL_TIMEOUT,
+    )
+
+
+def create_upstream_client(timeout: httpx.Timeout | float | None = None, **kwargs: Any) -> httpx.AsyncClient:
+    """Create an httpx client that sends through the shared upstream pools."""
+    return httpx.AsyncClient(
+        transport=upstream_transport,
+        timeout=upstream_timeout() if timeout is None else timeout,
+        **kwargs,
+    )
+
+
+upstream_transport = UpstreamTransport()
@@ -1,5 +1,7 @@
 """Proxying utilities for forwarding AIR requests to upstream providers."""
 
+import asyncio
+import contextlib
 import json
 import time
 from dataclasses import dataclass, field
@@ -7,14 +9,18 @@ from uuid import uuid4
 
 from fastapi import Request
 import httpx
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import Response, StreamingResponse, JSONResponse
 from server.schemas.provider_schema import ProviderConfig
 from server.core.exceptions import ProxyError
+from server.core.http_transport import create_upstream_client
 from server.core.logging import logger
+from server.services.provider_manager import ModelRoute, provider_manager
 
 LOG_PREVIEW_CHAR_LIMIT = 12000
 STREAM_PROGRESS_CHUNK_INTERVAL = 10
 TRACE_SUMMARY_DIVIDER = "-----------------------------*****-----------------------------"
+# nginx's "client closed request" status, recorded when the caller disconnects first
+CLIENT_CLOSED_REQUEST_STATUS = 499
 
 
 @dataclass(slots=True)
@@ -32,6 +38,7 @@ class TraceRequestRecord:
     total_tokens: int | None = None
     status_code: int | None = None
     content_type: str | None = None
+    aborted: bool = False
 
 
 @dataclass(slots=True)
@@ -99,6 +106,27 @@ def _trace_id_for(request: Request, request_id: str) -> str:
     )
 
 
+def _model_route_for(request: Request) -> ModelRoute | None:
+    """Return the alias routing decision attached to the request by get_provider, if any."""
+    route = getattr(request.state, "model_route", None)
+    return route if isinstance(route, ModelRoute) else None
+
+
+async def _wait_for_client_disconnect(request: Request) -> bool:
+    """
+    Wait until the downstream client disconnects.
+
+    Called once the request body has been consumed, so the next ASGI message is
+    `http.disconnect`. Returns False when the server hands back anything else,
+    meaning disconnects cannot be observed for this request.
+    """
+    try:
+        message = await request.receive()
+    except Exception:
+        return False
+    return isinstance(message, dict) and message.get("type") == "http.disconnect"
+
+
 def _request_sequence_for(trace_id: str) -> int:
     """Allocate the next sequence number for a trace."""
     summary = _trace_summaries.get(trace_id)
@@ -242,6 +270,7 @@ def _update_trace_response(
     content_type: str,
     elapsed_ms: float,
     payload: object | None,
+    aborted: bool = False,
 ) -> None:
     """Attach response metadata and usage information to a traced request."""
     summary = _trace_summaries.get(trace_id)
@@ -257,6 +286,7 @@ def _update_trace_response(
         item.prompt_tokens = prompt_tokens
         item.completion_tokens = completion_tokens
         item.total_tokens = total_tokens
+        item.aborted = aborted
         return
 
 
@@ -277,6 +307,7 @@ def _emit_trace_summary(summary: TraceSummary | None) -> None:
     total_prompt_tokens = sum(item.prompt_tokens or 0 for item in summary.requests)
     total_completion_tokens = sum(item.completion_tokens or 0 for item in summary.requests)
     total_elapsed_ms = sum(item.elapsed_ms or 0.0 for item in summary.requests)
+    aborted_requests = sum(1 for item in summary.requests if item.aborted)
 
     logger.info(TRACE_SUMMARY_DIVIDER)
     logger.info("Trace Summary: %s", summary.trace_id)
@@ -285,7 +316,7 @@ def _emit_trace_summary(summary: TraceSummary | None) -> None:
     logger.info("Requests:")
     for item in summary.requests:
         logger.info(
-            "- seq=%s kind=%s path=%s model=%s messages=%s tools=%s status=%s elapsed_ms=%.2f prompt_tokens=%s completion_tokens=%s total_tokens=%s",
+            "- seq=%s kind=%s path=%s model=%s messages=%s tools=%s status=%s elapsed_ms=%.2f prompt_tokens=%s completion_tokens=%s total_tokens=%s aborted=%s",
             item.sequence,
             _request_kind(item),
             item.path,
@@ -297,13 +328,15 @@ def _emit_trace_summary(summary: TraceSummary | None) -> None:
             item.prompt_tokens if item.prompt_tokens is not None else "-",
             item.completion_tokens if item.completion_tokens is not None else "-",
             item.total_tokens if item.total_tokens is not None else "-",
+            item.aborted,
         )
     logger.info(
-        "Counts: total_requests=%s total_prompt_tokens=%s total_completion_tokens=%s total_elapsed_ms=%.2f",
+        "Counts: total_requests=%s total_prompt_tokens=%s total_completion_tokens=%s total_elapsed_ms=%.2f aborted_requests=%s",
         len(summary.requests),
         total_prompt_tokens,
         total_completion_tokens,
         total_elapsed_ms,
+        aborted_requests,
     )
     logger.info(TRACE_SUMMARY_DIVIDER)
 
@@ -406,9 +439,18 @@ def _finalize_stream_trace(
     status_code: int,
     content_type: str,
     started_at: float,
+    aborted: bool = False,
 ) -> None:
     """Close out trace bookkeeping for a streamed upstream response."""
     elapsed_ms = (time.perf_counter() - started_at) * 1000
+    if aborted:
+        logger.info(
+            "[trace=%s req=%s seq=%s] Client disconnected mid-stream; closing upstream stream elapsed_ms=%.2f",
+            trace_id,
+            request_id,
+            sequence,
+            elapsed_ms,
+        )
     logger.info(
         "[trace=%s req=%s seq=%s] Upstream response status=%s content_type=%s elapsed_ms=%.2f",
         trace_id,
@@ -425,15 +467,68 @@ def _finalize_stream_trace(
         content_type=content_type,
         elapsed_ms=elapsed_ms,
         payload=None,
+        aborted=aborted,
+    )
+    _emit_trace_summary(_complete_trace_request(trace_id, sequence))
+
+
+def _record_client_abort(
+    *,
+    request_id: str,
+    trace_id: str,
+    sequence: int,
+    started_at: float,
+) -> Response:
+    """Trace an upstream request cancelled because the caller went away."""
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+    logger.info(
+        "[trace=%s req=%s seq=%s] Client disconnected before upstream answered; cancelled upstream request elapsed_ms=%.2f",
+        trace_id,
+        request_id,
+        sequence,
+        elapsed_ms,
+    )
+    _update_trace_response(
+        trace_id=trace_id,
+        sequence=sequence,
+        status_code=CLIENT_CLOSED_REQUEST_STATUS,
+        content_type="",
+        elapsed_ms=elapsed_ms,
+        payload=None,
+        aborted=True,
     )
     _emit_trace_summary(_complete_trace_request(trace_id, sequence))
+    # Nobody is listening any more; this only completes the ASGI exchange
+    return Response(status_code=CLIENT_CLOSED_REQUEST_STATUS)
 
 class ProxyEngine:
     """Forward JSON and multipart requests to upstream AI providers."""
 
     def __init__(self):
         # Long-lived client for connection pooling
-        self._client = httpx.AsyncClient(timeout=300.0)
+        self._client = create_upstream_client()
+
+    async def _await_unless_disconnected(self, request: Request, upstream_call):
+        """
+        Await an upstream httpx call, cancelling it if the downstream client disconnects first.
+
+        Cancelling the call closes the upstream connection, which is what makes
+        inference servers stop generating. Returns None when the client went away.
+        """
+        upstream_task = asyncio.ensure_future(upstream_call)
+        disconnect_task = asyncio.ensure_future(_wait_for_client_disconnect(request))
+        try:
+            await asyncio.wait({upstream_task, disconnect_task}, return_when=asyncio.FIRST_COMPLETED)
+            if not upstream_task.done() and disconnect_task.result():
+                upstream_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, httpx.HTTPError):
+                    await upstream_task
+                return None
+            return await upstream_task
+        finally:
+            disconnect_task.cancel()
+            if not upstream_task.done():
+                upstream_task.cancel()
 
     async def forward_request(self, request: Request, provider: ProviderConfig, path: str, body_bytes: bytes | None = None, *, is_stream: bool | None = None):
         """Forward a JSON or raw-byte request to the selected provider."""
@@ -450,6 +545,8 @@ class ProxyEngine:
         trace_id = _trace_id_for(request, request_id)
         sequence = _request_sequence_for(trace_id)
         started_at = time.perf_counter()
+        # Model whose in-flight slot is still held by this call (not yet handed to a stream)
+        load_model: str | None = None
 
         if provider.api_key and provider.api_key != "na":
             headers["Authorization"] = f"Bearer {provider.api_key}"
@@ -482,7 +579,11 @@ class ProxyEngine:
                         headers=headers,
                         content=body_bytes
                     )
-                    r = await self._client.send(req, stream=True)
+                    r = await self._await_unless_disconnected(request, self._client.send(req, stream=True))
+                    if r is None:
+                        return _record_client_abort(
+                            request_id=request_id, trace_id=trace_id, sequence=sequence, started_at=started_at
+                        )
                     logger.info(
                         "[trace=%s req=%s seq=%s] Upstream stream opened status=%s content_type=%s",
                         trace_id,
@@ -494,6 +595,7 @@ class ProxyEngine:
 
                     async def stream_generator():
                         """Yield raw upstream bytes while updating stream progress logs."""
+                        aborted = False
                         try:
                             chunk_count = 0
                             byte_count = 0
@@ -521,6 +623,10 @@ class ProxyEngine:
                                 byte_count,
                                 (time.perf_counter() - started_at) * 1000,
                             )
+                        except (GeneratorExit, asyncio.CancelledError):
+                            # The caller went away; closing `r` below aborts the upstream generation
+                            aborted = True
+                            raise
                         finally:
                             _finalize_stream_trace(
                                 request_id=request_id,
@@ -529,6 +635,7 @@ class ProxyEngine:
                                 status_code=r.status_code,
                                 content_type=r.headers.get("content-type", ""),
                                 started_at=started_at,
+                                aborted=aborted,
                             )
                             await r.aclose()
 
@@ -538,7 +645,13 @@ class ProxyEngine:
                         media_type=r.headers.get("content-type")
                     )
                 else:
-                    resp = await self._client.post(url, headers=headers, content=body_bytes)
+                    resp = await self._await_unless_disconnected(
+                        request, self._client.post(url, headers=headers, content=body_bytes)
+                    )
+                    if resp is None:
+                        return _record_client_abort(
+                            request_id=request_id, trace_id=trace_id, sequence=sequence, started_at=started_at
+                        )
                     _log_response_snapshot(
                         request_id=request_id,
                         trace_id=trace_id,
@@ -563,6 +676,12 @@ class ProxyEngine:
                 if isinstance(body, dict):
                     body.pop("store", None)
 
+                # Requests to a model alias go upstream under the chain member chosen for them
+                route = _model_route_for(request)
+                route_headers = route.as_headers() if route is not None else {}
+                if route is not None and isinstance(body, dict):
+                    body["model"] = route.model
+
                 _log_request_snapshot(
                     request_id=request_id,
                     trace_id=trace_id,
@@ -581,9 +700,19 @@ class ProxyEngine:
                     headers=headers,
                     json=body
                 )
+                load_model = _model_name(body)
+                provider_manager.begin_model_request(load_model)
 
                 if is_stream:
-                    r = await self._client.send(req, stream=True)
+                    r = await self._await_unless_disconnected(request, self._client.send(req, stream=True))
+                    if r is None:
+                        provider_manager.end_model_request(load_model)
+                        return _record_client_abort(
+                            request_id=request_id, trace_id=trace_id, sequence=sequence, started_at=started_at
+                        )
+                    opened_ms = (time.perf_counter() - started_at) * 1000
+                    # The generator releases the in-flight slot once the stream ends
+                    stream_load_model, load_model = load_model, None
                     logger.info(
                         "[trace=%s req=%s seq=%s] Upstream stream opened status=%s content_type=%s",
                         trace_id,
@@ -595,6 +724,7 @@ class ProxyEngine:
 
                     async def stream_generator():
                         """Yield streamed JSON or audio bytes from the upstream response."""
+                        aborted = False
                         try:
                             chunk_count = 0
                             byte_count = 0
@@ -622,6 +752,10 @@ class ProxyEngine:
                                 byte_count,
                                 (time.perf_counter() - started_at) * 1000,
                             )
+                        except (GeneratorExit, asyncio.CancelledError):
+                            # The caller went away; closing `r` below aborts the upstream generation
+                            aborted = True
+                            raise
                         finally:
                             _finalize_stream_trace(
                                 request_id=request_id,
@@ -630,7 +764,9 @@ class ProxyEngine:
                                 status_code=r.status_code,
                                 content_type=r.headers.get("content-type", ""),
                                 started_at=started_at,
+                                aborted=aborted,
                             )
+                            provider_manager.end_model_request(stream_load_model, opened_ms)
                             await r.aclose()
 
                     headers = {
@@ -638,6 +774,7 @@ class ProxyEngine:
                         "Cache-Control": "no-cache",
                         "Connection": "keep-alive",
                     }
+                    headers.update(route_headers)
 
                     # Propagate content type from upstream exactly, default to event-stream if text
                     content_type = r.headers.get("content-type", "text/event-stream")
@@ -654,12 +791,22 @@ class ProxyEngine:
                 else:
                     # For non-streaming requests, we can just read the response synchronously
                     # Using stream=True here caused httpx.ReadErrors with binary data
-                    resp = await self._client.send(req)
+                    resp = await self._await_unless_disconnected(request, self._client.send(req))
+                    if resp is None:
+                        provider_manager.end_model_request(load_model)
+                        return _record_client_abort(
+                            request_id=request_id, trace_id=trace_id, sequence=sequence, started_at=started_at
+                        )
                     content_type = resp.headers.get("content-type", "")
                     elapsed_ms = (time.perf_counter() - started_at) * 1000
+                    provider_manager.end_model_request(load_model, elapsed_ms)
+                    load_model = None
 
                     if "application/json" in content_type:
                         response_json = resp.json()
+                        if resp.status_code == 400:
+                            # Context overflow errors tell us the real window for future routing
+                            provider_manager.learn_context_window(_model_name(body), provider.name, response_json)
                         _log_response_snapshot(
                             request_id=request_id,
                             trace_id=trace_id,
@@ -670,13 +817,17 @@ class ProxyEngine:
                             payload_preview=_serialize_for_log(response_json),
                             payload=response_json,
                         )
-                        return JSONResponse(content=response_json, status_code=resp.status_code)
+                        return JSONResponse(
+                            content=response_json,
+                            status_code=resp.status_code,
+                            headers=route_headers or None,
+                        )
                     else:
-                        from fastapi import Response
                         # Forward relevant headers from upstream
                         headers = {}
                         if "content-length" in resp.headers:
                             headers["content-length"] = resp.headers["content-length"]
+                        headers.update(route_headers)
                         _log_response_snapshot(
                             request_id=request_id,
                             trace_id=trace_id,
@@ -703,6 +854,7 @@ class ProxyEngine:
                 e,
                 exc_info=True,
             )
+            provider_manager.end_model_request(load_model)
             _trace_summaries.pop(trace_id, None)
             raise ProxyError(detail=str(e)) from e
 
@@ -756,7 +908,11 @@ class ProxyEngine:
             )
 
             if is_stream:
-                r = await self._client.send(req, stream=True)
+                r = await self._await_unless_disconnected(request, self._client.send(req, stream=True))
+                if r is None:
+                    return _record_client_abort(
+                        request_id=request_id, trace_id=trace_id, sequence=sequence, started_at=started_at
+                    )
                 logger.info(
                     "[trace=%s req=%s seq=%s] Upstream stream opened status=%s content_type=%s",
                     trace_id,
@@ -768,6 +924,7 @@ class ProxyEngine:
 
                 async def stream_generator():
                     """Yield streamed multipart response bytes from the upstream response."""
+                    aborted = False
                     try:
                         chunk_count = 0
                         byte_count = 0
@@ -795,6 +952,10 @@ class ProxyEngine:
                             byte_count,
                             (time.perf_counter() - started_at) * 1000,
                         )
+                    except (GeneratorExit, asyncio.CancelledError):
+                        # The caller went away; closing `r` below aborts the upstream generation
+                        aborted = True
+                        raise
                     finally:
                         _finalize_stream_trace(
                             request_id=request_id,
@@ -803,6 +964,7 @@ class ProxyEngine:
                             status_code=r.status_code,
                             content_type=r.headers.get("content-type", ""),
                             started_at=started_at,
+                            aborted=aborted,
                         )
                         await r.aclose()
 
@@ -821,7 +983,11 @@ class ProxyEngine:
                     headers=resp_headers
                 )
             else:
-                resp = await self._client.send(req)
+                resp = await self._await_unless_disconnected(request, self._client.send(req))
+                if resp is None:
+                    return _record_client_abort(
+                        request_id=request_id, trace_id=trace_id, sequence=sequence, started_at=started_at
+                    )
                 _log_response_snapshot(
                     request_id=request_id,
                     trace_id=trace_id,
@@ -96,6 +96,14 @@ async def startup_discovery():
     asyncio.create_task(run_refresh())
 
 
+@app.on_event("shutdown")
+async def close_upstream_pools():
+    """Close pooled upstream connections when the server stops."""
+    from server.core.http_transport import upstream_transport
+
+    await upstream_transport.close_pools()
+
+
 @app.get("/")
 async def root(request: Request):
     """Render the main AIR dashboard."""
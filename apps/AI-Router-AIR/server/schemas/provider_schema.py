@@ -1,7 +1,7 @@
 """Pydantic schemas for provider configuration, input, and status models."""
 
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, model_validator
+from typing import Any, Optional
 
 class ProviderConfig(BaseModel):
     """Stored configuration for a registered AI provider."""
@@ -31,3 +31,25 @@ class AcceptProviderInput(BaseModel):
     base_url: str
     detected_types: list[str]  # e.g. ["llm", "stt"]
     api_key: Optional[str] = "na"
+
+class ModelAliasMember(BaseModel):
+    """One model in an alias fallback chain, with optional load thresholds."""
+    model: str
+    max_in_flight: Optional[int] = None # skip this member once this many requests are in flight
+    max_latency_ms: Optional[float] = None # skip this member while its smoothed latency exceeds this
+
+    @model_validator(mode="before")
+    @classmethod
+    def _accept_bare_model_id(cls, value: Any) -> Any:
+        """Allow chain members to be written as plain model id strings."""
+        if isinstance(value, str):
+            return {"model": value}
+        return value
+
+class UpstreamPoolOverride(BaseModel):
+    """Per-provider overrides for the shared upstream connection pool settings."""
+    max_connections: Optional[int] = None
+    max_keepalive_connections: Optional[int] = None
+    keepalive_expiry: Optional[float] = None # seconds an idle connection is kept open
+    first_byte_timeout: Optional[float] = None # seconds to wait for response headers
+    http2: Optional[bool] = None
@@ -1,14 +1,60 @@
 """Provider registry loading, model discovery, and routing helpers for AIR."""
 
-import httpx
 import logging
 import asyncio
 import re
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
 from server.core.config import settings, ProviderConfig
+from server.core.http_transport import create_upstream_client
+from server.schemas.provider_schema import ModelAliasMember
 
 logger = logging.getLogger(__name__)
 
+# Metadata keys OpenAI-compatible servers use to advertise a model's context window
+# (vLLM: max_model_len, LM Studio: max_context_length, Groq: context_window, ...).
+CONTEXT_WINDOW_KEYS = ("context_window", "context_length", "max_context_length", "max_model_len")
+
+# Upstream error text that reveals the real window, e.g. vLLM/OpenAI
+# "This model's maximum context length is 4096 tokens".
+_CONTEXT_ERROR_PATTERN = re.compile(r"maximum context length is (\d+) tokens", re.IGNORECASE)
+
+# Weight given to the newest sample when smoothing per-model upstream latency.
+MODEL_LATENCY_EWMA_ALPHA = 0.3
+
+
+@dataclass(slots=True)
+class ModelLoad:
+    """Live load counters for one upstream model id.
+
+    `latency_ms` smooths the time until the upstream started answering: response
+    headers for streams, the full response otherwise.
+    """
+
+    in_flight: int = 0
+    latency_ms: Optional[float] = None
+    completed: int = 0
+
+
+@dataclass(slots=True)
+class ModelRoute:
+    """Outcome of resolving a model alias to a concrete chain member."""
+
+    alias: str
+    model: str
+    provider: ProviderConfig
+    position: int
+    saturated: bool = False
+
+    def as_headers(self) -> Dict[str, str]:
+        """Describe the routing decision as response headers."""
+        return {
+            "x-air-model-alias": self.alias,
+            "x-air-routed-model": self.model,
+            "x-air-routed-provider": self.provider.name,
+            "x-air-route-reason": "saturated" if self.saturated else ("primary" if self.position == 0 else "fallback"),
+        }
+
 
 def infer_model_type(model: Dict[str, Any], default_type: str = "llm") -> str:
     """
@@ -50,6 +96,37 @@ def infer_model_type(model: Dict[str, Any], default_type: str = "llm") -> str:
     return default_type
 
 
+def _positive_int(value: Any) -> Optional[int]:
+    """Coerce metadata values such as 8192 or "8192" to a positive int."""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+def infer_context_window(model: Dict[str, Any]) -> Optional[int]:
+    """
+    Infer a model's maximum context length (in tokens) from its metadata.
+
+    Checks the common top-level keys first, then llama.cpp's `meta` block
+    (`n_ctx`, falling back to `n_ctx_train`). Returns None when unknown.
+    """
+    for key in CONTEXT_WINDOW_KEYS:
+        window = _positive_int(model.get(key))
+        if window:
+            return window
+
+    meta = model.get("meta")
+    if isinstance(meta, dict):
+        for key in ("n_ctx", "n_ctx_train"):
+            window = _positive_int(meta.get(key))
+            if window:
+                return window
+
+    return None
+
+
 class ProviderManager:
     """
     Manages the lifecycle and discovery of AI providers and their models.
@@ -69,11 +146,22 @@ class ProviderManager:
         # Format: {provider_name: {"chat": bool, "embeddings": bool, ...}}
         self.capabilities: Dict[str, Dict[str, bool]] = {}
 
+        # In-flight and latency counters used by alias fallback routing
+        self.model_load: Dict[str, ModelLoad] = {}
+
+        # Context windows learned from upstream errors, keyed by (provider_name, model_id)
+        self.learned_context_windows: Dict[Tuple[str, str], int] = {}
+
     @property
     def providers(self) -> List[ProviderConfig]:
         """Always return the current list from settings (allows dynamic reload)."""
         return settings.PROVIDERS
 
+    @property
+    def model_aliases(self) -> Dict[str, List[ModelAliasMember]]:
+        """Return the configured alias fallback chains."""
+        return settings.MODEL_ALIASES
+
     async def _fetch_models_from_provider(self, provider: ProviderConfig) -> List[Dict[str, Any]]:
         """Fetch and annotate the model list exposed by a single provider."""
         url = f"{provider.base_url.rstrip('/')}/models"
@@ -84,7 +172,7 @@ class ProviderManager:
             headers["Authorization"] = f"Bearer {provider.api_key}"
 
         try:
-            async with httpx.AsyncClient(timeout=300.0, follow_redirects=True) as client:
+            async with create_upstream_client(follow_redirects=True) as client:
                 logger.info(f"Querying models from {url}")
                 response = await client.get(url, headers=headers)
                 response.raise_for_status()
@@ -100,6 +188,9 @@ class ProviderManager:
                 for model in models:
                     model["provider_name"] = provider.name
                     model["provider_type"] = infer_model_type(model, default_type=provider.type)
+                    context_window = infer_context_window(model)
+                    if context_window:
+                        model["context_window"] = context_window
 
                 logger.info(f"Successfully fetched {len(models)} models from {provider.name}")
                 return models
@@ -109,7 +200,7 @@ class ProviderManager:
             if "localhost" in url:
                 alt_url = url.replace("localhost", "127.0.0.1")
                 try:
-                     async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
+                     async with create_upstream_client(timeout=10.0, follow_redirects=True) as client:
                         logger.info(f"Retrying with 127.0.0.1: {alt_url}")
                         response = await client.get(alt_url, headers=headers)
                         response.raise_for_status()
@@ -123,6 +214,9 @@ class ProviderManager:
                         for model in models:
                             model["provider_name"] = provider.name
                             model["provider_type"] = infer_model_type(model, default_type=provider.type)
+                            context_window = infer_context_window(model)
+                            if context_window:
+                                model["context_window"] = context_window
                         return models
                 except Exception as e2:
                      logger.error(f"Retry failed for {provider.name}: {e2}")
@@ -196,6 +290,144 @@ class ProviderManager:
         # For now, let's return None or a default if configured.
         return None
 
+    def get_context_window(self, model_id: str, provider_name: Optional[str] = None) -> Optional[int]:
+        """
+        Return the max context tokens for a model, optionally on a specific provider.
+
+        Configured MODEL_CONTEXT_WINDOWS win, then windows learned from upstream
+        errors, then what the provider advertised in its model metadata.
+        """
+        configured = settings.MODEL_CONTEXT_WINDOWS.get(model_id)
+        if configured:
+            return configured
+
+        if provider_name:
+            candidates = self.models_cache.get("by_provider", {}).get(provider_name, [])
+        else:
+            candidates = self.models_cache.get("all", [])
+        for model in candidates:
+            if model.get("id") != model_id:
+                continue
+            learned = self.learned_context_windows.get((model.get("provider_name"), model_id))
+            if learned:
+                return learned
+            return infer_context_window(model)
+        return None
+
+    def get_model_replicas(self, model_id: str) -> List[Tuple[ProviderConfig, Optional[int]]]:
+        """List every configured provider hosting model_id with its context window, in provider order."""
+        by_provider = self.models_cache.get("by_provider")
+        if not by_provider:
+            provider = self.get_provider_for_model(model_id)
+            return [(provider, self.get_context_window(model_id))] if provider else []
+
+        replicas = []
+        for provider in self.providers:
+            if any(model.get("id") == model_id for model in by_provider.get(provider.name, [])):
+                replicas.append((provider, self.get_context_window(model_id, provider.name)))
+        return replicas
+
+    def select_replica(self, model_id: str, required_tokens: int = 0) -> Optional[ProviderConfig]:
+        """Return the first provider hosting model_id whose window fits (or is unknown)."""
+        for provider, window in self.get_model_replicas(model_id):
+            if window is None or window >= required_tokens:
+                return provider
+        return None
+
+    def largest_context_window(self, model_ids: List[str]) -> Optional[int]:
+        """Return the largest known context window among the hosted replicas of model_ids."""
+        windows = [
+            window
+            for model_id in model_ids
+            for _, window in self.get_model_replicas(model_id)
+            if window is not None
+        ]
+        return max(windows) if windows else None
+
+    def learn_context_window(self, model_id: Optional[str], provider_name: str, payload: Any) -> Optional[int]:
+        """Remember a model's real window when an upstream error payload reveals it."""
+        if not model_id or not isinstance(payload, dict):
+            return None
+        error = payload.get("error")
+        if not isinstance(error, dict):
+            return None
+
+        # llama.cpp reports the window directly; OpenAI-style servers put it in the message.
+        window = _positive_int(error.get("n_ctx"))
+        if window is None:
+            match = _CONTEXT_ERROR_PATTERN.search(str(error.get("message") or ""))
+            window = _positive_int(match.group(1)) if match else None
+        if window is None:
+            return None
+
+        if self.learned_context_windows.get((provider_name, model_id)) != window:
+            logger.info(f"Learned context window {window} for {model_id} on {provider_name}")
+        self.learned_context_windows[(provider_name, model_id)] = window
+        return window
+
+    def begin_model_request(self, model_id: Optional[str]) -> None:
+        """Count a request against a model while it is in flight upstream."""
+        if not model_id:
+            return
+        self.model_load.setdefault(model_id, ModelLoad()).in_flight += 1
+
+    def end_model_request(self, model_id: Optional[str], elapsed_ms: Optional[float] = None) -> None:
+        """Release an in-flight slot and fold the observed latency into the average."""
+        if not model_id:
+            return
+        load = self.model_load.setdefault(model_id, ModelLoad())
+        load.in_flight = max(0, load.in_flight - 1)
+        if elapsed_ms is None:
+            return
+        load.completed += 1
+        if load.latency_ms is None:
+            load.latency_ms = elapsed_ms
+        else:
+            load.latency_ms += MODEL_LATENCY_EWMA_ALPHA * (elapsed_ms - load.latency_ms)
+
+    def _member_has_capacity(self, member: ModelAliasMember) -> bool:
+        """Return whether a chain member is under both of its load thresholds."""
+        load = self.model_load.get(member.model)
+        if load is None:
+            return True
+        if member.max_in_flight is not None and load.in_flight >= member.max_in_flight:
+            return False
+        if (
+            member.max_latency_ms is not None
+            and load.latency_ms is not None
+            and load.latency_ms > member.max_latency_ms
+        ):
+            return False
+        return True
+
+    def resolve_model_alias(self, alias: str, required_tokens: int = 0) -> Optional[ModelRoute]:
+        """
+        Pick the first member of an alias chain that is routable and under its thresholds.
+
+        Members whose model is not hosted by any configured provider, or whose
+        context window is smaller than required_tokens, are skipped. When every
+        routable member is saturated, the last routable member is used so the
+        request still gets served rather than rejected.
+        """
+        chain = self.model_aliases.get(alias)
+        if not chain:
+            return None
+
+        last_route: Optional[ModelRoute] = None
+        for position, member in enumerate(chain):
+            provider = self.select_replica(member.model, required_tokens)
+            if provider is None:
+                continue
+            route = ModelRoute(alias=alias, model=member.model, provider=provider, position=position)
+            if self._member_has_capacity(member):
+                return route
+            last_route = route
+
+        if last_route is not None:
+            last_route.saturated = True
+            logger.warning(f"All members of model alias '{alias}' are saturated; using {last_route.model}")
+        return last_route
+
     def get_provider_by_type(self, p_type: str) -> Optional[ProviderConfig]:
         """Returns the first provider of a specific type.
            If no provider is explicitly configured with that type, checks inferred model capabilities."""
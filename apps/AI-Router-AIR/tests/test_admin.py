@@ -296,3 +296,22 @@ async def test_admin_accept_discovered_providers_multiple_types():
                 data = response.json()
                 # Should add 2 mappings (one for each type)
                 assert len(data["added"]) == 2
+
+@pytest.mark.asyncio
+async def test_admin_metrics_reports_pools_and_model_load():
+    """Test /api/config/metrics returns transport pool metrics and model load."""
+    from server.services.provider_manager import ModelLoad
+
+    pool_metrics = {"http2_available": False, "timeouts": {"connect": 10.0}, "pools": [{"origin": "http://p1:80", "requests": 3}]}
+    with patch("server.api.admin.upstream_transport") as mock_transport, \
+         patch("server.api.admin.provider_manager") as mock_pm:
+        mock_transport.metrics.return_value = pool_metrics
+        mock_pm.model_load = {"m1": ModelLoad(in_flight=1, latency_ms=120.0, completed=4)}
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/api/config/metrics")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["transport"] == pool_metrics
+    assert data["model_load"]["m1"] == {"in_flight": 1, "latency_ms": 120.0, "completed": 4}
@@ -0,0 +1,63 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from benchmarks.fake_upstream import FAKE_MODEL_ID, FakeUpstreamConfig, create_app
+from benchmarks.proxy_bench import RunSamples, compare_to_baseline, percentile, summarize
+
+
+@pytest.fixture
+def fake_upstream():
+    config = FakeUpstreamConfig(latency_ms=0, tokens_per_second=0, completion_tokens=6, chunk_tokens=2, audio_bytes=10000, audio_chunk_bytes=4096)
+    return create_app(config)
+
+
+@pytest.mark.asyncio
+async def test_fake_upstream_serves_models_and_chat(fake_upstream):
+    async with AsyncClient(transport=ASGITransport(app=fake_upstream), base_url="http://test") as ac:
+        models = (await ac.get("/v1/models")).json()
+        assert FAKE_MODEL_ID in {m["id"] for m in models["data"]}
+
+        response = await ac.post("/v1/chat/completions", json={"model": FAKE_MODEL_ID, "messages": []})
+        assert response.json()["usage"]["completion_tokens"] == 6
+
+        response = await ac.post("/v1/chat/completions", json={"model": FAKE_MODEL_ID, "messages": [], "stream": True})
+        events = [line for line in response.text.splitlines() if line.startswith("data: ")]
+        assert len(events) == 4  # 3 chunks of 2 tokens + [DONE]
+        assert events[-1] == "data: [DONE]"
+
+
+@pytest.mark.asyncio
+async def test_fake_upstream_serves_audio_payload(fake_upstream):
+    async with AsyncClient(transport=ASGITransport(app=fake_upstream), base_url="http://test") as ac:
+        response = await ac.post("/v1/audio/speech", json={"model": "bench-tts", "input": "hi", "stream": True})
+        assert response.headers["content-type"] == "audio/mpeg"
+        assert len(response.content) == 10000
+
+
+def test_percentile_and_summary():
+    assert percentile([], 50) == 0.0
+    assert percentile([1, 2, 3, 4], 50) == 2
+    assert percentile(list(range(1, 101)), 99) == 99
+
+    direct = RunSamples(latencies_ms=[10.0] * 10, first_chunk_ms=[5.0] * 10, chunk_gaps_ms=[1.0] * 10)
+    proxied = RunSamples(latencies_ms=[12.0] * 10, first_chunk_ms=[6.0] * 10, chunk_gaps_ms=[1.5] * 10, wall_seconds=2.0)
+    metrics = summarize(direct, proxied, cpu_seconds=0.5, rss_growth_kb=128)
+
+    assert metrics["added_p50_ms"] == 2.0
+    assert metrics["added_first_chunk_p50_ms"] == 1.0
+    assert metrics["added_chunk_gap_ms"] == 0.5
+    assert metrics["rps"] == 5.0
+    assert metrics["rps_per_core"] == 20.0
+    assert metrics["memory_growth_kb"] == 128
+
+
+def test_compare_to_baseline_flags_only_real_regressions():
+    baseline = {"scenarios": {"chat": {"added_p50_ms": 10.0, "rps_per_core": 100.0}}}
+
+    steady = {"scenarios": {"chat": {"added_p50_ms": 12.0, "rps_per_core": 90.0}}}
+    assert compare_to_baseline(steady, baseline, tolerance=0.2) == []
+
+    slower = {"scenarios": {"chat": {"added_p50_ms": 20.0, "rps_per_core": 50.0}}}
+    regressions = compare_to_baseline(slower, baseline, tolerance=0.2)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("chat.added_p50_ms")
@@ -5,8 +5,9 @@ from unittest.mock import patch, MagicMock, mock_open
 from server.core.config import Settings
 from server.core.env_manager import EnvFileManager
 from server.core.exceptions import ProviderNotFoundError, ProviderUnavailableError, ProxyError, global_exception_handler
+from server.core.http_transport import UpstreamTransport, create_upstream_client
 from server.core.logging import setup_logging
-from server.schemas.provider_schema import ProviderConfig
+from server.schemas.provider_schema import ProviderConfig, UpstreamPoolOverride
 
 
 class TestSettings:
@@ -364,3 +365,91 @@ class TestLogging:
         setup_logging()
         root_logger = logging.getLogger()
         assert root_logger.level == logging.INFO
+
+
+class TestUpstreamTransport:
+    """Test the shared per-origin upstream connection pools"""
+
+    @staticmethod
+    def _settings(**overrides):
+        settings = Settings()
+        settings.PROVIDERS = [
+            ProviderConfig(type="llm", base_url="http://gpu-box:8000/v1", api_key="na", name="LLM Provider 1"),
+        ]
+        for key, value in overrides.items():
+            setattr(settings, key, value)
+        return settings
+
+    def test_pools_are_keyed_by_origin_with_provider_overrides(self):
+        """Test one pool per origin, configured from the matching provider's overrides"""
+        settings = self._settings(
+            UPSTREAM_MAX_CONNECTIONS=50,
+            UPSTREAM_POOL_OVERRIDES={"LLM Provider 1": UpstreamPoolOverride(max_connections=4, first_byte_timeout=5)},
+        )
+        transport = UpstreamTransport()
+        with patch("server.core.http_transport.settings", settings):
+            pool = transport.pool_for("http://gpu-box:8000/v1/chat/completions")
+            assert transport.pool_for("http://gpu-box:8000/v1/models") is pool
+            other = transport.pool_for("http://localhost:9000/v1/models")
+
+        assert pool.provider_name == "LLM Provider 1"
+        assert pool.config.max_connections == 4
+        assert pool.config.first_byte_timeout == 5
+        assert other.provider_name is None
+        assert other.config.max_connections == 50
+
+    def test_http2_falls_back_without_h2(self):
+        """Test HTTP/2 is only enabled when the h2 package is importable"""
+        settings = self._settings(UPSTREAM_HTTP2=True)
+        transport = UpstreamTransport()
+        with patch("server.core.http_transport.settings", settings), \
+             patch("server.core.http_transport.http2_available", return_value=False):
+            pool = transport.pool_for("http://gpu-box:8000/v1")
+        assert pool.config.http2 is False
+
+    @pytest.mark.asyncio
+    async def test_first_byte_timeout_raises_read_timeout(self):
+        """Test a slow upstream is cut off at the first-byte timeout and counted"""
+        import asyncio
+        import httpx
+
+        async def never_answers(request):
+            await asyncio.sleep(5)
+
+        settings = self._settings(UPSTREAM_FIRST_BYTE_TIMEOUT=0.05)
+        transport = UpstreamTransport()
+        with patch("server.core.http_transport.settings", settings):
+            pool = transport.pool_for("http://gpu-box:8000/v1")
+            pool.transport = httpx.MockTransport(never_answers)
+            async with httpx.AsyncClient(transport=transport) as client:
+                with pytest.raises(httpx.ReadTimeout):
+                    await client.get("http://gpu-box:8000/v1/models")
+
+        assert pool.stats.requests == 1
+        assert pool.stats.first_byte_timeouts == 1
+        assert pool.stats.awaiting_first_byte == 0
+
+    @pytest.mark.asyncio
+    async def test_closing_a_client_keeps_shared_pools(self):
+        """Test short-lived clients reuse pools that survive their close"""
+        import httpx
+
+        settings = self._settings()
+        transport = UpstreamTransport()
+        with patch("server.core.http_transport.settings", settings), \
+             patch("server.core.http_transport.upstream_transport", transport):
+            pool = transport.pool_for("http://gpu-box:8000/v1")
+            pool.transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"data": []}))
+            for _ in range(2):
+                async with create_upstream_client() as client:
+                    response = await client.get("http://gpu-box:8000/v1/models")
+                    assert response.status_code == 200
+
+            metrics = transport.metrics()
+            await transport.close_pools()
+
+        assert pool.stats.responses == 2
+        assert metrics["timeouts"]["connect"] == settings.UPSTREAM_CONNECT_TIMEOUT
+        assert metrics["pools"][0]["provider"] == "LLM Provider 1"
+        assert metrics["pools"][0]["requests"] == 2
+        assert transport.metrics()["pools"] == []
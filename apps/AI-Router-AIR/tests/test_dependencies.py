@@ -1,9 +1,21 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi import Request
 from server.core.dependencies import get_provider
-from server.core.exceptions import ProviderNotFoundError
+from server.core.exceptions import ContextLengthExceededError, ProviderNotFoundError
 from server.schemas.provider_schema import ProviderConfig
+from server.services.provider_manager import ModelRoute, ProviderManager
+
+
+def _use_replica_lookup(mock_pm):
+    """Back the mocked manager's replica helpers with the real logic over its get_model_replicas."""
+    mock_pm.select_replica.side_effect = lambda model, tokens=0: ProviderManager.select_replica(
+        mock_pm, model, tokens
+    )
+    mock_pm.largest_context_window.side_effect = (
+        lambda model_ids: ProviderManager.largest_context_window(mock_pm, model_ids)
+    )
 
 
 class TestGetProvider:
@@ -42,6 +54,7 @@ class TestGetProvider:
         )
 
         with patch('server.core.dependencies.provider_manager') as mock_pm:
+            _use_replica_lookup(mock_pm)
             mock_pm.get_provider_for_model.return_value = mock_provider
 
             result = await get_provider(mock_request)
@@ -70,6 +83,7 @@ class TestGetProvider:
         )
 
         with patch('server.core.dependencies.provider_manager') as mock_pm:
+            _use_replica_lookup(mock_pm)
             mock_pm.get_provider_for_model.return_value = None
             mock_pm.get_provider_by_type.return_value = mock_provider
 
@@ -92,6 +106,7 @@ class TestGetProvider:
         mock_request.json = mock_json
 
         with patch('server.core.dependencies.provider_manager') as mock_pm:
+            _use_replica_lookup(mock_pm)
             mock_pm.get_provider_for_model.return_value = None
             mock_pm.get_provider_by_type.return_value = None
 
@@ -324,12 +339,74 @@ class TestGetProvider:
         )
 
         with patch('server.core.dependencies.provider_manager') as mock_pm:
+            _use_replica_lookup(mock_pm)
             mock_pm.get_provider_for_model.return_value = mock_provider
 
             result = await get_provider(mock_request)
 
             assert result == mock_provider
 
+    @pytest.mark.asyncio
+    async def test_get_provider_chat_completions_resolves_model_alias(self):
+        """Test get_provider routes an alias to its chosen chain member"""
+        mock_request = MagicMock(spec=Request)
+        mock_request.url.path = "/v1/chat/completions"
+        mock_request.method = "POST"
+        mock_request.headers.get.return_value = "application/json"
+        mock_request.state = SimpleNamespace()
+
+        async def mock_json():
+            return {"model": "triage"}
+
+        mock_request.json = mock_json
+
+        mock_provider = ProviderConfig(
+            type="llm",
+            base_url="http://small/v1",
+            api_key="na",
+            name="Small Provider"
+        )
+        route = ModelRoute(alias="triage", model="small", provider=mock_provider, position=1)
+
+        with patch('server.core.dependencies.provider_manager') as mock_pm:
+            mock_pm.model_aliases = {"triage": []}
+            mock_pm.resolve_model_alias.return_value = route
+
+            result = await get_provider(mock_request)
+
+            assert result == mock_provider
+            assert mock_request.state.model_route is route
+            mock_pm.get_provider_for_model.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_provider_rejects_prompt_larger_than_every_replica_window(self):
+        """Test get_provider fails fast when no replica's context window fits the prompt"""
+        mock_request = MagicMock(spec=Request)
+        mock_request.url.path = "/v1/chat/completions"
+        mock_request.method = "POST"
+        mock_request.headers.get.return_value = "application/json"
+
+        async def mock_json():
+            return {"model": "qwen", "messages": [{"role": "user", "content": "x" * 40000}]}
+
+        mock_request.json = mock_json
+
+        small = ProviderConfig(type="llm", base_url="http://small/v1", api_key="na", name="Small")
+        large = ProviderConfig(type="llm", base_url="http://large/v1", api_key="na", name="Large")
+
+        with patch('server.core.dependencies.provider_manager') as mock_pm:
+            _use_replica_lookup(mock_pm)
+            mock_pm.get_model_replicas.return_value = [(small, 4096), (large, 32768)]
+            assert await get_provider(mock_request) == large
+
+            mock_pm.get_model_replicas.return_value = [(small, 4096)]
+            with pytest.raises(ContextLengthExceededError) as exc_info:
+                await get_provider(mock_request)
+
+            assert exc_info.value.status_code == 400
+            assert "4096" in exc_info.value.detail
+            mock_pm.get_provider_for_model.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_get_provider_unknown_endpoint_raises(self):
         """Test get_provider raises for unknown endpoint"""
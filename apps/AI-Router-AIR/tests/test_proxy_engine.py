@@ -1,4 +1,5 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi import Request
 from fastapi.responses import StreamingResponse, JSONResponse
@@ -6,6 +7,7 @@ import httpx
 from server.core.proxy_engine import ProxyEngine
 from server.core.exceptions import ProxyError
 from server.schemas.provider_schema import ProviderConfig
+from server.services.provider_manager import ModelRoute, provider_manager
 
 
 class TestProxyEngine:
@@ -199,6 +201,39 @@ class TestProxyEngine:
                 assert "accept-encoding" not in call_kwargs["headers"]
                 assert "user-agent" in call_kwargs["headers"]
 
+    @pytest.mark.asyncio
+    async def test_forward_request_rewrites_alias_model_and_reports_route(self, proxy_engine, mock_provider, mock_request):
+        """Test that alias requests go upstream as the routed model and expose the choice in headers"""
+        async def mock_json():
+            return {"model": "triage", "messages": [{"role": "user", "content": "hi"}]}
+
+        mock_request.json = mock_json
+        mock_request.state = SimpleNamespace(
+            model_route=ModelRoute(alias="triage", model="small", provider=mock_provider, position=1)
+        )
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {"content-type": "application/json"}
+        mock_response.json.return_value = {}
+
+        with patch.object(proxy_engine._client, 'build_request') as mock_build:
+            with patch.object(proxy_engine._client, 'send', new_callable=AsyncMock) as mock_send:
+                mock_send.return_value = mock_response
+
+                result = await proxy_engine.forward_request(
+                    mock_request,
+                    mock_provider,
+                    "chat/completions",
+                    is_stream=False
+                )
+
+                assert mock_build.call_args[1]["json"]["model"] == "small"
+                assert result.headers["x-air-model-alias"] == "triage"
+                assert result.headers["x-air-routed-model"] == "small"
+                assert result.headers["x-air-route-reason"] == "fallback"
+                assert provider_manager.model_load["small"].in_flight == 0
+
     @pytest.mark.asyncio
     async def test_forward_request_constructs_correct_url(self, proxy_engine, mock_provider, mock_request):
         """Test that URL is constructed correctly"""
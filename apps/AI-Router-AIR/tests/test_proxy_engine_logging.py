@@ -212,3 +212,85 @@ def test_streaming_request_logs_summary_after_stream_completion():
         upstream_response.aclose.assert_awaited_once()
 
     asyncio.run(run_test())
+
+
+def _build_disconnecting_request(payload: dict, disconnected: asyncio.Event) -> Request:
+    request = _build_request(payload)
+    body_receive = request.receive
+    body_sent = False
+
+    async def receive() -> dict:
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return await body_receive()
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    request._receive = receive
+    return request
+
+
+def test_non_streaming_request_cancels_upstream_when_client_disconnects():
+    async def run_test() -> None:
+        engine = ProxyEngine()
+        disconnected = asyncio.Event()
+        request = _build_disconnecting_request(
+            {"model": "gpt-4", "stream": False, "messages": [{"role": "user", "content": "hi"}]},
+            disconnected,
+        )
+        provider = ProviderConfig(name="P1", base_url="http://p1/v1", api_key="secret-key", type="llm")
+        upstream_cancelled = asyncio.Event()
+
+        async def slow_send(*_args, **_kwargs):
+            disconnected.set()
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                upstream_cancelled.set()
+                raise
+
+        with patch("server.core.proxy_engine.logger") as mock_logger:
+            with patch.object(engine._client, "send", new=AsyncMock(side_effect=slow_send)):
+                response = await asyncio.wait_for(
+                    engine.forward_request(request, provider, "chat/completions"), timeout=5
+                )
+
+        assert response.status_code == 499
+        assert upstream_cancelled.is_set()
+        info_messages = _render_log_calls(mock_logger.info.call_args_list)
+        assert any("Client disconnected before upstream answered" in message for message in info_messages)
+        assert any("aborted_requests=1" in message for message in info_messages)
+
+    asyncio.run(run_test())
+
+
+def test_streaming_request_closes_upstream_when_client_disconnects_mid_stream():
+    async def run_test() -> None:
+        engine = ProxyEngine()
+        request = _build_request({"model": "gpt-4", "stream": True, "messages": [{"role": "user", "content": "hi"}]})
+        provider = ProviderConfig(name="P1", base_url="http://p1/v1", api_key="secret-key", type="llm")
+        upstream_response = AsyncMock()
+        upstream_response.status_code = 200
+        upstream_response.headers = {"content-type": "text/event-stream"}
+
+        async def iter_bytes():
+            yield b"data: one\n\n"
+            yield b"data: two\n\n"
+
+        upstream_response.aiter_bytes = iter_bytes
+        upstream_response.aclose = AsyncMock()
+
+        with patch("server.core.proxy_engine.logger") as mock_logger:
+            with patch.object(engine._client, "send", new=AsyncMock(return_value=upstream_response)):
+                response = await engine.forward_request(request, provider, "chat/completions")
+                body_iterator = response.body_iterator
+                assert await body_iterator.__anext__() == b"data: one\n\n"
+                await body_iterator.aclose()
+
+        upstream_response.aclose.assert_awaited_once()
+        info_messages = _render_log_calls(mock_logger.info.call_args_list)
+        assert any("Client disconnected mid-stream" in message for message in info_messages)
+        assert any("aborted=True" in message for message in info_messages)
+
+    asyncio.run(run_test())
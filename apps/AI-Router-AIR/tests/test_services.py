@@ -1,7 +1,8 @@
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
-from server.services.provider_manager import ProviderManager, infer_model_type
+from server.services.provider_manager import ProviderManager, infer_context_window, infer_model_type
 from server.core.config import ProviderConfig
+from server.schemas.provider_schema import ModelAliasMember
 
 def test_infer_model_type():
     # Test case A: Task field
@@ -160,3 +161,94 @@ async def test_discovery_service_probe():
             headers={"Content-Type": "application/json"}
         )
         mock_infer.assert_called_once_with(mock_models["data"][0], default_type="llm")
+
+
+def _alias_manager(chain):
+    pm = ProviderManager()
+    pm.models_cache["all"] = [
+        {"id": "big", "provider_name": "P1", "provider_type": "llm"},
+        {"id": "small", "provider_name": "P2", "provider_type": "llm"},
+    ]
+    mock_settings = MagicMock()
+    mock_settings.PROVIDERS = [
+        ProviderConfig(name="P1", base_url="http://p1/v1", api_key="k1", type="llm"),
+        ProviderConfig(name="P2", base_url="http://p2/v1", api_key="k2", type="llm"),
+    ]
+    mock_settings.MODEL_ALIASES = {"triage": [ModelAliasMember.model_validate(m) for m in chain]}
+    mock_settings.MODEL_CONTEXT_WINDOWS = {}
+    return pm, mock_settings
+
+
+def test_resolve_model_alias_prefers_first_member_under_threshold():
+    pm, mock_settings = _alias_manager([{"model": "big", "max_in_flight": 2}, "small"])
+
+    with patch("server.services.provider_manager.settings", mock_settings):
+        route = pm.resolve_model_alias("triage")
+        assert route.model == "big"
+        assert route.provider.name == "P1"
+        assert route.as_headers()["x-air-route-reason"] == "primary"
+
+        pm.begin_model_request("big")
+        pm.begin_model_request("big")
+        route = pm.resolve_model_alias("triage")
+        assert route.model == "small"
+        assert route.provider.name == "P2"
+        assert route.as_headers()["x-air-route-reason"] == "fallback"
+
+        pm.end_model_request("big", 120.0)
+        assert pm.resolve_model_alias("triage").model == "big"
+        assert pm.resolve_model_alias("unknown") is None
+
+
+def test_resolve_model_alias_uses_latency_threshold_and_last_member_when_saturated():
+    pm, mock_settings = _alias_manager([
+        {"model": "big", "max_latency_ms": 1000},
+        {"model": "small", "max_in_flight": 1},
+    ])
+
+    with patch("server.services.provider_manager.settings", mock_settings):
+        pm.begin_model_request("big")
+        pm.end_model_request("big", 5000.0)
+        assert pm.model_load["big"].in_flight == 0
+        assert pm.resolve_model_alias("triage").model == "small"
+
+        pm.begin_model_request("small")
+        route = pm.resolve_model_alias("triage")
+        assert route.model == "small"
+        assert route.saturated is True
+        assert route.as_headers()["x-air-route-reason"] == "saturated"
+
+
+def test_infer_context_window():
+    assert infer_context_window({"id": "m", "max_model_len": 32768}) == 32768
+    assert infer_context_window({"id": "m", "context_length": "8192"}) == 8192
+    assert infer_context_window({"id": "m", "meta": {"n_ctx_train": 4096}}) == 4096
+    assert infer_context_window({"id": "m"}) is None
+
+
+def test_select_replica_skips_replicas_without_room_and_learns_from_errors():
+    pm = ProviderManager()
+    pm.models_cache["by_provider"] = {
+        "P1": [{"id": "qwen", "provider_name": "P1", "max_model_len": 4096}],
+        "P2": [{"id": "qwen", "provider_name": "P2", "max_model_len": 32768}],
+    }
+    mock_settings = MagicMock()
+    mock_settings.PROVIDERS = [
+        ProviderConfig(name="P1", base_url="http://p1/v1", api_key="k1", type="llm"),
+        ProviderConfig(name="P2", base_url="http://p2/v1", api_key="k2", type="llm"),
+    ]
+    mock_settings.MODEL_CONTEXT_WINDOWS = {}
+
+    with patch("server.services.provider_manager.settings", mock_settings):
+        assert pm.select_replica("qwen", 1000).name == "P1"
+        assert pm.select_replica("qwen", 10000).name == "P2"
+        assert pm.select_replica("qwen", 50000) is None
+        assert pm.largest_context_window(["qwen"]) == 32768
+
+        error = {"error": {"message": "This model's maximum context length is 16384 tokens."}}
+        assert pm.learn_context_window("qwen", "P2", error) == 16384
+        assert pm.get_context_window("qwen", "P2") == 16384
+        assert pm.select_replica("qwen", 20000) is None
+
+        mock_settings.MODEL_CONTEXT_WINDOWS = {"qwen": 65536}
+        assert pm.select_replica("qwen", 50000).name == "P1"
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Callable, Mapping
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from openai import AsyncOpenAI
+
+from chanakya.config import get_default_model_ttl_seconds, get_openai_compatible_config
+from chanakya.debug import debug_log
+from chanakya.services.async_loop import get_maf_loop
+
+ModelFetcher = Callable[[str], str | None]
+
+
+def fetch_default_model(base_url: str) -> str | None:
+    """Pick a model from ``GET {base_url}/models/``, preferring LLM providers."""
+    try:
+        with urlopen(f"{base_url}/models/", timeout=1.0) as response:
+            payload = json.loads(response.read().decode("utf-8"))
+    except (OSError, TimeoutError, ValueError, URLError):
+        return None
+    models = payload.get("data") if isinstance(payload, dict) else None
+    if not isinstance(models, list):
+        return None
+    entries = [item for item in models if isinstance(item, dict)]
+    for item in entries:
+        provider_type = str(item.get("provider_type") or "").strip().lower()
+        candidate = str(item.get("id") or "").strip()
+        if candidate and provider_type == "llm":
+            return candidate
+    for item in entries:
+        candidate = str(item.get("id") or "").strip()
+        if candidate:
+            return candidate
+    return None
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class DefaultModelCache:
+    """Default model per endpoint, discovered from its model list and kept for a TTL.
+
+    Only a cold lookup from a plain thread fetches inline. Stale entries are
+    served while a refresh runs on the MAF loop, and a lookup made on an event
+    loop never touches the network; call ``warm`` at startup so it finds a value.
+    A failed lookup is never cached, so the next one tries the endpoint again.
+    """
+
+    def __init__(
+        self,
+        *,
+        fetch: ModelFetcher = fetch_default_model,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.fetch = fetch
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: dict[str, tuple[str, float]] = {}
+        self._refreshing: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _ttl(self) -> float:
+        return float(self.ttl_seconds or get_default_model_ttl_seconds())
+
+    def get(self, base_url: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(base_url)
+        if entry is not None:
+            model, fetched_at = entry
+            if self.clock() - fetched_at >= self._ttl():
+                self.warm(base_url)
+            return model
+        if _on_event_loop():
+            debug_log("default_model_unresolved", {"base_url": base_url})
+            self.warm(base_url)
+            return None
+        return self._store(base_url, self.fetch(base_url))
+
+    async def resolve(self, base_url: str) -> str | None:
+        """Fetch the model off the loop and cache it."""
+        try:
+            model = await asyncio.to_thread(self.fetch, base_url)
+        finally:
+            with self._lock:
+                self._refreshing.discard(base_url)
+        return self._store(base_url, model)
+
+    def warm(self, base_url: str) -> None:
+        """Schedule a background refresh unless one is already running."""
+        with self._lock:
+            if base_url in self._refreshing:
+                return
+            self._refreshing.add(base_url)
+        asyncio.run_coroutine_threadsafe(self.resolve(base_url), get_maf_loop())
+
+    def _store(self, base_url: str, model: str | None) -> str | None:
+        with self._lock:
+            previous = self._entries.get(base_url)
+            if model is None:
+                # Keep serving the last good answer when the endpoint blips, but
+                # leave a cold entry absent so the next lookup retries.
+                if previous is None:
+                    return None
+                model = previous[0]
+            self._entries[base_url] = (model, self.clock())
+        return model
+
+
+_default_models = DefaultModelCache()
+
+
+def get_default_model_cache() -> DefaultModelCache:
+    return _default_models
+
+
+def warm_default_model() -> None:
+    """Start resolving the default model when the configuration does not name one."""
+    cfg = get_openai_compatible_config()
+    base_url = str(cfg.get("base_url") or "").strip()
+    if base_url and not str(cfg.get("model") or "").strip():
+        _default_models.warm(base_url)
+
+
+_base_clients: dict[tuple[str, str], AsyncOpenAI] = {}
+_base_clients_lock = threading.Lock()
+
+
+def get_shared_async_client(
+    *, base_url: str, api_key: str, default_headers: Mapping[str, str] | None = None
+) -> AsyncOpenAI:
+    """Return an ``AsyncOpenAI`` on the endpoint's shared connection pool.
+
+    One base client exists per (base_url, api_key); header variants are cheap
+    ``copy`` views over the same ``httpx`` pool. The pool's connections belong to
+    the loop that opened them, so run these clients on the MAF loop only
+    (``run_in_maf_loop``), never under a separate ``asyncio.run``.
+    """
+    key = (base_url, api_key)
+    with _base_clients_lock:
+        base = _base_clients.get(key)
+        if base is None:
+            base = AsyncOpenAI(base_url=base_url, api_key=api_key)
+            _base_clients[key] = base
+    if not default_headers:
+        return base
+    return base.copy(default_headers=dict(default_headers))
+
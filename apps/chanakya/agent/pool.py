@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from agent_framework import Agent
+
+AGENT_POOL_MAX = 32
+
+
+class ProfileAgentPool:
+    """Ready-built profile agents, reused by prompts that resolve to the same agent.
+
+    Callers key an agent by everything that goes into building it (profile id and
+    version, tool set, resolved instructions, client, history mode) and pass
+    per-call addenda as run-time ``instructions`` instead of baking them in. The
+    pool holds the client alongside each agent so its id stays valid while the
+    entry is alive. Least recently used agents are dropped past ``max_size``.
+    """
+
+    def __init__(self, *, max_size: int = AGENT_POOL_MAX) -> None:
+        self.max_size = max_size
+        self._agents: OrderedDict[Hashable, tuple[Any, Agent]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+        self.evictions = 0
+
+    def acquire(self, key: Hashable, client: Any, build: Callable[[], Agent]) -> Agent:
+        entry_key = (key, id(client))
+        with self._lock:
+            entry = self._agents.get(entry_key)
+            if entry is not None:
+                self._agents.move_to_end(entry_key)
+                self.hits += 1
+                return entry[1]
+        agent = build()
+        with self._lock:
+            self.builds += 1
+            self._agents[entry_key] = (client, agent)
+            while len(self._agents) > self.max_size:
+                self._agents.popitem(last=False)
+                self.evictions += 1
+        return agent
+
+    def clear(self) -> None:
+        with self._lock:
+            self._agents.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._agents),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "builds": self.builds,
+                "evictions": self.evictions,
+            }
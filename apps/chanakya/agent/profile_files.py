@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from chanakya.model import AgentProfileModel
 
 _TOKEN_PATTERN = re.compile(r"[a-z0-9]{3,}")
+COMPILED_PROFILE_CACHE_MAX = 64
+PROMPT_SKILL_LIMIT = 3
 
 
 @dataclass(slots=True)
@@ -28,6 +32,41 @@ class AgentFileProfile:
     skill_names: list[str]
 
 
+@dataclass(slots=True)
+class _IndexedSkill:
+    lowered_name: str
+    name_tokens: frozenset[str]
+    description_tokens: frozenset[str]
+    trigger_tokens: frozenset[str]
+
+
+@dataclass(slots=True)
+class CompiledAgentFiles:
+    """Parsed AGENT.md/SKILLS.md with skill tokens computed once per file version."""
+
+    agent_profile: AgentFileProfile
+    skills: list[AgentSkillDefinition]
+    index: list[_IndexedSkill]
+    _prompts: dict[tuple[int, ...], str] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def build(
+        cls, agent_profile: AgentFileProfile, skills: list[AgentSkillDefinition]
+    ) -> CompiledAgentFiles:
+        return cls(agent_profile=agent_profile, skills=skills, index=_index_skills(skills))
+
+    def prompt_for(self, usage_text: str, *, max_count: int = PROMPT_SKILL_LIMIT) -> str:
+        positions = _select_skill_positions(self.index, usage_text=usage_text, max_count=max_count)
+        prompt = self._prompts.get(positions)
+        if prompt is None:
+            # At most a few skill combinations per agent, so the memo stays tiny.
+            prompt = compose_prompt_from_files(
+                self.agent_profile, [self.skills[position] for position in positions]
+            )
+            self._prompts[positions] = prompt
+        return prompt
+
+
 class FileAccessGuard:
     def __init__(self, repo_root: Path) -> None:
         self.repo_root = repo_root.resolve()
@@ -103,13 +142,50 @@ def load_agent_prompt(
     guard = FileAccessGuard(repo_root)
     agent_md = guard.resolve_agent_path(profile.id, "AGENT.md")
     skills_md = guard.resolve_agent_path(profile.id, "SKILLS.md")
-    if not agent_md.exists() or not skills_md.exists():
+    compiled = compile_agent_files(agent_md, skills_md)
+    if compiled is None:
         return str(profile.system_prompt)
-
-    agent_profile = parse_agent_md(agent_md.read_text(encoding="utf-8"))
-    skills = parse_skills_md(skills_md.read_text(encoding="utf-8"))
-    selected = select_relevant_skills(skills, usage_text=usage_text, max_count=3)
-    return compose_prompt_from_files(agent_profile, selected)
+    return compiled.prompt_for(usage_text)
+
+
+_compiled_files: OrderedDict[
+    tuple[Path, Path], tuple[tuple[int, int, int, int], CompiledAgentFiles]
+] = OrderedDict()
+_compiled_files_lock = threading.Lock()
+
+
+def compile_agent_files(agent_md: Path, skills_md: Path) -> CompiledAgentFiles | None:
+    """Return the parsed profile files, re-reading them only when mtime or size changed.
+
+    Returns None when either file is missing.
+    """
+    try:
+        agent_stat = agent_md.stat()
+        skills_stat = skills_md.stat()
+    except FileNotFoundError:
+        return None
+    stamp = (
+        agent_stat.st_mtime_ns,
+        agent_stat.st_size,
+        skills_stat.st_mtime_ns,
+        skills_stat.st_size,
+    )
+    key = (agent_md, skills_md)
+    with _compiled_files_lock:
+        cached = _compiled_files.get(key)
+        if cached is not None and cached[0] == stamp:
+            _compiled_files.move_to_end(key)
+            return cached[1]
+    compiled = CompiledAgentFiles.build(
+        parse_agent_md(agent_md.read_text(encoding="utf-8")),
+        parse_skills_md(skills_md.read_text(encoding="utf-8")),
+    )
+    with _compiled_files_lock:
+        _compiled_files[key] = (stamp, compiled)
+        _compiled_files.move_to_end(key)
+        while len(_compiled_files) > COMPILED_PROFILE_CACHE_MAX:
+            _compiled_files.popitem(last=False)
+    return compiled
 
 
 def parse_agent_md(content: str) -> AgentFileProfile:
@@ -179,34 +255,58 @@ def select_relevant_skills(
     usage_text: str,
     max_count: int,
 ) -> list[AgentSkillDefinition]:
-    if not skills:
-        return []
-    if max_count <= 0:
-        return []
+    positions = _select_skill_positions(
+        _index_skills(skills), usage_text=usage_text, max_count=max_count
+    )
+    return [skills[position] for position in positions]
 
-    normalized = set(_tokenize(usage_text))
-    if not normalized:
-        return skills[:max_count]
 
-    scored: list[tuple[int, AgentSkillDefinition]] = []
+def _index_skills(skills: list[AgentSkillDefinition]) -> list[_IndexedSkill]:
+    indexed: list[_IndexedSkill] = []
     for skill in skills:
-        score = 0
-        lowered_name = skill.name.lower()
-        if lowered_name and lowered_name in usage_text.lower():
-            score += 5
-        score += 2 * len(normalized.intersection(_tokenize(skill.name)))
-        score += len(normalized.intersection(_tokenize(skill.description)))
         trigger_tokens: set[str] = set()
         for trigger in skill.triggers:
             trigger_tokens.update(_tokenize(trigger))
-        score += len(normalized.intersection(trigger_tokens))
+        indexed.append(
+            _IndexedSkill(
+                lowered_name=skill.name.lower(),
+                name_tokens=frozenset(_tokenize(skill.name)),
+                description_tokens=frozenset(_tokenize(skill.description)),
+                trigger_tokens=frozenset(trigger_tokens),
+            )
+        )
+    return indexed
+
+
+def _select_skill_positions(
+    index: list[_IndexedSkill],
+    *,
+    usage_text: str,
+    max_count: int,
+) -> tuple[int, ...]:
+    if not index or max_count <= 0:
+        return ()
+
+    normalized = _tokenize(usage_text)
+    if not normalized:
+        return tuple(range(min(max_count, len(index))))
+
+    lowered_usage = usage_text.lower()
+    scored: list[tuple[int, int]] = []
+    for position, entry in enumerate(index):
+        score = 0
+        if entry.lowered_name and entry.lowered_name in lowered_usage:
+            score += 5
+        score += 2 * len(normalized.intersection(entry.name_tokens))
+        score += len(normalized.intersection(entry.description_tokens))
+        score += len(normalized.intersection(entry.trigger_tokens))
         if score > 0:
-            scored.append((score, skill))
+            scored.append((score, position))
 
     scored.sort(key=lambda item: item[0], reverse=True)
     if scored:
-        return [item[1] for item in scored[:max_count]]
-    return skills[:1]
+        return tuple(position for _score, position in scored[:max_count])
+    return (0,)
 
 
 def compose_prompt_from_files(
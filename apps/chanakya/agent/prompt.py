@@ -1,12 +1,14 @@
+import threading
 from datetime import datetime
 
 from agent_framework import MCPStdioTool
 
 from chanakya.domain import now_iso
 from chanakya.model import AgentProfileModel
+from chanakya.services.tool_loader import get_tools_generation
 
 
-def _build_runtime_prompt_prelude() -> str:
+def build_runtime_prompt_prelude() -> str:
     current_utc_time = now_iso()
     local_now = datetime.now().astimezone()
     local_label = local_now.tzname() or str(local_now.tzinfo or "local")
@@ -23,27 +25,57 @@ def inject_tools_into_prompt(
     tools_cache: list[MCPStdioTool],
     *,
     base_prompt: str | None = None,
+    runtime_context: bool = True,
 ) -> str:
-    """Takes the system prompt and explicitly tells the LLM the tools it has."""
+    """Takes the system prompt and explicitly tells the LLM the tools it has.
+
+    The profile prompt and tool section come first and stay byte-identical
+    between builds; the clock-dependent runtime context goes last so provider
+    prefix caches keep matching. Agents that outlive one run pass
+    ``runtime_context=False`` and send ``build_runtime_prompt_prelude()`` per run.
+    """
     base_prompt = str(base_prompt if base_prompt is not None else profile.system_prompt)
-    base_prompt = f"{_build_runtime_prompt_prelude()}\n\n{base_prompt}"
+    prompt = f"{base_prompt}{render_tool_section(tools_cache)}"
+    if not runtime_context:
+        return prompt
+    return f"{prompt}\n\n{build_runtime_prompt_prelude()}"
+
+
+_tool_sections: dict[tuple[str, ...], str] = {}
+_tool_sections_generation = -1
+_tool_sections_lock = threading.Lock()
+
+
+def render_tool_section(tools_cache: list[MCPStdioTool]) -> str:
+    """Render the "Available External Capabilities" block for these tools.
+
+    Memoized per tool set until ``tool_loader`` reloads its tools, so every
+    agent sharing a tool set gets the same string without re-walking functions.
+    """
+    global _tool_sections_generation
     if not tools_cache:
-        return base_prompt
+        return ""
+    key = tuple(str(getattr(tool, "name", "")) for tool in tools_cache)
+    generation = get_tools_generation()
+    with _tool_sections_lock:
+        if generation != _tool_sections_generation:
+            _tool_sections.clear()
+            _tool_sections_generation = generation
+        cached = _tool_sections.get(key)
+    if cached is not None:
+        return cached
 
-    # We load descriptions directly from the cached tools
     extensions = ["\n\n# Available External Capabilities\n"]
-
     for tool in tools_cache:
-        # tool.allowed_tools or just tool._functions properties?
-        # Actually `mcp_calculator` defines tools within it.
-        # MCPTool has `.functions` property or `get_allowed_functions()`
-        funcs = tool.functions
-        for func in funcs:
+        for func in tool.functions:
             extensions.append(f"- Tool Name: `{func.name}`")
             if func.description:
                 extensions.append(f"  Description: {func.description}")
-
-    return base_prompt + "\n".join(extensions)
+    section = "\n".join(extensions)
+    with _tool_sections_lock:
+        if generation == _tool_sections_generation:
+            _tool_sections[key] = section
+    return section
 
 
 def get_allowed_tool_ids_for_agent(profile: AgentProfileModel) -> list[str]:
@@ -1,18 +1,18 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
-from urllib.error import URLError
-from urllib.request import urlopen
 
 from agent_framework import Agent, AgentResponse, Message
 from agent_framework.openai import OpenAIChatCompletionClient
 from sqlalchemy.orm import Session, sessionmaker
 
+from chanakya.agent.clients import get_default_model_cache, get_shared_async_client
 from chanakya.agent.profile_files import load_agent_prompt
 from chanakya.agent.prompt import inject_tools_into_prompt
 from chanakya.config import (
@@ -25,8 +25,13 @@ from chanakya.debug import debug_log
 from chanakya.history_provider import SQLAlchemyHistoryProvider
 from chanakya.mcp_runtime import ToolExecutionTrace, extract_tool_execution_traces
 from chanakya.model import AgentProfileModel
+from chanakya.profile_cache import get_profile_cache
 from chanakya.services.async_loop import run_in_maf_loop
-from chanakya.services.tool_loader import get_cached_tools, get_tools_availability
+from chanakya.services.tool_loader import (
+    get_cached_tools,
+    get_tools_availability,
+    get_tools_generation,
+)
 from chanakya.store import AgentSessionContextRepository
 
 
@@ -44,48 +49,67 @@ def normalize_runtime_backend(backend: str | None) -> str:
     return "local"
 
 
+CHAT_CLIENT_CACHE_MAX = 64
+
+_chat_clients: OrderedDict[tuple[Any, ...], OpenAIChatCompletionClient] = OrderedDict()
+_chat_clients_lock = threading.Lock()
+
+
 def create_openai_chat_client(
     *,
     model_id: str | None = None,
     env_file_path: str = ".env",
     default_headers: dict[str, str] | None = None,
 ) -> OpenAIChatCompletionClient:
+    """Return a chat client for the configured endpoint, reusing an existing one.
+
+    Clients are kept per (base_url, model, api key, headers) and all clients of
+    one endpoint share its HTTP connection pool. When no model is configured the
+    endpoint's default comes from ``DefaultModelCache``, so this call does not
+    wait on the network once the cache is warm; off the event loop a cold cache
+    falls back to one inline fetch.
+    """
     cfg = get_openai_compatible_config()
+    base_url = str(cfg.get("base_url") or "").strip() or None
     resolved_api_key = str(cfg.get("api_key") or "").strip() or None
     resolved_model = str(model_id or cfg.get("model") or "").strip() or None
-    if resolved_model is None:
-        try:
-            with urlopen(f"{cfg.get('base_url')}/models/", timeout=1.0) as response:
-                payload = json.loads(response.read().decode("utf-8"))
-        except (OSError, TimeoutError, ValueError, URLError):
-            payload = None
-        models = payload.get("data") if isinstance(payload, dict) else None
-        if isinstance(models, list):
-            for item in models:
-                if not isinstance(item, dict):
-                    continue
-                provider_type = str(item.get("provider_type") or "").strip().lower()
-                candidate = str(item.get("id") or "").strip()
-                if candidate and provider_type == "llm":
-                    resolved_model = candidate
-                    break
-            if resolved_model is None:
-                for item in models:
-                    if not isinstance(item, dict):
-                        continue
-                    candidate = str(item.get("id") or "").strip()
-                    if candidate:
-                        resolved_model = candidate
-                        break
-    if resolved_api_key is None and str(cfg.get("base_url") or "").strip():
+    if resolved_model is None and base_url is not None:
+        resolved_model = get_default_model_cache().get(base_url)
+    if resolved_api_key is None and base_url is not None:
         resolved_api_key = "air-local-placeholder"
-    return OpenAIChatCompletionClient(
+    key = (
+        base_url,
+        resolved_model,
+        resolved_api_key,
+        tuple(sorted((default_headers or {}).items())),
+        env_file_path,
+    )
+    with _chat_clients_lock:
+        cached = _chat_clients.get(key)
+        if cached is not None:
+            _chat_clients.move_to_end(key)
+            return cached
+    async_client = None
+    if base_url is not None and resolved_api_key is not None:
+        async_client = get_shared_async_client(
+            base_url=base_url, api_key=resolved_api_key, default_headers=default_headers
+        )
+    client = OpenAIChatCompletionClient(
         model=resolved_model,
         api_key=resolved_api_key,
-        base_url=cfg.get("base_url"),
+        base_url=base_url,
         default_headers=default_headers,
+        async_client=async_client,
         env_file_path=env_file_path if os.path.exists(env_file_path) else None,
     )
+    if resolved_model is None:
+        # Unresolved default model: do not pin this client for later callers.
+        return client
+    with _chat_clients_lock:
+        _chat_clients[key] = client
+        while len(_chat_clients) > CHAT_CLIENT_CACHE_MAX:
+            _chat_clients.popitem(last=False)
+    return client
 
 
 def build_profile_agent_config(profile: AgentProfileModel) -> ProfileAgentConfig:
@@ -96,12 +120,20 @@ def build_profile_agent_config(profile: AgentProfileModel) -> ProfileAgentConfig
     )
 
 
+def format_prompt_addendum(prompt_addendum: str | None) -> str | None:
+    addendum = str(prompt_addendum or "").strip()
+    if not addendum:
+        return None
+    return f"# Execution Mode Guidance\n{addendum}"
+
+
 def build_profile_agent_config_for_usage(
     profile: AgentProfileModel,
     *,
     usage_text: str = "",
     prompt_addendum: str | None = None,
     repo_root: Path | None = None,
+    runtime_context: bool = True,
 ) -> ProfileAgentConfig:
     availability = get_tools_availability()
     all_cached = get_cached_tools()
@@ -109,10 +141,15 @@ def build_profile_agent_config_for_usage(
     cached_tools = [t for t in all_cached if getattr(t, "name", None) in allowed_ids]
     root = repo_root or Path(__file__).resolve().parents[3]
     profile_prompt = load_agent_prompt(profile, repo_root=root, usage_text=usage_text)
-    addendum = str(prompt_addendum or "").strip()
+    addendum = format_prompt_addendum(prompt_addendum)
     if addendum:
-        profile_prompt = f"{profile_prompt}\n\n# Execution Mode Guidance\n{addendum}"
-    system_prompt = inject_tools_into_prompt(profile, cached_tools, base_prompt=profile_prompt)
+        profile_prompt = f"{profile_prompt}\n\n{addendum}"
+    system_prompt = inject_tools_into_prompt(
+        profile,
+        cached_tools,
+        base_prompt=profile_prompt,
+        runtime_context=runtime_context,
+    )
     return ProfileAgentConfig(
         system_prompt=system_prompt,
         cached_tools=cached_tools,
@@ -132,12 +169,14 @@ def build_profile_agent(
     usage_text: str = "",
     prompt_addendum: str | None = None,
     repo_root: Path | None = None,
+    runtime_context: bool = True,
 ) -> tuple[Agent, ProfileAgentConfig]:
     config = build_profile_agent_config_for_usage(
         profile,
         usage_text=usage_text,
         prompt_addendum=prompt_addendum,
         repo_root=repo_root,
+        runtime_context=runtime_context,
     )
     context_providers = None
     if include_history:
@@ -217,6 +256,7 @@ class MAFRuntime:
         )
         self.availability = config.availability
         self.cached_tools = config.cached_tools
+        self._config_key = self._profile_config_key()
 
         debug_log(
             "maf_runtime_initialized",
@@ -231,12 +271,27 @@ class MAFRuntime:
             },
         )
 
+    def _profile_config_key(self) -> tuple[int, int]:
+        cache = get_profile_cache(self.session_factory)
+        return (-1 if cache is None else cache.version, get_tools_generation())
+
     def _refresh_profile_and_tools(self) -> None:
-        with self.session_factory() as session:
-            latest = session.get(AgentProfileModel, self.profile.id)
-            if latest is None:
-                return
-            self.profile = latest
+        """Pick up profile edits and tool reloads; a no-op while neither happened."""
+        key = self._profile_config_key()
+        if key == self._config_key and key[0] >= 0:
+            return
+        cache = get_profile_cache(self.session_factory)
+        profile_id = self.profile.id
+
+        def load() -> AgentProfileModel | None:
+            with self.session_factory() as session:
+                return session.get(AgentProfileModel, profile_id)
+
+        latest = load() if cache is None else cache.get(profile_id, load)
+        if latest is None:
+            return
+        self.profile = latest
+        self._config_key = key
         config = build_profile_agent_config_for_usage(
             self.profile,
             usage_text="",
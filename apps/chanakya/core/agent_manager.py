@@ -21,12 +21,15 @@ from agent_framework_orchestrations._group_chat import (
 )
 from sqlalchemy.orm import Session, sessionmaker
 
+from chanakya.agent.pool import ProfileAgentPool
 from chanakya.agent.profile_files import load_agent_prompt
+from chanakya.agent.prompt import build_runtime_prompt_prelude
 from chanakya.agent.runtime import (
     MAFRuntime,
     build_profile_agent,
     build_profile_agent_config_for_usage,
     create_openai_chat_client,
+    format_prompt_addendum,
     normalize_runtime_backend,
 )
 from chanakya.config import (
@@ -54,6 +57,7 @@ from chanakya.mcp_runtime import (
     normalize_tool_spec_summary,
 )
 from chanakya.model import AgentProfileModel
+from chanakya.profile_cache import get_profile_cache
 from chanakya.services.async_loop import run_in_maf_loop
 from chanakya.services.mcp_sandbox_exec_server import execute_python
 from chanakya.services.sandbox_workspace import (
@@ -61,6 +65,7 @@ from chanakya.services.sandbox_workspace import (
     normalize_work_id,
     resolve_shared_workspace,
 )
+from chanakya.services.tool_loader import get_tools_generation
 from chanakya.store import ChanakyaStore
 from chanakya.subagents import (
     TemporaryAgentPlan,
@@ -444,6 +449,7 @@ class AgentManager:
         )
         self._a2a_agents: dict[str, Any] = {}
         self._a2a_session_sequence = 0
+        self.agent_pool = ProfileAgentPool()
         self.subagent_orchestrator = WorkerSubagentOrchestrator(
             store=store,
             session_factory=session_factory,
@@ -5697,14 +5703,12 @@ class AgentManager:
                 tools_enabled=True,
             )
         profile_request_id = make_id("req")
-        agent, _ = build_profile_agent(
+        agent = self._acquire_profile_agent(
             profile,
-            self.session_factory,
-            client=self._resolve_client(),
             usage_text=prompt,
             include_history=include_history,
-            prompt_addendum=self._build_active_workspace_prompt_addendum(profile),
         )
+        run_instructions = self._profile_run_instructions(profile)
         profile_session_id = (
             self._resolve_profile_session_id(profile)
             if include_history and use_work_session
@@ -5724,7 +5728,7 @@ class AgentManager:
                     agent.run(
                         Message("user", [prompt]),
                         session=session,
-                        options={"store": store},
+                        options={"store": store, "instructions": run_instructions},
                     ),
                     timeout=self._resolve_request_timeout_seconds(prompt),
                 ),
@@ -5738,13 +5742,10 @@ class AgentManager:
                 session_id=profile_session_id,
                 user_text=prompt,
             )
-            fallback_agent, _ = build_profile_agent(
+            fallback_agent = self._acquire_profile_agent(
                 profile,
-                self.session_factory,
-                client=self._resolve_client(),
                 usage_text=seeded_prompt,
                 include_history=False,
-                prompt_addendum=self._build_active_workspace_prompt_addendum(profile),
             )
             fallback_session = (
                 None
@@ -5759,7 +5760,7 @@ class AgentManager:
                     fallback_agent.run(
                         Message("user", [seeded_prompt]),
                         session=fallback_session,
-                        options={"store": False},
+                        options={"store": False, "instructions": run_instructions},
                     ),
                     timeout=self._resolve_request_timeout_seconds(seeded_prompt),
                 ),
@@ -5782,6 +5783,46 @@ class AgentManager:
                     )
             return response_text
 
+    def _profile_agent_identity(self, profile: AgentProfileModel) -> tuple[Any, ...]:
+        cache = get_profile_cache(self.session_factory)
+        return (
+            profile.id,
+            profile.name,
+            -1 if cache is None else cache.version,
+            get_tools_generation(),
+            tuple(profile.tool_ids_json or []),
+        )
+
+    def _acquire_profile_agent(
+        self,
+        profile: AgentProfileModel,
+        *,
+        usage_text: str,
+        include_history: bool,
+    ) -> Agent:
+        """Return a pooled agent for ``profile``; addenda go in as run-time instructions."""
+        client = self._resolve_client()
+        repo_root = Path(__file__).resolve().parents[3]
+        instructions = load_agent_prompt(profile, repo_root=repo_root, usage_text=usage_text)
+        return self.agent_pool.acquire(
+            (*self._profile_agent_identity(profile), "tools", include_history, instructions),
+            client,
+            lambda: build_profile_agent(
+                profile,
+                self.session_factory,
+                client=client,
+                usage_text=usage_text,
+                include_history=include_history,
+                repo_root=repo_root,
+                runtime_context=False,
+            )[0],
+        )
+
+    def _profile_run_instructions(self, profile: AgentProfileModel) -> str:
+        """Per-run context appended to a pooled agent's instructions."""
+        addendum = format_prompt_addendum(self._build_active_workspace_prompt_addendum(profile))
+        return "\n\n".join(item for item in (build_runtime_prompt_prelude(), addendum) if item)
+
     @staticmethod
     def _is_missing_user_query_error(exc: Exception) -> bool:
         return "no user query found in messages" in str(exc).lower()
@@ -5990,13 +6031,20 @@ class AgentManager:
                 use_work_session=False,
                 tools_enabled=False,
             )
-        repo_root = Path(__file__).resolve().parents[3]
-        agent = Agent(
-            client=self._resolve_client(),
-            name=profile.name,
-            instructions=load_agent_prompt(profile, repo_root=repo_root, usage_text=prompt),
-            tools=None,
-            context_providers=None,
+        client = self._resolve_client()
+        instructions = load_agent_prompt(
+            profile, repo_root=Path(__file__).resolve().parents[3], usage_text=prompt
+        )
+        agent = self.agent_pool.acquire(
+            (*self._profile_agent_identity(profile), "no_tools", instructions),
+            client,
+            lambda: Agent(
+                client=client,
+                name=profile.name,
+                instructions=instructions,
+                tools=None,
+                context_providers=None,
+            ),
         )
         response = await with_transient_retry(
             lambda: asyncio.wait_for(
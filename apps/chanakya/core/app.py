@@ -6,12 +6,14 @@ import queue
 import re
 import signal
 import threading
+from collections.abc import Callable
 from dataclasses import asdict
 from pathlib import Path
 from typing import Any
 
 from flask import Flask, Response, jsonify, render_template, request, send_file
 
+from chanakya.agent.clients import warm_default_model
 from chanakya.agent.profile_files import default_heartbeat_relative_path, ensure_agent_profile_files
 from chanakya.agent.runtime import MAFRuntime, normalize_runtime_backend
 from chanakya.agent_manager import AgentManager
@@ -27,6 +29,9 @@ from chanakya.config import (
     get_database_url,
     get_long_term_memory_default_owner_id,
     get_ntfy_default_server_url,
+    get_retention_archive_dir,
+    get_retention_enabled,
+    get_retention_interval_seconds,
     load_local_env,
 )
 from chanakya.conversation_layer_support import get_conversation_preference_defaults
@@ -35,9 +40,11 @@ from chanakya.debug import debug_log
 from chanakya.domain import make_id, now_iso
 from chanakya.heartbeat import read_heartbeat, resolve_heartbeat_path
 from chanakya.model import AgentProfileModel
+from chanakya.retention import RetentionManager, list_retention_rollups
 from chanakya.seed import load_agent_seeds
 from chanakya.services.a2a_discovery import discover_a2a_options
 from chanakya.services.config_loader import get_mcp_config_path
+from chanakya.services.file_reaper import FileReaper
 from chanakya.services.mcp_sandbox_exec_server import (
     ensure_sandbox_image,
     prune_stale_work_containers,
@@ -382,6 +389,7 @@ def create_app() -> Flask:
     from chanakya.services.tool_loader import initialize_all_tools
 
     initialize_all_tools()
+    warm_default_model()
 
     chanakya_profile = store.get_agent_profile("agent_chanakya")
     manager_profile = store.get_agent_profile("agent_manager")
@@ -399,6 +407,14 @@ def create_app() -> Flask:
         chat_service = ChatService(store, runtime, manager)
     app.extensions["chanakya_store"] = store
     app.extensions["ntfy_dispatcher"] = ntfy_dispatcher
+    retention = RetentionManager(
+        session_factory, archive_dir=get_retention_archive_dir() or data_dir / "archive"
+    )
+    if get_retention_enabled():
+        retention.start(get_retention_interval_seconds())
+    app.extensions["chanakya_retention"] = retention
+    file_reaper = FileReaper()
+    app.extensions["chanakya_file_reaper"] = file_reaper
 
     def get_runtime_config() -> dict[str, Any]:
         return _normalize_runtime_config(store.get_runtime_config())
@@ -678,15 +694,42 @@ def create_app() -> Flask:
 
     @app.get("/api/sessions/<session_id>")
     def api_session(session_id: str) -> Any:
-        messages = store.list_messages(session_id)
+        try:
+            after_id, before_id, limit = _parse_keyset_args(
+                request.args, default_limit=None, max_limit=1000
+            )
+            omit = _parse_omit_arg(request.args)
+            if after_id is None and before_id is None and limit is None:
+                messages = store.list_messages(session_id, omit=omit)
+                page = None
+            else:
+                messages, page = _keyset_page(
+                    lambda fetch_limit: store.list_messages(
+                        session_id,
+                        after_id=after_id,
+                        before_id=before_id,
+                        limit=fetch_limit,
+                        omit=omit,
+                    ),
+                    after_id=after_id,
+                    before_id=before_id,
+                    limit=limit,
+                )
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
         debug_log(
             "api_session_request",
             {
                 "session_id": session_id,
                 "message_count": len(messages),
+                "after_id": after_id,
+                "before_id": before_id,
             },
         )
-        return jsonify({"session_id": session_id, "messages": messages})
+        payload: dict[str, Any] = {"session_id": session_id, "messages": messages}
+        if page is not None:
+            payload["page"] = page
+        return jsonify(payload)
 
     @app.get("/api/sessions/<session_id>/active-work")
     def api_session_active_work(session_id: str) -> Any:
@@ -708,9 +751,23 @@ def create_app() -> Flask:
 
     @app.get("/api/events")
     def api_events() -> Any:
-        events = store.list_events(limit=100)
+        try:
+            after_id, before_id, limit = _parse_keyset_args(
+                request.args, default_limit=100, max_limit=500
+            )
+            omit = _parse_omit_arg(request.args)
+            events, page = _keyset_page(
+                lambda fetch_limit: store.list_events(
+                    fetch_limit, after_id=after_id, before_id=before_id, omit=omit
+                ),
+                after_id=after_id,
+                before_id=before_id,
+                limit=limit,
+            )
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
         debug_log("api_events_request", {"event_count": len(events)})
-        return jsonify({"events": events})
+        return jsonify({"events": events, "page": page})
 
     @app.get("/api/requests")
     def api_requests() -> Any:
@@ -764,12 +821,16 @@ def create_app() -> Flask:
                 limit=limit,
             )
         else:
-            tasks = store.list_tasks(
-                session_id=session_id,
-                request_id=request_id,
-                root_only=root_only,
-                limit=limit,
-            )
+            try:
+                tasks = store.list_tasks(
+                    session_id=session_id,
+                    request_id=request_id,
+                    root_only=root_only,
+                    limit=limit,
+                    omit=_parse_omit_arg(request.args),
+                )
+            except ValueError as exc:
+                return jsonify({"error": str(exc)}), 400
         debug_log("api_tasks_request", {"task_count": len(tasks)})
         return jsonify({"tasks": tasks})
 
@@ -778,20 +839,29 @@ def create_app() -> Flask:
         session_id = request.args.get("session_id")
         request_id = request.args.get("request_id")
         task_id = request.args.get("task_id")
-        raw_limit = request.args.get("limit", "100")
         try:
-            limit = int(raw_limit)
-        except (TypeError, ValueError):
-            limit = 100
-        limit = max(1, min(limit, 500))
-        events = store.list_task_events(
-            session_id=session_id,
-            request_id=request_id,
-            task_id=task_id,
-            limit=limit,
-        )
+            after_id, before_id, limit = _parse_keyset_args(
+                request.args, default_limit=100, max_limit=500
+            )
+            omit = _parse_omit_arg(request.args)
+            events, page = _keyset_page(
+                lambda fetch_limit: store.list_task_events(
+                    session_id=session_id,
+                    request_id=request_id,
+                    task_id=task_id,
+                    limit=fetch_limit,
+                    after_id=after_id,
+                    before_id=before_id,
+                    omit=omit,
+                ),
+                after_id=after_id,
+                before_id=before_id,
+                limit=limit,
+            )
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
         debug_log("api_task_events_request", {"event_count": len(events)})
-        return jsonify({"events": events})
+        return jsonify({"events": events, "page": page})
 
     @app.get("/api/memory")
     def api_memory() -> Any:
@@ -870,6 +940,33 @@ def create_app() -> Flask:
             }
         )
 
+    @app.get("/api/retention")
+    def api_retention() -> Any:
+        table_name = request.args.get("table")
+        report = retention.last_report
+        return jsonify(
+            {
+                "last_run": report.to_dict() if report is not None else None,
+                "rollups": list_retention_rollups(session_factory, table_name=table_name),
+            }
+        )
+
+    @app.post("/api/retention/run")
+    def api_retention_run() -> Any:
+        return jsonify(retention.run_once().to_dict())
+
+    @app.get("/api/memory/jobs/metrics")
+    def api_memory_job_metrics() -> Any:
+        return jsonify(chat_service.memory_jobs.metrics())
+
+    @app.get("/api/write-behind/metrics")
+    def api_write_behind_metrics() -> Any:
+        return jsonify(store.write_behind_metrics())
+
+    @app.get("/api/agent-pool/metrics")
+    def api_agent_pool_metrics() -> Any:
+        return jsonify(manager.agent_pool.stats())
+
     @app.get("/api/sessions/<session_id>/memory")
     def api_session_memory(session_id: str) -> Any:
         owner_id = (
@@ -1248,12 +1345,7 @@ def create_app() -> Flask:
         container_cleanup = stop_container(work_id)
         workspace_cleanup = delete_shared_workspace(work_id)
         artifact_root = get_artifact_storage_root(create=False)
-        for artifact_id in deleted_artifact_ids:
-            artifact_dir = artifact_root / artifact_id
-            if artifact_dir.exists():
-                for p in sorted(artifact_dir.rglob("*"), reverse=True):
-                    p.unlink() if p.is_file() else p.rmdir()
-                artifact_dir.rmdir()
+        file_reaper.schedule(artifact_root / artifact_id for artifact_id in deleted_artifact_ids)
         store.log_event(
             "work_deleted",
             {
@@ -1360,23 +1452,28 @@ def create_app() -> Flask:
             message = str(exc.args[0]) if exc.args else str(exc)
             return jsonify({"error": message}), 404
         raw_task_limit = request.args.get("task_limit", "2000")
-        raw_event_limit = request.args.get("event_limit", "5000")
         raw_request_limit = request.args.get("request_limit", "2000")
         try:
             task_limit = int(raw_task_limit)
         except (TypeError, ValueError):
             task_limit = 2000
-        try:
-            event_limit = int(raw_event_limit)
-        except (TypeError, ValueError):
-            event_limit = 5000
         try:
             request_limit = int(raw_request_limit)
         except (TypeError, ValueError):
             request_limit = 2000
         task_limit = max(100, min(task_limit, 10000))
-        event_limit = max(100, min(event_limit, 20000))
         request_limit = max(100, min(request_limit, 10000))
+        try:
+            # Messages page per agent session; task events page across the work.
+            after_id, before_id, message_limit = _parse_keyset_args(
+                request.args, default_limit=None, max_limit=1000
+            )
+            event_after_id, event_before_id, event_limit = _parse_keyset_args(
+                request.args, default_limit=5000, max_limit=20000, prefix="event_"
+            )
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        paged_messages = not (after_id is None and before_id is None and message_limit is None)
         mappings = store.list_work_agent_sessions(work_id)
         grouped = []
         mapped_session_ids: list[str] = []
@@ -1384,9 +1481,24 @@ def create_app() -> Flask:
         agent_role_by_id: dict[str, str] = {}
         chanakya_session_id = ""
         conversation_messages: list[dict[str, Any]] = []
+        conversation_page: dict[str, Any] | None = None
         for mapping in mappings:
             session_id = str(mapping.get("session_id") or "")
-            messages = store.list_messages(session_id)
+            message_page: dict[str, Any] | None = None
+            if paged_messages:
+                messages, message_page = _keyset_page(
+                    lambda fetch_limit, session_id=session_id: store.list_messages(
+                        session_id,
+                        after_id=after_id,
+                        before_id=before_id,
+                        limit=fetch_limit,
+                    ),
+                    after_id=after_id,
+                    before_id=before_id,
+                    limit=message_limit,
+                )
+            else:
+                messages = store.list_messages(session_id)
             if session_id:
                 mapped_session_ids.append(session_id)
             agent_id = str(mapping.get("agent_id") or "")
@@ -1421,25 +1533,27 @@ def create_app() -> Flask:
             if agent_id == "agent_chanakya":
                 chanakya_session_id = session_id
                 conversation_messages = messages
-            grouped.append(
-                {
-                    "agent_id": mapping.get("agent_id"),
-                    "agent_name": mapping.get("agent_name"),
-                    "agent_role": mapping.get("agent_role"),
-                    "session_id": session_id,
-                    "message_count": len(messages),
-                    "message_stats": {
-                        "user_count": user_count,
-                        "assistant_count": assistant_count,
-                        "mirrored_count": mirrored_count,
-                        "visible_count": visible_count,
-                        "private_count": private_count,
-                    },
-                    "latest_message_preview": latest_preview,
-                    "latest_created_at": latest_created_at,
-                    "messages": messages,
-                }
-            )
+                conversation_page = message_page
+            group: dict[str, Any] = {
+                "agent_id": mapping.get("agent_id"),
+                "agent_name": mapping.get("agent_name"),
+                "agent_role": mapping.get("agent_role"),
+                "session_id": session_id,
+                "message_count": len(messages),
+                "message_stats": {
+                    "user_count": user_count,
+                    "assistant_count": assistant_count,
+                    "mirrored_count": mirrored_count,
+                    "visible_count": visible_count,
+                    "private_count": private_count,
+                },
+                "latest_message_preview": latest_preview,
+                "latest_created_at": latest_created_at,
+                "messages": messages,
+            }
+            if message_page is not None:
+                group["page"] = message_page
+            grouped.append(group)
         for profile in store.list_agent_profiles():
             if profile.id not in agent_name_by_id:
                 agent_name_by_id[profile.id] = profile.name
@@ -1468,33 +1582,50 @@ def create_app() -> Flask:
                     task_copy["owner_agent_name"] = agent_name_by_id.get(owner_agent_id)
                     task_copy["owner_agent_role"] = agent_role_by_id.get(owner_agent_id)
                     tasks_by_id[task_id] = task_copy
-            events = store.list_task_events(session_id=session_id, limit=event_limit)
-            for event in events:
-                task_id = str(event.get("task_id") or "")
-                linked_task = tasks_by_id.get(task_id)
-                owner_agent_id = ""
-                if linked_task is not None:
-                    owner_agent_id = str(linked_task.get("owner_agent_id") or "")
-                task_flow.append(
-                    {
-                        "event_id": event.get("id"),
-                        "created_at": event.get("created_at"),
-                        "event_type": event.get("event_type"),
-                        "session_id": event.get("session_id"),
-                        "request_id": event.get("request_id"),
-                        "task_id": task_id or None,
-                        "payload": event.get("payload"),
-                        "task_title": None if linked_task is None else linked_task.get("title"),
-                        "task_type": None if linked_task is None else linked_task.get("task_type"),
-                        "task_status": None if linked_task is None else linked_task.get("status"),
-                        "task_parent_id": (
-                            None if linked_task is None else linked_task.get("parent_task_id")
-                        ),
-                        "owner_agent_id": owner_agent_id or None,
-                        "owner_agent_name": agent_name_by_id.get(owner_agent_id),
-                        "owner_agent_role": agent_role_by_id.get(owner_agent_id),
-                    }
-                )
+        events, task_flow_page = _keyset_page(
+            lambda fetch_limit: sorted(
+                (
+                    event
+                    for session_id in unique_session_ids
+                    for event in store.list_task_events(
+                        session_id=session_id,
+                        after_id=event_after_id,
+                        before_id=event_before_id,
+                        limit=fetch_limit,
+                    )
+                ),
+                key=lambda event: int(event["id"]),
+            ),
+            after_id=event_after_id,
+            before_id=event_before_id,
+            limit=event_limit,
+        )
+        for event in events:
+            task_id = str(event.get("task_id") or "")
+            linked_task = tasks_by_id.get(task_id)
+            owner_agent_id = ""
+            if linked_task is not None:
+                owner_agent_id = str(linked_task.get("owner_agent_id") or "")
+            task_flow.append(
+                {
+                    "event_id": event.get("id"),
+                    "created_at": event.get("created_at"),
+                    "event_type": event.get("event_type"),
+                    "session_id": event.get("session_id"),
+                    "request_id": event.get("request_id"),
+                    "task_id": task_id or None,
+                    "payload": event.get("payload"),
+                    "task_title": None if linked_task is None else linked_task.get("title"),
+                    "task_type": None if linked_task is None else linked_task.get("task_type"),
+                    "task_status": None if linked_task is None else linked_task.get("status"),
+                    "task_parent_id": (
+                        None if linked_task is None else linked_task.get("parent_task_id")
+                    ),
+                    "owner_agent_id": owner_agent_id or None,
+                    "owner_agent_name": agent_name_by_id.get(owner_agent_id),
+                    "owner_agent_role": agent_role_by_id.get(owner_agent_id),
+                }
+            )
         task_flow.sort(
             key=lambda item: (
                 str(item.get("created_at") or ""),
@@ -1665,6 +1796,7 @@ def create_app() -> Flask:
                     "assistant_count": conversation_assistant_count,
                     "user_count": conversation_user_count,
                     "messages": conversation_messages,
+                    **({} if conversation_page is None else {"page": conversation_page}),
                 },
                 "agent_histories": grouped,
                 "group_chat_inspector": {
@@ -1675,6 +1807,7 @@ def create_app() -> Flask:
                 "active_runtime": active_runtime,
                 "artifacts": work_artifacts,
                 "task_flow": task_flow,
+                "task_flow_page": task_flow_page,
                 "tasks": task_records,
                 "requests": request_records,
                 "limits": {
@@ -1801,11 +1934,15 @@ def create_app() -> Flask:
         except (TypeError, ValueError):
             limit = 100
         limit = max(1, min(limit, 500))
-        traces = store.list_tool_invocations(
-            session_id=session_id,
-            request_id=request_id,
-            limit=limit,
-        )
+        try:
+            traces = store.list_tool_invocations(
+                session_id=session_id,
+                request_id=request_id,
+                limit=limit,
+                omit=_parse_omit_arg(request.args),
+            )
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
         debug_log("api_tool_traces_request", {"trace_count": len(traces)})
         return jsonify({"traces": traces})
 
@@ -2035,6 +2172,65 @@ def _allocate_agent_profile_id(store: ChanakyaStore, name: str) -> str:
     return candidate
 
 
+def _parse_keyset_args(
+    args: Any, *, default_limit: int | None, max_limit: int, prefix: str = ""
+) -> tuple[int | None, int | None, int | None]:
+    """Read ``after_id``/``before_id``/``limit``, each optionally ``prefix``-ed."""
+    cursors: list[int | None] = []
+    for name in (f"{prefix}after_id", f"{prefix}before_id"):
+        raw = args.get(name)
+        if raw in (None, ""):
+            cursors.append(None)
+            continue
+        try:
+            cursors.append(int(raw))
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} must be an integer") from None
+    raw_limit = args.get(f"{prefix}limit")
+    limit = default_limit
+    if raw_limit not in (None, ""):
+        try:
+            limit = int(raw_limit)
+        except (TypeError, ValueError):
+            limit = default_limit
+    if limit is not None:
+        limit = max(1, min(limit, max_limit))
+    return cursors[0], cursors[1], limit
+
+
+def _parse_omit_arg(args: Any) -> tuple[str, ...]:
+    """Parse ``?omit=content,metadata`` into the bulky fields a list should skip."""
+    raw = str(args.get("omit") or "")
+    return tuple(name.strip() for name in raw.split(",") if name.strip())
+
+
+def _keyset_page(
+    fetch: Callable[[int | None], list[dict[str, Any]]],
+    *,
+    after_id: int | None,
+    before_id: int | None,
+    limit: int | None,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Fetch one id-ordered page plus one probe row to tell whether more remain.
+
+    Forward pages (``after_id`` only) drop the extra newest row; tail and backward
+    pages drop the extra oldest row. Items are always returned oldest first.
+    """
+    items = fetch(None if limit is None else limit + 1)
+    forward = after_id is not None and before_id is None
+    has_more = limit is not None and len(items) > limit
+    if has_more:
+        items = items[:limit] if forward else items[-limit:]
+    return items, {
+        "after_id": after_id,
+        "before_id": before_id,
+        "limit": limit,
+        "has_more": has_more,
+        "first_id": items[0]["id"] if items else None,
+        "last_id": items[-1]["id"] if items else None,
+    }
+
+
 def _parse_required_string(payload: dict[str, Any], field_name: str) -> str:
     value = payload.get(field_name, "")
     if value is None or not isinstance(value, str):
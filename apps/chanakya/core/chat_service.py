@@ -5,7 +5,6 @@ import mimetypes
 import re
 import threading
 from collections import OrderedDict
-from concurrent.futures import ThreadPoolExecutor
 from itertools import islice
 from pathlib import Path
 from typing import Any
@@ -32,7 +31,8 @@ from chanakya.domain import (
     make_id,
     now_iso,
 )
-from chanakya.services.long_term_memory import LongTermMemoryService, run_memory_update_job
+from chanakya.services.long_term_memory import LongTermMemoryService
+from chanakya.services.memory_job_queue import MemoryJobQueue
 from chanakya.services.ntfy import NtfyNotificationDispatcher, summarize_notification_text
 from chanakya.services.sandbox_workspace import (
     CLASSIC_ARTIFACT_WORKSPACE_ID,
@@ -205,13 +205,12 @@ class ChatService:
         self._work_locks: OrderedDict[str, threading.Lock] = OrderedDict()
         self._work_locks_guard = threading.Lock()
         self._long_term_memory = LongTermMemoryService(store)
-        self._memory_update_executor = ThreadPoolExecutor(
-            max_workers=4, thread_name_prefix="memory-update"
-        )
+        self.memory_jobs = MemoryJobQueue(store)
+        self.memory_jobs.start()
 
     def close(self) -> None:
-        """Release resources held by this service (e.g. background thread pool)."""
-        self._memory_update_executor.shutdown(wait=False)
+        """Release resources held by this service (e.g. background memory workers)."""
+        self.memory_jobs.close()
 
     @staticmethod
     def _runtime_snapshot_from_metadata(runtime_meta: dict[str, object]) -> dict[str, str | None]:
@@ -849,12 +848,13 @@ class ChatService:
     def _schedule_long_term_memory_update(self, *, session_id: str, request_id: str) -> None:
         if not get_long_term_memory_enabled():
             return
-        self._memory_update_executor.submit(
-            run_memory_update_job,
-            store=self.store,
-            session_id=session_id,
-            request_id=request_id,
-        )
+        try:
+            self.memory_jobs.enqueue(session_id=session_id, request_id=request_id)
+        except Exception as exc:
+            debug_log(
+                "memory_job_enqueue_failed",
+                {"session_id": session_id, "request_id": request_id, "error": str(exc)},
+            )
 
     def _notify_root_task_outcome(
         self,
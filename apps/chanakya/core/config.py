@@ -124,6 +124,48 @@ def get_database_url() -> str:
     return f"sqlite:///{get_data_dir() / 'chanakya.db'}"
 
 
+def get_sqlite_journal_mode() -> str:
+    load_local_env()
+    value = (os.getenv("CHANAKYA_SQLITE_JOURNAL_MODE") or "wal").strip().lower()
+    if value in {"wal", "delete", "truncate", "persist", "memory", "off"}:
+        return value
+    return "wal"
+
+
+def get_sqlite_synchronous() -> str:
+    load_local_env()
+    value = (os.getenv("CHANAKYA_SQLITE_SYNCHRONOUS") or "normal").strip().lower()
+    if value in {"off", "normal", "full", "extra"}:
+        return value
+    return "normal"
+
+
+def get_sqlite_auto_vacuum() -> str:
+    load_local_env()
+    value = (os.getenv("CHANAKYA_SQLITE_AUTO_VACUUM") or "incremental").strip().lower()
+    if value in {"none", "full", "incremental"}:
+        return value
+    return "incremental"
+
+
+def get_sqlite_busy_timeout_ms() -> int:
+    return _get_positive_int_env("CHANAKYA_SQLITE_BUSY_TIMEOUT_MS", 5000)
+
+
+def get_sqlite_cache_size_kib() -> int:
+    return _get_positive_int_env("CHANAKYA_SQLITE_CACHE_SIZE_KIB", 20000)
+
+
+def get_sqlite_mmap_size_bytes() -> int:
+    load_local_env()
+    raw = os.getenv("CHANAKYA_SQLITE_MMAP_SIZE_BYTES", str(256 * 1024 * 1024))
+    try:
+        value = int(raw)
+    except ValueError:
+        return 256 * 1024 * 1024
+    return value if value >= 0 else 0
+
+
 def _parse_cli_args(value: str | None, default: list[str]) -> list[str]:
     if value is None:
         return default
@@ -215,6 +257,84 @@ def get_long_term_memory_default_owner_id() -> str:
     return configured.strip() or "default_user"
 
 
+def get_memory_embeddings_enabled() -> bool:
+    return env_flag("CHANAKYA_MEMORY_EMBEDDINGS_ENABLED", default=False)
+
+
+def get_memory_embedding_config() -> dict[str, str | None]:
+    load_local_env()
+    core = get_openai_compatible_config()
+    return {
+        "base_url": os.getenv("CHANAKYA_MEMORY_EMBEDDING_BASE_URL") or core.get("base_url"),
+        "api_key": os.getenv("CHANAKYA_MEMORY_EMBEDDING_API_KEY") or core.get("api_key"),
+        "model": os.getenv("CHANAKYA_MEMORY_EMBEDDING_MODEL") or "text-embedding-3-small",
+    }
+
+
+def get_memory_embedding_min_similarity() -> float:
+    load_local_env()
+    raw = os.getenv("CHANAKYA_MEMORY_EMBEDDING_MIN_SIMILARITY", "0.35")
+    try:
+        value = float(raw)
+    except ValueError:
+        return 0.35
+    return value if -1.0 <= value <= 1.0 else 0.35
+
+
+def get_retention_enabled() -> bool:
+    return env_flag("CHANAKYA_RETENTION_ENABLED", default=True)
+
+
+def get_retention_interval_seconds() -> int:
+    return _get_positive_int_env("CHANAKYA_RETENTION_INTERVAL_SECONDS", 3600)
+
+
+def get_retention_batch_size() -> int:
+    return _get_positive_int_env("CHANAKYA_RETENTION_BATCH_SIZE", 500)
+
+
+def get_retention_archive_dir() -> Path | None:
+    load_local_env()
+    configured = os.getenv("CHANAKYA_RETENTION_ARCHIVE_DIR")
+    return Path(configured).expanduser() if configured else None
+
+
+def get_retention_limit(table: str, setting: str, default: int | None) -> int | None:
+    """Read ``CHANAKYA_RETENTION_<TABLE>_<SETTING>``; 0 turns that limit off."""
+    load_local_env()
+    raw = os.getenv(f"CHANAKYA_RETENTION_{table.upper()}_{setting.upper()}")
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    if value < 0:
+        return default
+    return value or None
+
+
+def get_memory_manager_prompt_candidates() -> int:
+    return _get_positive_int_env("CHANAKYA_MEMORY_MANAGER_PROMPT_CANDIDATES", 40)
+
+
+def get_default_model_ttl_seconds() -> int:
+    return _get_positive_int_env("CHANAKYA_DEFAULT_MODEL_TTL_SECONDS", 300)
+
+
+def get_memory_job_workers() -> int:
+    return _get_positive_int_env("CHANAKYA_MEMORY_JOB_WORKERS", 2)
+
+
+def get_memory_job_default_priority() -> int:
+    load_local_env()
+    raw = os.getenv("CHANAKYA_MEMORY_JOB_PRIORITY", "0")
+    try:
+        return int(raw)
+    except ValueError:
+        return 0
+
+
 def get_ntfy_default_server_url() -> str:
     load_local_env()
     configured = os.getenv("CHANAKYA_NTFY_DEFAULT_SERVER")
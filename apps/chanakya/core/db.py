@@ -2,28 +2,108 @@ from __future__ import annotations
 
 from collections.abc import Iterator
 from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
 
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 
+from chanakya.config import (
+    get_sqlite_auto_vacuum,
+    get_sqlite_busy_timeout_ms,
+    get_sqlite_cache_size_kib,
+    get_sqlite_journal_mode,
+    get_sqlite_mmap_size_bytes,
+    get_sqlite_synchronous,
+)
+from chanakya.migrations import apply_migrations
 from chanakya.model import Base
 
+SQLITE_MEMORY_URLS = {"sqlite:///:memory:", "sqlite://"}
 
-def build_engine(database_url: str) -> Engine:
+
+@dataclass(frozen=True, slots=True)
+class SQLiteProfile:
+    # The Flask app, MAF loop, memory executor and MCP tool servers share one file:
+    # WAL lets readers proceed during a write, busy_timeout makes writers wait
+    # for the lock instead of failing with "database is locked".
+    journal_mode: str = "wal"
+    synchronous: str = "normal"
+    busy_timeout_ms: int = 5000
+    cache_size_kib: int = 20000
+    mmap_size_bytes: int = 256 * 1024 * 1024
+    # Only takes effect on a database with no tables yet; lets retention hand
+    # freed pages back with PRAGMA incremental_vacuum instead of a full VACUUM.
+    auto_vacuum: str = "incremental"
+
+    @classmethod
+    def from_env(cls) -> SQLiteProfile:
+        return cls(
+            auto_vacuum=get_sqlite_auto_vacuum(),
+            journal_mode=get_sqlite_journal_mode(),
+            synchronous=get_sqlite_synchronous(),
+            busy_timeout_ms=get_sqlite_busy_timeout_ms(),
+            cache_size_kib=get_sqlite_cache_size_kib(),
+            mmap_size_bytes=get_sqlite_mmap_size_bytes(),
+        )
+
+    def pragmas(self, *, in_memory: bool) -> list[str]:
+        statements = [
+            f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}",
+            f"PRAGMA synchronous = {self.synchronous.upper()}",
+            # Negative cache_size is interpreted by SQLite as KiB rather than pages.
+            f"PRAGMA cache_size = -{int(self.cache_size_kib)}",
+        ]
+        if not in_memory:
+            # In-memory databases always use the MEMORY journal and have nothing to map.
+            statements.insert(0, f"PRAGMA journal_mode = {self.journal_mode.upper()}")
+            statements.insert(0, f"PRAGMA auto_vacuum = {self.auto_vacuum.upper()}")
+            statements.append(f"PRAGMA mmap_size = {int(self.mmap_size_bytes)}")
+        return statements
+
+
+def _install_sqlite_pragmas(engine: Engine, profile: SQLiteProfile, *, in_memory: bool) -> None:
+    statements = profile.pragmas(in_memory=in_memory)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def build_engine(database_url: str, sqlite_profile: SQLiteProfile | None = None) -> Engine:
     connect_args: dict[str, object] = {}
     engine_kwargs: dict[str, object] = {}
-    if database_url.startswith("sqlite"):
-        connect_args["check_same_thread"] = False
-        if database_url in {"sqlite:///:memory:", "sqlite://"}:
-            engine_kwargs["poolclass"] = StaticPool
-    return create_engine(
+    if not database_url.startswith("sqlite"):
+        return create_engine(database_url, future=True, pool_pre_ping=True)
+
+    profile = sqlite_profile or SQLiteProfile.from_env()
+    in_memory = database_url in SQLITE_MEMORY_URLS
+    connect_args["check_same_thread"] = False
+    # pysqlite applies its own busy handler too; keep it in step with the pragma.
+    connect_args["timeout"] = profile.busy_timeout_ms / 1000
+    if in_memory:
+        # Every connection to :memory: is a separate database, so share one.
+        engine_kwargs["poolclass"] = StaticPool
+    else:
+        # File databases: keep a few warm connections so pragmas and the page
+        # cache survive between requests; liveness pings are pointless for a file.
+        engine_kwargs["poolclass"] = QueuePool
+        engine_kwargs["pool_size"] = 5
+        engine_kwargs["max_overflow"] = 10
+    engine = create_engine(
         database_url,
         future=True,
-        pool_pre_ping=True,
         connect_args=connect_args,
         **engine_kwargs,
     )
+    _install_sqlite_pragmas(engine, profile, in_memory=in_memory)
+    return engine
 
 
 def build_session_factory(engine: Engine) -> sessionmaker[Session]:
@@ -32,6 +112,7 @@ def build_session_factory(engine: Engine) -> sessionmaker[Session]:
 
 def init_database(engine: Engine) -> None:
     Base.metadata.create_all(engine)
+    apply_migrations(engine)
 
 
 @contextmanager
@@ -20,6 +20,16 @@ TASK_STATUS_DONE = "done"
 TASK_STATUS_FAILED = "failed"
 TASK_STATUS_CANCELLED = "cancelled"
 
+MEMORY_JOB_STATUS_PENDING = "pending"
+MEMORY_JOB_STATUS_RUNNING = "running"
+MEMORY_JOB_STATUS_DONE = "done"
+MEMORY_JOB_STATUS_FAILED = "failed"
+
+# Memory types that stay relevant without sharing a word with the current turn:
+# injected into prompts regardless of the query and always offered to the
+# memory manager so it updates them instead of adding duplicates.
+STANDING_MEMORY_TYPES = ("preference", "instruction", "profile", "identity", "attribute")
+
 
 def now_iso() -> str:
     return datetime.now(tz=timezone.utc).isoformat()
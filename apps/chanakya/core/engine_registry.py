@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+from sqlalchemy import Engine
+
+T = TypeVar("T")
+
+
+class EngineRegistry(Generic[T]):
+    """One value per live engine, held weakly by engine.
+
+    An entry goes away with its engine, so short-lived engines (tests, reloaded
+    apps) do not pin their caches, memory maps or locks for the life of the
+    process. A value must not reference its engine, or the entry keeps the key
+    alive and is never collected.
+    """
+
+    def __init__(self) -> None:
+        self._values: weakref.WeakKeyDictionary[Engine, T] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __contains__(self, engine: Engine) -> bool:
+        with self._lock:
+            return engine in self._values
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._values)
+
+    def get(self, engine: Engine, default: T | None = None) -> T | None:
+        with self._lock:
+            return self._values.get(engine, default)
+
+    def get_or_create(self, engine: Engine, build: Callable[[], T]) -> T:
+        """Return the engine's value, calling ``build`` under the lock when it has none."""
+        with self._lock:
+            if engine not in self._values:
+                self._values[engine] = build()
+            return self._values[engine]
+
+    def set(self, engine: Engine, value: T) -> None:
+        with self._lock:
+            self._values[engine] = value
+
+    def pop(self, engine: Engine) -> T | None:
+        with self._lock:
+            return self._values.pop(engine, None)
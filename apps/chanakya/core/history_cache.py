@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import overload
+
+from sqlalchemy import Engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from chanakya.db import session_scope
+from chanakya.engine_registry import EngineRegistry
+from chanakya.model import ChatMessageModel
+
+HISTORY_CACHE_MAX_SESSIONS = 128
+
+_TOKEN_PATTERN = re.compile(r"[a-zA-Z0-9_]{3,}")
+
+
+def tokenize_for_relevance(text: str) -> set[str]:
+    return set(_TOKEN_PATTERN.findall((text or "").lower()))
+
+
+@dataclass(slots=True)
+class _SessionHistory:
+    # Append-only while cached; an invalidation replaces the whole entry, so a
+    # HistoryWindow taken earlier keeps seeing a consistent prefix.
+    rows: list[ChatMessageModel] = field(default_factory=list)
+    postings: dict[str, list[int]] = field(default_factory=dict)
+    positions: dict[int, int] = field(default_factory=dict)
+    last_id: int = 0
+
+    def append(self, row: ChatMessageModel) -> None:
+        position = len(self.rows)
+        self.rows.append(row)
+        self.positions[row.id] = position
+        for token in tokenize_for_relevance(str(row.content or "")):
+            self.postings.setdefault(token, []).append(position)
+
+
+class HistoryWindow(Sequence[ChatMessageModel]):
+    """Read-only view of the first ``count`` cached history rows of a session."""
+
+    __slots__ = ("_entry", "_count")
+
+    def __init__(self, entry: _SessionHistory, count: int) -> None:
+        self._entry = entry
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> ChatMessageModel: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ChatMessageModel]: ...
+
+    def __getitem__(self, index: int | slice) -> ChatMessageModel | list[ChatMessageModel]:
+        if isinstance(index, slice):
+            return self._entry.rows[: self._count][index]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._entry.rows[index]
+
+    def __iter__(self) -> Iterator[ChatMessageModel]:
+        rows = self._entry.rows
+        for index in range(self._count):
+            yield rows[index]
+
+    def position_of(self, row_id: int) -> int | None:
+        position = self._entry.positions.get(row_id)
+        if position is None or position >= self._count:
+            return None
+        return position
+
+    def overlap_scores(self, query_tokens: set[str]) -> dict[int, int]:
+        """Return {row index: shared token count} for rows matching any query token."""
+        scores: dict[int, int] = {}
+        for token in query_tokens:
+            for position in self._entry.postings.get(token, ()):
+                if position >= self._count:
+                    break
+                scores[position] = scores.get(position, 0) + 1
+        return scores
+
+
+class HistoryCache:
+    """Per-session chat history kept in memory and extended with rows newer than ``last_id``.
+
+    Rows that ``keep`` rejects (history control rows) are dropped on fetch, and the
+    rest are tokenized once into a postings index. Anything that edits or deletes
+    stored messages must call ``invalidate`` for the affected sessions.
+    """
+
+    def __init__(self, max_sessions: int = HISTORY_CACHE_MAX_SESSIONS) -> None:
+        self.max_sessions = max(1, max_sessions)
+        self._entries: OrderedDict[str, _SessionHistory] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def window(
+        self,
+        session_factory: sessionmaker[Session],
+        session_id: str,
+        *,
+        keep: Callable[[ChatMessageModel], bool],
+    ) -> HistoryWindow:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                self._entries.move_to_end(session_id)
+            generation = self._generations.get(session_id, 0)
+            last_id = entry.last_id if entry is not None else 0
+
+        with session_scope(session_factory) as session:
+            new_rows = session.scalars(
+                select(ChatMessageModel)
+                .where(ChatMessageModel.session_id == session_id)
+                .where(ChatMessageModel.id > last_id)
+                .order_by(ChatMessageModel.id.asc())
+            ).all()
+
+        with self._lock:
+            if self._generations.get(session_id, 0) == generation:
+                # Another caller may have loaded or re-inserted the entry meanwhile;
+                # its last_id is never behind ours, so extending it stays contiguous.
+                current = self._entries.get(session_id) or entry or _SessionHistory()
+                if self._entries.get(session_id) is not current:
+                    self._entries[session_id] = current
+                    while len(self._entries) > self.max_sessions:
+                        self._entries.popitem(last=False)
+                for row in new_rows:
+                    if row.id <= current.last_id:
+                        continue
+                    current.last_id = row.id
+                    if keep(row):
+                        current.append(row)
+                return HistoryWindow(current, len(current.rows))
+        # Rewritten or deleted while fetching: reload from scratch.
+        return self.window(session_factory, session_id, keep=keep)
+
+    def invalidate(self, session_ids: str | Sequence[str]) -> None:
+        if isinstance(session_ids, str):
+            session_ids = [session_ids]
+        with self._lock:
+            for session_id in session_ids:
+                self._entries.pop(session_id, None)
+                self._generations[session_id] = self._generations.get(session_id, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for session_id in self._entries:
+                self._generations[session_id] = self._generations.get(session_id, 0) + 1
+            self._entries.clear()
+
+
+_CACHES: EngineRegistry[HistoryCache] = EngineRegistry()
+
+
+def get_history_cache(session_factory: sessionmaker[Session]) -> HistoryCache | None:
+    """Return the cache shared by every provider and store bound to the same engine."""
+    engine = session_factory.kw.get("bind")
+    if not isinstance(engine, Engine):
+        return None
+    return _CACHES.get_or_create(engine, HistoryCache)
+
+
+def invalidate_history(session_factory: sessionmaker[Session], session_ids: str | Sequence[str]) -> None:
+    cache = get_history_cache(session_factory)
+    if cache is not None:
+        cache.invalidate(session_ids)
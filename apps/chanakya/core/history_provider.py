@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 import json
-import re
 from collections.abc import Sequence
 from typing import Any
 
 from agent_framework import HistoryProvider, Message
-from sqlalchemy import select
+from sqlalchemy import Engine, select
 from sqlalchemy.orm import Session, sessionmaker
 
 from chanakya.config import (
@@ -18,7 +17,9 @@ from chanakya.config import (
 from chanakya.db import session_scope
 from chanakya.debug import debug_log
 from chanakya.domain import now_iso
+from chanakya.history_cache import HistoryWindow, get_history_cache, tokenize_for_relevance
 from chanakya.model import ChatMessageModel, ChatSessionModel
+from chanakya.search_index import CHAT_MESSAGES_FTS, fts_tables, search_chat_history
 
 
 class SQLAlchemyHistoryProvider(HistoryProvider):
@@ -49,26 +50,23 @@ class SQLAlchemyHistoryProvider(HistoryProvider):
         if not session_id:
             return []
 
-        with session_scope(self.session_factory) as session:
-            rows = session.scalars(
-                select(ChatMessageModel)
-                .where(ChatMessageModel.session_id == session_id)
-                .order_by(ChatMessageModel.id.asc())
-            ).all()
-
-        rows = [row for row in rows if not self._is_control_history_row(row)]
+        rows = self._load_history_rows(session_id)
         query_text = ""
         if isinstance(state, dict):
             query_text = str(state.get("history_query_text") or "").strip()
         if not query_text:
             query_text = str(kwargs.get("history_query_text") or "").strip()
+        max_messages = get_history_max_messages()
         selected, stats = self._compress_history_rows_with_stats(
             rows,
             query_text=query_text,
             recent_window=get_history_recent_window_messages(),
-            max_messages=get_history_max_messages(),
+            max_messages=max_messages,
             max_chars=get_history_max_chars(),
             max_message_chars=get_history_max_message_chars(),
+            relevance=self._search_relevance(
+                session_id, rows, query_text, limit=max(24, max_messages * 3)
+            ),
         )
         if isinstance(state, dict):
             selected_chars = sum(len(text) for _, text in selected)
@@ -104,6 +102,53 @@ class SQLAlchemyHistoryProvider(HistoryProvider):
             for row, content in selected
         ]
 
+    def _load_history_rows(self, session_id: str) -> Sequence[ChatMessageModel]:
+        cache = get_history_cache(self.session_factory)
+        if cache is not None:
+            return cache.window(
+                self.session_factory,
+                session_id,
+                keep=lambda row: not self._is_control_history_row(row),
+            )
+        with session_scope(self.session_factory) as session:
+            rows = session.scalars(
+                select(ChatMessageModel)
+                .where(ChatMessageModel.session_id == session_id)
+                .order_by(ChatMessageModel.id.asc())
+            ).all()
+        return [row for row in rows if not self._is_control_history_row(row)]
+
+    def _search_relevance(
+        self,
+        session_id: str,
+        rows: Sequence[ChatMessageModel],
+        query_text: str,
+        *,
+        limit: int,
+    ) -> dict[int, float] | None:
+        """Rank older messages with the FTS5 index; None falls back to token overlap."""
+        engine = self.session_factory.kw.get("bind")
+        if not isinstance(rows, HistoryWindow) or not isinstance(engine, Engine):
+            return None
+        if CHAT_MESSAGES_FTS not in fts_tables(engine):
+            return None
+        query_tokens = self._tokenize_for_relevance(query_text)
+        if not query_tokens:
+            return None
+        try:
+            with session_scope(self.session_factory) as session:
+                hits = search_chat_history(session, session_id, query_tokens, limit=limit)
+        except Exception as exc:
+            debug_log("history_fts_search_failed", {"session_id": session_id, "error": str(exc)})
+            return None
+        relevance: dict[int, float] = {}
+        for row_id, score in hits:
+            # Control rows are indexed too but are absent from the window.
+            position = rows.position_of(row_id)
+            if position is not None:
+                relevance[position] = score
+        return relevance
+
     @staticmethod
     def _compress_history_rows(
         rows: Sequence[ChatMessageModel],
@@ -133,6 +178,7 @@ class SQLAlchemyHistoryProvider(HistoryProvider):
         max_messages: int,
         max_chars: int,
         max_message_chars: int,
+        relevance: dict[int, float] | None = None,
     ) -> tuple[list[tuple[ChatMessageModel, str]], dict[str, int]]:
         if not rows:
             return [], {
@@ -150,15 +196,31 @@ class SQLAlchemyHistoryProvider(HistoryProvider):
         relevance_hits = 0
         backfill_hits = 0
 
-        if query_tokens:
+        if query_tokens and relevance is not None:
+            # BM25 already weighs term rarity; recency only breaks ties.
+            ranked = sorted(
+                ((score, idx) for idx, score in relevance.items() if idx not in selected_indices),
+                reverse=True,
+            )
+            for _, idx in ranked:
+                if len(selected_indices) >= max_messages:
+                    break
+                selected_indices.add(idx)
+                relevance_hits += 1
+        elif query_tokens:
+            if isinstance(rows, HistoryWindow):
+                # Cached sessions carry a token index, so only matching rows are visited.
+                overlaps = rows.overlap_scores(query_tokens)
+            else:
+                overlaps = {
+                    idx: SQLAlchemyHistoryProvider._message_overlap_score(
+                        str(row.content or ""), query_tokens
+                    )
+                    for idx, row in enumerate(rows)
+                }
             scored: list[tuple[float, int]] = []
-            for idx, row in enumerate(rows):
-                if idx in selected_indices:
-                    continue
-                overlap = SQLAlchemyHistoryProvider._message_overlap_score(
-                    str(row.content or ""), query_tokens
-                )
-                if overlap <= 0:
+            for idx, overlap in overlaps.items():
+                if idx in selected_indices or overlap <= 0:
                     continue
                 recency = (idx + 1) / total_rows
                 score = float(overlap) + recency * 0.25
@@ -209,8 +271,7 @@ class SQLAlchemyHistoryProvider(HistoryProvider):
 
     @staticmethod
     def _tokenize_for_relevance(text: str) -> set[str]:
-        tokens = re.findall(r"[a-zA-Z0-9_]{3,}", (text or "").lower())
-        return set(tokens)
+        return tokenize_for_relevance(text)
 
     @staticmethod
     def _message_overlap_score(content: str, query_tokens: set[str]) -> int:
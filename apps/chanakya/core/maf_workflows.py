@@ -520,9 +520,7 @@ class ManagerWorkflowRuntime:
         return bool(self._run_async(self.checkpoint_storage.delete(checkpoint_id)))
 
     def _run_async(self, coro: Any) -> Any:
-        bind = self.store.Session.kw.get("bind")
-        if bind is not None and str(bind.url).startswith("sqlite:///:memory:"):
-            return asyncio.run(coro)
+        # Always the MAF loop: chat clients share one HTTP pool bound to it.
         return run_in_maf_loop(coro)
 
     async def _run_software_workflow(
@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+from urllib import request
+
+from filelock import FileLock, Timeout
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from chanakya.config import get_memory_embedding_config, get_memory_embeddings_enabled
+from chanakya.debug import debug_log
+from chanakya.engine_registry import EngineRegistry
+
+try:  # Optional: pip install chanakya-maf-mvp[vectors]
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the extra
+    np = None  # type: ignore[assignment]
+
+Embedder = Callable[[list[str]], list[list[float]]]
+
+EMBEDDING_BATCH_SIZE = 64
+_INITIAL_CAPACITY = 256
+
+
+def vectors_available() -> bool:
+    return np is not None
+
+
+class OpenAICompatibleEmbedder:
+    """Calls ``POST {base_url}/embeddings`` on an OpenAI-compatible server."""
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        model: str,
+        api_key: str | None = None,
+        timeout_seconds: float = 30.0,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.api_key = api_key
+        self.timeout_seconds = timeout_seconds
+
+    def __call__(self, texts: list[str]) -> list[list[float]]:
+        req = request.Request(
+            url=f"{self.base_url}/embeddings",
+            data=json.dumps({"model": self.model, "input": texts}).encode("utf-8"),
+            method="POST",
+        )
+        req.add_header("Content-Type", "application/json")
+        if self.api_key:
+            req.add_header("Authorization", f"Bearer {self.api_key}")
+        with request.urlopen(req, timeout=self.timeout_seconds) as response:
+            payload = json.loads(response.read().decode("utf-8"))
+        data = sorted(payload.get("data") or [], key=lambda item: int(item.get("index", 0)))
+        if len(data) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(data)}")
+        return [list(item["embedding"]) for item in data]
+
+
+class MemoryVectorIndex:
+    """Unit-normalized memory embeddings in one matrix, keyed by memory id.
+
+    With a ``path`` the matrix is a memory-mapped ``<path>.f32`` file and the
+    id/slot/stamp map is ``<path>.json``; without one it lives in RAM. Only the
+    process holding ``<path>.lock`` owns the files; any other process keeps its own
+    index in RAM. Writes only mark ids dirty; ``reconcile`` marks ids whose stored
+    ``updated_at`` stamp no longer matches the database, and ``refresh`` embeds the
+    dirty ones in batches right before a search, so the store never waits on the
+    embedding endpoint. Search is exact cosine top-k over the occupied rows.
+    """
+
+    def __init__(self, embedder: Embedder, *, path: Path | None = None, model: str = "") -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for the memory vector index")
+        self.embedder = embedder
+        self.path = path
+        self.model = model
+        self._lock = threading.RLock()
+        self._dim = 0
+        self._matrix: Any = None
+        self._slot_ids: list[str | None] = []
+        self._slots: dict[str, int] = {}
+        self._stamps: dict[str, str] = {}
+        self._free: list[int] = []
+        self._dirty: set[str] = set()
+        self._file_lock: FileLock | None = None
+        # Set by the store after each reconcile; None forces a full one.
+        self.synced_signature: Any = None
+        if path is not None:
+            file_lock = FileLock(str(_sibling(path, ".lock")))
+            try:
+                file_lock.acquire(timeout=0)
+            except Timeout:
+                debug_log("memory_vectors_not_owner", {"path": str(path)})
+                self.path = None
+            else:
+                self._file_lock = file_lock
+                self._load()
+
+    @property
+    def _meta_path(self) -> Path:
+        assert self.path is not None
+        return _sibling(self.path, ".json")
+
+    @property
+    def _matrix_path(self) -> Path:
+        assert self.path is not None
+        return _sibling(self.path, ".f32")
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def mark_dirty(self, memory_ids: str | Iterable[str]) -> None:
+        if isinstance(memory_ids, str):
+            memory_ids = [memory_ids]
+        with self._lock:
+            self._dirty.update(memory_ids)
+
+    def reconcile(self, current: Mapping[str, str]) -> int:
+        """Mark ids whose ``updated_at`` stamp differs from ``current`` or that are gone from it."""
+        with self._lock:
+            stale = {
+                memory_id
+                for memory_id, stamp in current.items()
+                if self._stamps.get(memory_id) != stamp
+            }
+            stale.update(memory_id for memory_id in self._slots if memory_id not in current)
+            self._dirty.update(stale)
+        return len(stale)
+
+    def refresh(self, load_texts: Callable[[list[str]], dict[str, tuple[str, str]]]) -> int:
+        """Embed dirty ids.
+
+        ``load_texts`` returns ``(text, updated_at)`` for the ids that should stay
+        indexed; every other dirty id is dropped.
+        """
+        with self._lock:
+            dirty = sorted(self._dirty)
+            self._dirty.clear()
+        if not dirty:
+            return 0
+        try:
+            texts = load_texts(dirty)
+            keep = [memory_id for memory_id in dirty if memory_id in texts and texts[memory_id][0]]
+            vectors: list[list[float]] = []
+            for start in range(0, len(keep), EMBEDDING_BATCH_SIZE):
+                batch = keep[start : start + EMBEDDING_BATCH_SIZE]
+                vectors.extend(self.embedder([texts[memory_id][0] for memory_id in batch]))
+            if len(vectors) != len(keep):
+                raise ValueError(f"Expected {len(keep)} embeddings, got {len(vectors)}")
+        except Exception:
+            with self._lock:
+                self._dirty.update(dirty)
+            raise
+        with self._lock:
+            kept = set(keep)
+            for memory_id in dirty:
+                if memory_id not in kept:
+                    self._remove(memory_id)
+            for memory_id, vector in zip(keep, vectors):
+                self._upsert(memory_id, vector)
+                self._stamps[memory_id] = texts[memory_id][1]
+            self._save()
+        return len(dirty)
+
+    def search(self, query: str, *, limit: int) -> list[tuple[str, float]]:
+        """Return ``(memory id, cosine similarity)`` pairs, most similar first."""
+        with self._lock:
+            if not self._slots or limit <= 0:
+                return []
+        query_vector = self._normalize(self.embedder([query])[0])
+        with self._lock:
+            if query_vector.shape[0] != self._dim:
+                return []
+            used = len(self._slot_ids)
+            scores = self._matrix[:used] @ query_vector
+            # Free slots hold zero vectors; push them below every real score.
+            for slot in self._free:
+                scores[slot] = -2.0
+            k = min(limit, len(self._slots))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                (str(self._slot_ids[slot]), float(scores[slot]))
+                for slot in top
+                if self._slot_ids[slot] is not None
+            ]
+
+    def close(self) -> None:
+        """Flush and release the files so another process can own them."""
+        with self._lock:
+            self._save()
+            self._matrix = None
+            self._dim = 0
+            self._slot_ids, self._slots, self._stamps, self._free = [], {}, {}, []
+            self.synced_signature = None
+            self.path = None
+            if self._file_lock is not None:
+                self._file_lock.release()
+                self._file_lock = None
+
+    def _normalize(self, vector: Sequence[float]) -> Any:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(array))
+        return array / norm if norm > 0 else array
+
+    def _upsert(self, memory_id: str, vector: Sequence[float]) -> None:
+        normalized = self._normalize(vector)
+        if self._dim == 0:
+            self._dim = int(normalized.shape[0])
+            self._matrix = self._allocate(_INITIAL_CAPACITY)
+        if normalized.shape[0] != self._dim:
+            raise ValueError(f"Embedding dimension changed from {self._dim} to {normalized.shape[0]}")
+        slot = self._slots.get(memory_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+                self._slot_ids[slot] = memory_id
+            else:
+                slot = len(self._slot_ids)
+                if slot >= self._matrix.shape[0]:
+                    self._grow(self._matrix.shape[0] * 2)
+                self._slot_ids.append(memory_id)
+            self._slots[memory_id] = slot
+        self._matrix[slot] = normalized
+
+    def _remove(self, memory_id: str) -> None:
+        self._stamps.pop(memory_id, None)
+        slot = self._slots.pop(memory_id, None)
+        if slot is None:
+            return
+        self._matrix[slot] = 0.0
+        self._slot_ids[slot] = None
+        self._free.append(slot)
+
+    def _allocate(self, capacity: int) -> Any:
+        if self.path is None:
+            return np.zeros((capacity, self._dim), dtype=np.float32)
+        return np.lib.format.open_memmap(
+            self._matrix_path, mode="w+", dtype=np.float32, shape=(capacity, self._dim)
+        )
+
+    def _grow(self, capacity: int) -> None:
+        if self.path is None:
+            grown = np.zeros((capacity, self._dim), dtype=np.float32)
+            grown[: self._matrix.shape[0]] = self._matrix
+            self._matrix = grown
+            return
+        staging = _sibling(self._matrix_path, ".tmp")
+        grown = np.lib.format.open_memmap(
+            staging, mode="w+", dtype=np.float32, shape=(capacity, self._dim)
+        )
+        grown[: self._matrix.shape[0]] = self._matrix
+        grown.flush()
+        del grown
+        self._matrix = None
+        os.replace(staging, self._matrix_path)
+        self._matrix = np.load(self._matrix_path, mmap_mode="r+")
+
+    def _save(self) -> None:
+        if self.path is None or self._matrix is None:
+            return
+        self._matrix.flush()
+        meta = {
+            "model": self.model,
+            "dim": self._dim,
+            "slot_ids": self._slot_ids,
+            "stamps": self._stamps,
+        }
+        staging = _sibling(self._meta_path, ".tmp")
+        staging.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(staging, self._meta_path)
+
+    def _load(self) -> None:
+        if not self._meta_path.exists() or not self._matrix_path.exists():
+            return
+        try:
+            meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+            if meta.get("model") != self.model:
+                debug_log("memory_vectors_model_changed", {"path": str(self.path)})
+                return
+            matrix = np.load(self._matrix_path, mmap_mode="r+")
+        except Exception as exc:
+            debug_log("memory_vectors_load_failed", {"path": str(self.path), "error": str(exc)})
+            return
+        slot_ids = list(meta.get("slot_ids") or [])
+        if matrix.ndim != 2 or matrix.shape[0] < len(slot_ids):
+            return
+        self._matrix = matrix
+        self._dim = int(matrix.shape[1])
+        self._slot_ids = slot_ids
+        self._slots = {memory_id: slot for slot, memory_id in enumerate(slot_ids) if memory_id}
+        self._free = [slot for slot, memory_id in enumerate(slot_ids) if not memory_id]
+        stamps = meta.get("stamps") or {}
+        self._stamps = {
+            memory_id: str(stamps[memory_id]) for memory_id in self._slots if memory_id in stamps
+        }
+
+
+def _sibling(path: Path, suffix: str) -> Path:
+    """``path`` with ``suffix`` appended; ``with_suffix`` would replace ``.memory_vectors``."""
+    return path.with_name(path.name + suffix)
+
+
+# Weak by engine: a dead engine's index, with its memory map and file lock, is freed.
+_INDEXES: EngineRegistry[MemoryVectorIndex | None] = EngineRegistry()
+
+
+def _default_index_path(engine: Engine) -> Path | None:
+    database = engine.url.database
+    if engine.dialect.name != "sqlite" or not database or database == ":memory:":
+        return None
+    return Path(database).with_name(Path(database).name + ".memory_vectors")
+
+
+def _build_default_index(engine: Engine) -> MemoryVectorIndex | None:
+    if not get_memory_embeddings_enabled():
+        return None
+    if not vectors_available():
+        debug_log("memory_vectors_unavailable", {"reason": "numpy is not installed"})
+        return None
+    config = get_memory_embedding_config()
+    if not config.get("base_url") or not config.get("model"):
+        debug_log("memory_vectors_unavailable", {"reason": "no embedding endpoint configured"})
+        return None
+    embedder = OpenAICompatibleEmbedder(
+        base_url=str(config["base_url"]),
+        model=str(config["model"]),
+        api_key=config.get("api_key"),
+    )
+    return MemoryVectorIndex(embedder, path=_default_index_path(engine), model=embedder.model)
+
+
+def get_memory_vector_index(session_factory: sessionmaker[Session]) -> MemoryVectorIndex | None:
+    """Return the engine's vector index, or None when embeddings are disabled."""
+    engine = session_factory.kw.get("bind")
+    if not isinstance(engine, Engine):
+        return None
+    return _INDEXES.get_or_create(engine, lambda: _build_default_index(engine))
+
+
+def set_memory_vector_index(
+    session_factory: sessionmaker[Session], index: MemoryVectorIndex | None
+) -> None:
+    """Install ``index`` (for example one with a local embedder) for this engine."""
+    engine = session_factory.kw.get("bind")
+    if not isinstance(engine, Engine):
+        raise ValueError("session_factory is not bound to an engine")
+    _INDEXES.set(engine, index)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import Connection, Engine, select, text
+
+from chanakya.domain import now_iso
+from chanakya.model import SchemaMigrationModel
+from chanakya.search_index import (
+    CHAT_MESSAGES_FTS,
+    FTS_TOKENIZE,
+    MEMORY_RECORDS_FTS,
+    forget_fts_tables,
+    sqlite_supports_fts5,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Migration:
+    version: int
+    name: str
+    statements: tuple[str, ...]
+    # Skipped (and retried on the next start) while this returns False.
+    applies_to: Callable[[Connection], bool] | None = None
+
+
+# Append-only: each entry runs once per database, in version order. Statements
+# must stay idempotent so databases created before the ledger existed upgrade too.
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        version=1,
+        name="hot_query_indexes",
+        statements=(
+            # ChatRepository.list_messages_for_request
+            "CREATE INDEX IF NOT EXISTS ix_chat_messages_request_id "
+            "ON chat_messages (request_id)",
+            # ChatRepository latest-assistant lookups (rowid order follows the index)
+            "CREATE INDEX IF NOT EXISTS ix_chat_messages_session_role "
+            "ON chat_messages (session_id, role)",
+            # MemoryRepository.list_memories
+            "CREATE INDEX IF NOT EXISTS ix_memory_records_owner_status_updated "
+            "ON memory_records (owner_id, status, updated_at)",
+            # ArtifactRepository session / work / recent listings
+            "CREATE INDEX IF NOT EXISTS ix_artifacts_session_updated "
+            "ON artifacts (session_id, updated_at)",
+            "CREATE INDEX IF NOT EXISTS ix_artifacts_work_created "
+            "ON artifacts (work_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS ix_artifacts_updated ON artifacts (updated_at)",
+            # RequestRepository.list_requests
+            "CREATE INDEX IF NOT EXISTS ix_requests_session_created "
+            "ON requests (session_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS ix_requests_created ON requests (created_at)",
+            # TaskRepository.list_tasks / list_children (/api/tasks may be unfiltered)
+            "CREATE INDEX IF NOT EXISTS ix_tasks_request_created "
+            "ON tasks (request_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS ix_tasks_parent_created "
+            "ON tasks (parent_task_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS ix_tasks_created ON tasks (created_at)",
+            # AgentProfileRepository.find_active_agents_by_role
+            "CREATE INDEX IF NOT EXISTS ix_agent_profiles_role_name "
+            "ON agent_profiles (role, name)",
+            # WorkRepository.list_works
+            "CREATE INDEX IF NOT EXISTS ix_works_status_updated ON works (status, updated_at)",
+            "CREATE INDEX IF NOT EXISTS ix_works_updated ON works (updated_at)",
+            # TemporaryAgentRepository.list_temporary_agents
+            "CREATE INDEX IF NOT EXISTS ix_temporary_agents_created "
+            "ON temporary_agents (created_at)",
+        ),
+    ),
+    Migration(
+        version=2,
+        name="chat_messages_fts",
+        statements=(
+            # External-content index: message text lives only in chat_messages.
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {CHAT_MESSAGES_FTS} USING fts5("
+            "content, session_id, content='chat_messages', content_rowid='id', "
+            f"tokenize=\"{FTS_TOKENIZE}\")",
+            "CREATE TRIGGER IF NOT EXISTS chat_messages_fts_insert AFTER INSERT ON chat_messages "
+            f"BEGIN INSERT INTO {CHAT_MESSAGES_FTS}(rowid, content, session_id) "
+            "VALUES (new.id, new.content, new.session_id); END",
+            "CREATE TRIGGER IF NOT EXISTS chat_messages_fts_delete AFTER DELETE ON chat_messages "
+            f"BEGIN INSERT INTO {CHAT_MESSAGES_FTS}({CHAT_MESSAGES_FTS}, rowid, content, session_id) "
+            "VALUES ('delete', old.id, old.content, old.session_id); END",
+            "CREATE TRIGGER IF NOT EXISTS chat_messages_fts_update "
+            "AFTER UPDATE OF content, session_id ON chat_messages "
+            f"BEGIN INSERT INTO {CHAT_MESSAGES_FTS}({CHAT_MESSAGES_FTS}, rowid, content, session_id) "
+            "VALUES ('delete', old.id, old.content, old.session_id); "
+            f"INSERT INTO {CHAT_MESSAGES_FTS}(rowid, content, session_id) "
+            "VALUES (new.id, new.content, new.session_id); END",
+            # Index messages written before this migration.
+            f"INSERT INTO {CHAT_MESSAGES_FTS}({CHAT_MESSAGES_FTS}) VALUES ('rebuild')",
+        ),
+        applies_to=sqlite_supports_fts5,
+    ),
+    Migration(
+        version=3,
+        name="memory_records_fts",
+        statements=(
+            # memory_records has a text primary key and no stable rowid, so the
+            # index keeps its own copy keyed by memory_id instead of external content.
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {MEMORY_RECORDS_FTS} USING fts5("
+            f"memory_id, owner_id, status, subject, content, tokenize=\"{FTS_TOKENIZE}\")",
+            "CREATE TRIGGER IF NOT EXISTS memory_records_fts_insert AFTER INSERT ON memory_records "
+            f"BEGIN INSERT INTO {MEMORY_RECORDS_FTS}(memory_id, owner_id, status, subject, content) "
+            "VALUES (new.id, new.owner_id, new.status, new.subject, new.content); END",
+            "CREATE TRIGGER IF NOT EXISTS memory_records_fts_delete AFTER DELETE ON memory_records "
+            f"BEGIN DELETE FROM {MEMORY_RECORDS_FTS} WHERE {MEMORY_RECORDS_FTS} MATCH "
+            "'memory_id : \"' || replace(old.id, '\"', '\"\"') || '\"' "
+            "AND memory_id = old.id; END",
+            "CREATE TRIGGER IF NOT EXISTS memory_records_fts_update "
+            "AFTER UPDATE OF owner_id, status, subject, content ON memory_records "
+            f"BEGIN DELETE FROM {MEMORY_RECORDS_FTS} WHERE {MEMORY_RECORDS_FTS} MATCH "
+            "'memory_id : \"' || replace(old.id, '\"', '\"\"') || '\"' "
+            "AND memory_id = old.id; "
+            f"INSERT INTO {MEMORY_RECORDS_FTS}(memory_id, owner_id, status, subject, content) "
+            "VALUES (new.id, new.owner_id, new.status, new.subject, new.content); END",
+            f"DELETE FROM {MEMORY_RECORDS_FTS}",
+            f"INSERT INTO {MEMORY_RECORDS_FTS}(memory_id, owner_id, status, subject, content) "
+            "SELECT id, owner_id, status, subject, content FROM memory_records",
+        ),
+        applies_to=sqlite_supports_fts5,
+    ),
+    Migration(
+        version=4,
+        name="memory_job_queue_indexes",
+        statements=(
+            # MemoryJobRepository.claim_next: highest priority, then oldest pending job.
+            "CREATE INDEX IF NOT EXISTS ix_memory_jobs_status_priority "
+            "ON memory_jobs (status, priority DESC, id)",
+            # Coalescing lookup and the per-session running check.
+            "CREATE INDEX IF NOT EXISTS ix_memory_jobs_session_status "
+            "ON memory_jobs (session_id, status)",
+        ),
+    ),
+)
+
+
+def apply_migrations(engine: Engine, migrations: tuple[Migration, ...] = MIGRATIONS) -> list[int]:
+    """Run pending migrations and record them in ``schema_migrations``.
+
+    Returns the versions applied by this call.
+    """
+    SchemaMigrationModel.__table__.create(engine, checkfirst=True)
+    applied: list[int] = []
+    with engine.begin() as connection:
+        done = set(connection.scalars(select(SchemaMigrationModel.version)).all())
+        for migration in sorted(migrations, key=lambda item: item.version):
+            if migration.version in done:
+                continue
+            if migration.applies_to is not None and not migration.applies_to(connection):
+                continue
+            for statement in migration.statements:
+                connection.execute(text(statement))
+            connection.execute(
+                SchemaMigrationModel.__table__.insert().values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=now_iso(),
+                )
+            )
+            applied.append(migration.version)
+    if applied:
+        forget_fts_tables(engine)
+    return applied
@@ -25,6 +25,14 @@ class ChatSessionModel(Base):
     )
 
 
+class SchemaMigrationModel(Base):
+    __tablename__ = "schema_migrations"
+
+    version: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    applied_at: Mapped[str] = mapped_column(String, nullable=False)
+
+
 class AgentSessionContextModel(Base):
     __tablename__ = "agent_session_contexts"
 
@@ -146,6 +154,40 @@ class MemoryEventModel(Base):
     created_at: Mapped[str] = mapped_column(String, nullable=False, index=True)
 
 
+class MemoryJobModel(Base):
+    __tablename__ = "memory_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    session_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    # Turns folded into this job while it was pending, oldest first.
+    request_ids_json: Mapped[list[str]] = mapped_column("request_ids", JSON, default=list)
+    status: Mapped[str] = mapped_column(String, nullable=False, default="pending")
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    enqueued_at: Mapped[str] = mapped_column(String, nullable=False)
+    updated_at: Mapped[str] = mapped_column(String, nullable=False)
+    started_at: Mapped[str | None] = mapped_column(String, nullable=True)
+    finished_at: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+class RetentionRollupModel(Base):
+    """Daily row counts of data the retention job archived out of a table."""
+
+    __tablename__ = "retention_rollups"
+    __table_args__ = (
+        UniqueConstraint("table_name", "day", "dimension", name="uq_retention_rollup"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    table_name: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    day: Mapped[str] = mapped_column(String, nullable=False)
+    # The table's natural grouping, e.g. event_type or tool_name.
+    dimension: Mapped[str] = mapped_column(String, nullable=False)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[str] = mapped_column(String, nullable=False)
+
+
 class ArtifactModel(Base):
     __tablename__ = "artifacts"
 
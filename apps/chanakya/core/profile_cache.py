@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from chanakya.engine_registry import EngineRegistry
+from chanakya.model import AgentProfileModel
+
+
+class AgentProfileCache:
+    """Detached ``AgentProfileModel`` snapshots keyed by agent id.
+
+    Every ``AgentProfileRepository`` write calls ``invalidate``, which drops the
+    snapshot and bumps ``version``. Holders of derived state (prompts, tool
+    lists) compare the version they built from against the current one and only
+    rebuild after a write. Snapshots are shared, so callers must not mutate them.
+    """
+
+    def __init__(self) -> None:
+        self._profiles: dict[str, AgentProfileModel] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(
+        self, agent_id: str, load: Callable[[], AgentProfileModel | None]
+    ) -> AgentProfileModel | None:
+        with self._lock:
+            cached = self._profiles.get(agent_id)
+            version = self._version
+        if cached is not None:
+            return cached
+        row = load()
+        with self._lock:
+            # A write that landed while loading wins; keep the stale row out.
+            if row is not None and self._version == version:
+                self._profiles[agent_id] = row
+        return row
+
+    def invalidate(self, agent_id: str | None = None) -> None:
+        with self._lock:
+            self._version += 1
+            if agent_id is None:
+                self._profiles.clear()
+            else:
+                self._profiles.pop(agent_id, None)
+
+
+_CACHES: EngineRegistry[AgentProfileCache] = EngineRegistry()
+
+
+def get_profile_cache(session_factory: sessionmaker[Session]) -> AgentProfileCache | None:
+    """Return the cache shared by every store and runtime bound to the same engine."""
+    engine = session_factory.kw.get("bind")
+    if not isinstance(engine, Engine):
+        return None
+    return _CACHES.get_or_create(engine, AgentProfileCache)
+
+
+def invalidate_agent_profiles(
+    session_factory: sessionmaker[Session], agent_id: str | None = None
+) -> None:
+    cache = get_profile_cache(session_factory)
+    if cache is not None:
+        cache.invalidate(agent_id)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+# "SCAN chat_messages" is a full table walk; "SCAN t USING INDEX ix" walks an
+# index in order (used for ORDER BY ... LIMIT) and is not reported.
+_FULL_SCAN_PATTERN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+
+@dataclass(slots=True)
+class FullScan:
+    table: str
+    statement: str
+    plan: list[str]
+
+
+@dataclass(slots=True)
+class QueryPlanRecorder:
+    """Collects SELECTs issued on a SQLite engine and explains them afterwards."""
+
+    engine: Engine
+    statements: list[tuple[str, Any]] = field(default_factory=list)
+
+    def _record(self, _conn: Any, _cursor: Any, statement: str, parameters: Any, *_args: Any) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.statements.append((statement, parameters))
+
+    @contextmanager
+    def recording(self) -> Iterator[QueryPlanRecorder]:
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        try:
+            yield self
+        finally:
+            event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def explain(self, statement: str, parameters: Any) -> list[str]:
+        with self.engine.connect() as connection:
+            cursor = connection.connection.driver_connection.cursor()
+            try:
+                rows = cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            finally:
+                cursor.close()
+        return [str(row[-1]) for row in rows]
+
+    def full_scans(self, *, allowed_tables: set[str] | None = None) -> list[FullScan]:
+        allowed = allowed_tables or set()
+        found: list[FullScan] = []
+        seen: set[str] = set()
+        for statement, parameters in self.statements:
+            if statement in seen:
+                continue
+            seen.add(statement)
+            plan = self.explain(statement, parameters)
+            for detail in plan:
+                match = _FULL_SCAN_PATTERN.match(detail.strip())
+                if match and match.group(1) not in allowed:
+                    found.append(FullScan(match.group(1), statement, plan))
+        return found
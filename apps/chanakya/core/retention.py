@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import ColumnElement, Engine, Table, delete, func, or_, select
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from chanakya.config import get_retention_batch_size, get_retention_limit
+from chanakya.db import session_scope
+from chanakya.debug import debug_log
+from chanakya.domain import MEMORY_JOB_STATUS_DONE, MEMORY_JOB_STATUS_FAILED, now_iso
+from chanakya.model import (
+    AppEventModel,
+    MemoryEventModel,
+    MemoryJobModel,
+    RetentionRollupModel,
+    TaskEventModel,
+    ToolInvocationModel,
+    WorkNotificationModel,
+)
+
+# Batches per table per run, so one pass never holds the writer for long.
+RETENTION_MAX_BATCHES = 20
+RETENTION_BATCH_PAUSE_SECONDS = 0.05
+# incremental_vacuum frees one page per statement step through pysqlite.
+VACUUM_MAX_PAGES = 4096
+VACUUM_PAGES_PER_PAUSE = 256
+
+
+@dataclass(frozen=True, slots=True)
+class RetentionPolicy:
+    """When rows of one append-only table expire.
+
+    A row expires once it is older than ``max_age_days`` or falls outside the
+    newest ``keep_per_group`` rows of its ``group_column``, and only if
+    ``eligible`` (e.g. "finished" or "acknowledged") holds for it.
+    """
+
+    table: Table
+    timestamp_column: str = "created_at"
+    max_age_days: int | None = None
+    keep_per_group: int | None = None
+    group_column: str | None = None
+    rollup_column: str | None = None
+    eligible: Callable[[Table], ColumnElement[bool]] | None = None
+
+    @property
+    def name(self) -> str:
+        return self.table.name
+
+
+@dataclass(slots=True)
+class RetentionReport:
+    archived: dict[str, int] = field(default_factory=dict)
+    archive_files: list[str] = field(default_factory=list)
+    vacuumed_pages: int = 0
+    started_at: str = field(default_factory=now_iso)
+    finished_at: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "archived": dict(self.archived),
+            "archive_files": list(self.archive_files),
+            "vacuumed_pages": self.vacuumed_pages,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def default_retention_policies() -> list[RetentionPolicy]:
+    """Built-in policies; each limit can be overridden or disabled from the environment."""
+
+    def _policy(
+        table: Table, *, max_age_days: int | None, keep: int | None = None, **kw: Any
+    ) -> RetentionPolicy:
+        return RetentionPolicy(
+            table=table,
+            max_age_days=get_retention_limit(table.name, "max_age_days", max_age_days),
+            keep_per_group=get_retention_limit(table.name, "keep_per_group", keep),
+            **kw,
+        )
+
+    return [
+        _policy(AppEventModel.__table__, max_age_days=30, rollup_column="event_type"),
+        _policy(
+            TaskEventModel.__table__,
+            max_age_days=90,
+            keep=5000,
+            group_column="session_id",
+            rollup_column="event_type",
+        ),
+        _policy(
+            MemoryEventModel.__table__,
+            max_age_days=90,
+            keep=2000,
+            group_column="session_id",
+            rollup_column="event_type",
+        ),
+        _policy(
+            ToolInvocationModel.__table__,
+            max_age_days=90,
+            keep=2000,
+            timestamp_column="started_at",
+            group_column="session_id",
+            rollup_column="tool_name",
+            eligible=lambda table: table.c.finished_at.is_not(None),
+        ),
+        _policy(
+            WorkNotificationModel.__table__,
+            max_age_days=30,
+            group_column="work_id",
+            rollup_column="notification_type",
+            eligible=lambda table: table.c.acknowledged.is_(True),
+        ),
+        _policy(
+            MemoryJobModel.__table__,
+            max_age_days=7,
+            timestamp_column="finished_at",
+            rollup_column="status",
+            eligible=lambda table: table.c.status.in_(
+                [MEMORY_JOB_STATUS_DONE, MEMORY_JOB_STATUS_FAILED]
+            ),
+        ),
+    ]
+
+
+class RetentionManager:
+    """Archives expired rows to gzipped NDJSON, rolls them up, then deletes them.
+
+    Each batch is written to ``<archive_dir>/<table>/`` and fsynced before the
+    rows are deleted in their own short transaction, so an interrupted run loses
+    nothing and at worst archives a batch twice. Daily counts per rollup
+    dimension survive in ``retention_rollups`` after the rows are gone.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session],
+        *,
+        archive_dir: Path,
+        policies: list[RetentionPolicy] | None = None,
+        batch_size: int | None = None,
+        max_batches: int = RETENTION_MAX_BATCHES,
+        pause_seconds: float = RETENTION_BATCH_PAUSE_SECONDS,
+    ) -> None:
+        self.Session = session_factory
+        self.archive_dir = archive_dir
+        self.policies = policies if policies is not None else default_retention_policies()
+        self.batch_size = batch_size or get_retention_batch_size()
+        self.max_batches = max_batches
+        self.pause_seconds = pause_seconds
+        self.last_report: RetentionReport | None = None
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self, *, now: datetime | None = None) -> RetentionReport:
+        report = RetentionReport()
+        with self._run_lock:
+            current = now or datetime.now(tz=timezone.utc)
+            for policy in self.policies:
+                try:
+                    archived = self._apply_policy(policy, current, report)
+                except Exception as exc:
+                    debug_log("retention_policy_failed", {"table": policy.name, "error": str(exc)})
+                    continue
+                if archived:
+                    report.archived[policy.name] = archived
+            if report.archived:
+                report.vacuumed_pages = self.reclaim_space()
+            report.finished_at = now_iso()
+            self.last_report = report
+        debug_log("retention_run", report.to_dict())
+        return report
+
+    def reclaim_space(self, *, max_pages: int = VACUUM_MAX_PAGES) -> int:
+        """Return free pages to the filesystem a few at a time; needs auto_vacuum=INCREMENTAL."""
+        engine = self.Session.kw.get("bind")
+        if not isinstance(engine, Engine) or engine.dialect.name != "sqlite":
+            return 0
+        freed = 0
+        with engine.connect() as connection:
+            if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+                debug_log("retention_vacuum_skipped", {"reason": "auto_vacuum is not INCREMENTAL"})
+                return 0
+            free_pages = int(connection.exec_driver_sql("PRAGMA freelist_count").scalar() or 0)
+            connection.rollback()
+            for step in range(min(free_pages, max_pages)):
+                # pysqlite steps a PRAGMA once, and each step frees one page in
+                # its own tiny write transaction.
+                connection.exec_driver_sql("PRAGMA incremental_vacuum(1)")
+                freed += 1
+                if (step + 1) % VACUUM_PAGES_PER_PAUSE == 0:
+                    connection.commit()
+                    time.sleep(self.pause_seconds)
+            connection.commit()
+        return freed
+
+    def start(self, interval_seconds: float) -> None:
+        """Run every ``interval_seconds`` on a daemon thread, first after one interval."""
+        engine = self.Session.kw.get("bind")
+        # StaticPool hands every thread the same connection; see write_behind.
+        if isinstance(engine, Engine) and isinstance(engine.pool, StaticPool):
+            return
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._loop, args=(interval_seconds,), name="chanakya-retention", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+
+    def _loop(self, interval_seconds: float) -> None:
+        while not self._stop.wait(interval_seconds):
+            try:
+                self.run_once()
+            except Exception as exc:
+                debug_log("retention_run_failed", {"error": str(exc)})
+
+    def _expired_keys(self, session: Session, policy: RetentionPolicy, now: datetime) -> list[Any]:
+        table = policy.table
+        key = table.primary_key.columns.values()[0]
+        timestamp = table.c[policy.timestamp_column]
+        expired: list[ColumnElement[bool]] = []
+        if policy.max_age_days:
+            cutoff = (now - timedelta(days=policy.max_age_days)).isoformat()
+            expired.append(timestamp < cutoff)
+        if policy.keep_per_group and policy.group_column:
+            ranked = select(
+                key.label("key"),
+                func.row_number()
+                .over(
+                    partition_by=table.c[policy.group_column],
+                    order_by=(timestamp.desc(), key.desc()),
+                )
+                .label("rank"),
+            ).subquery()
+            expired.append(
+                key.in_(select(ranked.c.key).where(ranked.c.rank > policy.keep_per_group))
+            )
+        if not expired:
+            return []
+        stmt = select(key).where(or_(*expired))
+        if policy.eligible is not None:
+            stmt = stmt.where(policy.eligible(table))
+        stmt = stmt.order_by(timestamp.asc(), key.asc()).limit(self.batch_size * self.max_batches)
+        return list(session.scalars(stmt).all())
+
+    def _apply_policy(self, policy: RetentionPolicy, now: datetime, report: RetentionReport) -> int:
+        table = policy.table
+        key = table.primary_key.columns.values()[0]
+        with session_scope(self.Session) as session:
+            keys = self._expired_keys(session, policy, now)
+        archived = 0
+        for start in range(0, len(keys), self.batch_size):
+            batch = keys[start : start + self.batch_size]
+            with session_scope(self.Session) as session:
+                result = session.execute(select(table).where(key.in_(batch)))
+                rows = [dict(row) for row in result.mappings()]
+                if not rows:
+                    continue
+                report.archive_files.append(str(self._write_archive(policy, rows, now)))
+                self._add_rollups(session, policy, rows)
+                session.execute(delete(table).where(key.in_(batch)))
+                session.commit()
+            archived += len(rows)
+            time.sleep(self.pause_seconds)
+        return archived
+
+    def _write_archive(
+        self, policy: RetentionPolicy, rows: list[dict[str, Any]], now: datetime
+    ) -> Path:
+        directory = self.archive_dir / policy.name
+        directory.mkdir(parents=True, exist_ok=True)
+        key_name = policy.table.primary_key.columns.values()[0].name
+        stem = f"{now:%Y%m%dT%H%M%S}-{rows[0][key_name]}-{rows[-1][key_name]}"
+        path = directory / f"{stem}.ndjson.gz"
+        staging = path.with_name(path.name + ".tmp")
+        with open(staging, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+                for row in rows:
+                    line = json.dumps(row, ensure_ascii=False, default=str) + "\n"
+                    archive.write(line.encode("utf-8"))
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(staging, path)
+        return path
+
+    def _add_rollups(
+        self, session: Session, policy: RetentionPolicy, rows: list[dict[str, Any]]
+    ) -> None:
+        counts = Counter(
+            (
+                str(row.get(policy.timestamp_column) or "")[:10] or "unknown",
+                str(row.get(policy.rollup_column) or "") if policy.rollup_column else "",
+            )
+            for row in rows
+        )
+        existing = {
+            (rollup.day, rollup.dimension): rollup
+            for rollup in session.scalars(
+                select(RetentionRollupModel).where(
+                    RetentionRollupModel.table_name == policy.name,
+                    RetentionRollupModel.day.in_({day for day, _ in counts}),
+                )
+            ).all()
+        }
+        ts = now_iso()
+        for (day, dimension), count in counts.items():
+            rollup = existing.get((day, dimension))
+            if rollup is None:
+                session.add(
+                    RetentionRollupModel(
+                        table_name=policy.name,
+                        day=day,
+                        dimension=dimension,
+                        row_count=count,
+                        updated_at=ts,
+                    )
+                )
+            else:
+                rollup.row_count += count
+                rollup.updated_at = ts
+
+
+def list_retention_rollups(
+    session_factory: sessionmaker[Session], *, table_name: str | None = None, limit: int = 200
+) -> list[dict[str, Any]]:
+    with session_scope(session_factory) as session:
+        stmt = select(RetentionRollupModel)
+        if table_name is not None:
+            stmt = stmt.where(RetentionRollupModel.table_name == table_name)
+        rows = session.scalars(
+            stmt.order_by(RetentionRollupModel.day.desc(), RetentionRollupModel.id.asc()).limit(
+                limit
+            )
+        ).all()
+        return [
+            {
+                "table_name": row.table_name,
+                "day": row.day,
+                "dimension": row.dimension,
+                "row_count": row.row_count,
+            }
+            for row in rows
+        ]
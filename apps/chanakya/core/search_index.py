@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import Connection, Engine, text
+from sqlalchemy.orm import Session
+
+from chanakya.engine_registry import EngineRegistry
+
+# Same token boundaries as history_cache.tokenize_for_relevance: "_" joins words.
+FTS_TOKENIZE = "unicode61 tokenchars '_'"
+
+CHAT_MESSAGES_FTS = "chat_messages_fts"
+MEMORY_RECORDS_FTS = "memory_records_fts"
+
+_FTS_TABLES: EngineRegistry[frozenset[str]] = EngineRegistry()
+
+
+def sqlite_supports_fts5(connection: Connection) -> bool:
+    if connection.dialect.name != "sqlite":
+        return False
+    try:
+        connection.exec_driver_sql("CREATE VIRTUAL TABLE temp._chanakya_fts5_probe USING fts5(x)")
+        connection.exec_driver_sql("DROP TABLE temp._chanakya_fts5_probe")
+    except Exception:
+        return False
+    return True
+
+
+def fts_tables(engine: Engine) -> frozenset[str]:
+    """Return the FTS5 tables present on ``engine``, probed once per engine."""
+    tables = _FTS_TABLES.get(engine)
+    if tables is not None:
+        return tables
+    if engine.dialect.name != "sqlite":
+        tables = frozenset()
+    else:
+        with engine.connect() as connection:
+            tables = frozenset(
+                connection.scalars(
+                    text(
+                        "SELECT name FROM sqlite_master "
+                        "WHERE type = 'table' AND sql LIKE 'CREATE VIRTUAL TABLE%fts5%'"
+                    )
+                ).all()
+            )
+    _FTS_TABLES.set(engine, tables)
+    return tables
+
+
+def forget_fts_tables(engine: Engine) -> None:
+    _FTS_TABLES.pop(engine)
+
+
+def fts_phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def fts_any_of(tokens: Iterable[str]) -> str:
+    return " OR ".join(fts_phrase(token) for token in sorted(set(tokens)))
+
+
+def search_chat_history(
+    session: Session,
+    session_id: str,
+    tokens: Iterable[str],
+    *,
+    limit: int,
+) -> list[tuple[int, float]]:
+    """Return ``(message id, relevance)`` for the best BM25 matches in one chat session.
+
+    Relevance is the negated BM25 score, so larger is better. The session filter is
+    part of the MATCH expression so FTS intersects posting lists instead of
+    post-filtering every match in the database.
+    """
+    terms = fts_any_of(tokens)
+    if not terms:
+        return []
+    expression = f"session_id : {fts_phrase(session_id)} AND content : ({terms})"
+    rows = session.execute(
+        text(
+            f"SELECT rowid, bm25({CHAT_MESSAGES_FTS}, 1.0, 0.0) AS score "
+            f"FROM {CHAT_MESSAGES_FTS} WHERE {CHAT_MESSAGES_FTS} MATCH :expression "
+            "ORDER BY score LIMIT :limit"
+        ),
+        {"expression": expression, "limit": limit},
+    ).all()
+    return [(int(row_id), -float(score)) for row_id, score in rows]
+
+
+def search_memory_records(
+    session: Session,
+    owner_id: str,
+    tokens: Iterable[str],
+    *,
+    status: str | None,
+    limit: int,
+) -> list[tuple[str, float]]:
+    """Return ``(memory id, relevance)`` for an owner's best BM25 matches, best first.
+
+    The owner and status phrases only narrow the posting lists: a phrase also
+    matches ids that contain it as a token run ("alice" in "alice.smith"), so
+    the exact values are compared as well.
+    """
+    terms = fts_any_of(tokens)
+    if not terms:
+        return []
+    expression = f"owner_id : {fts_phrase(owner_id)} AND {{subject content}} : ({terms})"
+    conditions = "owner_id = :owner_id"
+    params: dict[str, object] = {"owner_id": owner_id, "limit": limit}
+    if status is not None:
+        expression += f" AND status : {fts_phrase(status)}"
+        conditions += " AND status = :status"
+        params["status"] = status
+    params["expression"] = expression
+    rows = session.execute(
+        text(
+            # Only subject and content contribute to the rank; subject counts double.
+            f"SELECT memory_id, bm25({MEMORY_RECORDS_FTS}, 0.0, 0.0, 0.0, 2.0, 1.0) AS score "
+            f"FROM {MEMORY_RECORDS_FTS} WHERE {MEMORY_RECORDS_FTS} MATCH :expression "
+            f"AND {conditions} ORDER BY score LIMIT :limit"
+        ),
+        params,
+    ).all()
+    return [(str(memory_id), -float(score)) for memory_id, score in rows]
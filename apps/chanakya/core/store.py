@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+from collections.abc import Collection, Iterable
+from datetime import datetime
 from pathlib import Path
 from typing import Any, cast
 
-from sqlalchemy import delete, or_, select
+from sqlalchemy import Engine, Select, delete, func, or_, select, update
 from sqlalchemy.orm import Session, sessionmaker
 
 from chanakya.db import session_scope
-from chanakya.domain import TASK_STATUS_FAILED, now_iso
+from chanakya.domain import (
+    MEMORY_JOB_STATUS_DONE,
+    MEMORY_JOB_STATUS_FAILED,
+    MEMORY_JOB_STATUS_PENDING,
+    MEMORY_JOB_STATUS_RUNNING,
+    TASK_STATUS_FAILED,
+    TASK_STATUS_WAITING_INPUT,
+    now_iso,
+)
+from chanakya.history_cache import invalidate_history
+from chanakya.memory_vectors import MemoryVectorIndex, get_memory_vector_index
 from chanakya.model import (
     AgentProfileModel,
     AgentSessionContextModel,
@@ -17,6 +29,7 @@ from chanakya.model import (
     ChatSessionModel,
     ClassicActiveWorkModel,
     MemoryEventModel,
+    MemoryJobModel,
     MemoryRecordModel,
     NotificationSettingsModel,
     RequestModel,
@@ -29,6 +42,131 @@ from chanakya.model import (
     WorkModel,
     WorkNotificationModel,
 )
+from chanakya.profile_cache import get_profile_cache, invalidate_agent_profiles
+from chanakya.search_index import MEMORY_RECORDS_FTS, fts_tables, search_memory_records
+from chanakya.write_behind import get_write_behind_queue
+
+
+def _apply_keyset_window(
+    stmt: Select[Any],
+    id_column: Any,
+    *,
+    after_id: int | None,
+    before_id: int | None,
+    limit: int | None,
+) -> tuple[Select[Any], bool]:
+    """Bound ``stmt`` to an id window and report whether rows come back newest-first.
+
+    ``after_id`` alone pages forward (oldest first, for "what is new since"); any
+    other combination pages backward from the tail so ``limit`` keeps the newest rows.
+    """
+    if after_id is not None:
+        stmt = stmt.where(id_column > after_id)
+    if before_id is not None:
+        stmt = stmt.where(id_column < before_id)
+    newest_first = not (after_id is not None and before_id is None)
+    stmt = stmt.order_by(id_column.desc() if newest_first else id_column.asc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt, newest_first
+
+
+# Read-only projections for the list paths: output key -> column. Selecting these
+# columns returns plain rows, skipping identity-map bookkeeping and entity
+# construction; ``omit`` drops keys (typically large JSON columns) from the SELECT.
+_MESSAGE_FIELDS: dict[str, Any] = {
+    "id": ChatMessageModel.id,
+    "role": ChatMessageModel.role,
+    "content": ChatMessageModel.content,
+    "request_id": ChatMessageModel.request_id,
+    "route": ChatMessageModel.route,
+    "metadata": ChatMessageModel.metadata_json,
+    "created_at": ChatMessageModel.created_at,
+}
+_REQUEST_MESSAGE_FIELDS: dict[str, Any] = {
+    "id": ChatMessageModel.id,
+    "session_id": ChatMessageModel.session_id,
+    **{key: column for key, column in _MESSAGE_FIELDS.items() if key != "id"},
+}
+_APP_EVENT_FIELDS: dict[str, Any] = {
+    "id": AppEventModel.id,
+    "event_type": AppEventModel.event_type,
+    "payload": AppEventModel.payload_json,
+    "created_at": AppEventModel.created_at,
+}
+_TASK_EVENT_FIELDS: dict[str, Any] = {
+    "id": TaskEventModel.id,
+    "session_id": TaskEventModel.session_id,
+    "request_id": TaskEventModel.request_id,
+    "task_id": TaskEventModel.task_id,
+    "event_type": TaskEventModel.event_type,
+    "payload": TaskEventModel.payload_json,
+    "created_at": TaskEventModel.created_at,
+}
+_REQUEST_FIELDS: dict[str, Any] = {
+    "id": RequestModel.id,
+    "session_id": RequestModel.session_id,
+    "user_message": RequestModel.user_message,
+    "route": RequestModel.route,
+    "status": RequestModel.status,
+    "root_task_id": RequestModel.root_task_id,
+    "created_at": RequestModel.created_at,
+    "updated_at": RequestModel.updated_at,
+}
+_TASK_FIELDS: dict[str, Any] = {
+    "id": TaskModel.id,
+    "request_id": TaskModel.request_id,
+    "session_id": RequestModel.session_id,
+    "parent_task_id": TaskModel.parent_task_id,
+    "title": TaskModel.title,
+    "summary": TaskModel.summary,
+    "status": TaskModel.status,
+    "owner_agent_id": TaskModel.owner_agent_id,
+    "task_type": TaskModel.task_type,
+    "dependencies": TaskModel.dependencies_json,
+    "input": TaskModel.input_json,
+    "result": TaskModel.result_json,
+    "error": TaskModel.error_text,
+    "created_at": TaskModel.created_at,
+    "updated_at": TaskModel.updated_at,
+    "started_at": TaskModel.started_at,
+    "finished_at": TaskModel.finished_at,
+    "is_root": TaskModel.parent_task_id.is_(None),
+}
+_TOOL_INVOCATION_FIELDS: dict[str, Any] = {
+    "id": ToolInvocationModel.id,
+    "invocation_id": ToolInvocationModel.invocation_id,
+    "request_id": ToolInvocationModel.request_id,
+    "session_id": ToolInvocationModel.session_id,
+    "agent_id": ToolInvocationModel.agent_id,
+    "agent_name": ToolInvocationModel.agent_name,
+    "tool_id": ToolInvocationModel.tool_id,
+    "tool_name": ToolInvocationModel.tool_name,
+    "server_name": ToolInvocationModel.server_name,
+    "status": ToolInvocationModel.status,
+    "input": ToolInvocationModel.input_json,
+    "output": ToolInvocationModel.output_text,
+    "error": ToolInvocationModel.error_text,
+    "started_at": ToolInvocationModel.started_at,
+    "finished_at": ToolInvocationModel.finished_at,
+}
+
+
+# Bulky text/JSON keys a list caller may leave out; ids and timestamps always stay.
+OMITTABLE_FIELDS = frozenset(
+    {"content", "metadata", "payload", "dependencies", "input", "result", "output", "error"}
+)
+
+
+def _project(fields: dict[str, Any], omit: Collection[str] = ()) -> Select[Any]:
+    unknown = set(omit).difference(OMITTABLE_FIELDS.intersection(fields))
+    if unknown:
+        raise ValueError(f"Cannot omit: {', '.join(sorted(unknown))}")
+    return select(*(column.label(key) for key, column in fields.items() if key not in omit))
+
+
+def _fetch_records(session: Session, stmt: Select[Any]) -> list[dict[str, Any]]:
+    return [dict(row) for row in session.execute(stmt).mappings()]
 
 
 class ChatRepository:
@@ -90,46 +228,36 @@ class ChatRepository:
                 chat_session.updated_at = now_iso()
             session.commit()
 
-    def list_messages(self, session_id: str) -> list[dict[str, Any]]:
+    def list_messages(
+        self,
+        session_id: str,
+        *,
+        after_id: int | None = None,
+        before_id: int | None = None,
+        limit: int | None = None,
+        omit: Collection[str] = (),
+    ) -> list[dict[str, Any]]:
+        stmt, newest_first = _apply_keyset_window(
+            _project(_MESSAGE_FIELDS, omit).where(ChatMessageModel.session_id == session_id),
+            ChatMessageModel.id,
+            after_id=after_id,
+            before_id=before_id,
+            limit=limit,
+        )
         with session_scope(self.Session) as session:
-            rows = session.scalars(
-                select(ChatMessageModel)
-                .where(ChatMessageModel.session_id == session_id)
-                .order_by(ChatMessageModel.id.asc())
-            ).all()
-        return [
-            {
-                "id": row.id,
-                "role": row.role,
-                "content": row.content,
-                "request_id": row.request_id,
-                "route": row.route,
-                "metadata": row.metadata_json,
-                "created_at": row.created_at,
-            }
-            for row in rows
-        ]
+            records = _fetch_records(session, stmt)
+        if newest_first:
+            records.reverse()
+        return records
 
     def list_messages_for_request(self, request_id: str) -> list[dict[str, Any]]:
         with session_scope(self.Session) as session:
-            rows = session.scalars(
-                select(ChatMessageModel)
+            return _fetch_records(
+                session,
+                _project(_REQUEST_MESSAGE_FIELDS)
                 .where(ChatMessageModel.request_id == request_id)
-                .order_by(ChatMessageModel.id.asc())
-            ).all()
-        return [
-            {
-                "id": row.id,
-                "session_id": row.session_id,
-                "role": row.role,
-                "content": row.content,
-                "request_id": row.request_id,
-                "route": row.route,
-                "metadata": row.metadata_json,
-                "created_at": row.created_at,
-            }
-            for row in rows
-        ]
+                .order_by(ChatMessageModel.id.asc()),
+            )
 
     def get_latest_assistant_request_id(self, session_id: str) -> str | None:
         with session_scope(self.Session) as session:
@@ -177,38 +305,40 @@ class ChatRepository:
             if chat_session is not None:
                 chat_session.updated_at = now_iso()
             session.commit()
+        invalidate_history(self.Session, session_id)
 
 
 class EventRepository:
     def __init__(self, session_factory: sessionmaker[Session]) -> None:
         self.Session = session_factory
+        self.writes = get_write_behind_queue(session_factory)
 
     def log_event(self, event_type: str, payload: dict[str, Any]) -> None:
-        with session_scope(self.Session) as session:
-            session.add(
-                AppEventModel(
-                    event_type=event_type,
-                    payload_json=payload,
-                    created_at=now_iso(),
-                )
-            )
-            session.commit()
+        self.writes.add(
+            AppEventModel,
+            {"event_type": event_type, "payload_json": payload, "created_at": now_iso()},
+        )
 
-    def list_events(self, limit: int = 50) -> list[dict[str, Any]]:
+    def list_events(
+        self,
+        limit: int = 50,
+        *,
+        after_id: int | None = None,
+        before_id: int | None = None,
+        omit: Collection[str] = (),
+    ) -> list[dict[str, Any]]:
+        self.writes.flush()
+        stmt, newest_first = _apply_keyset_window(
+            _project(_APP_EVENT_FIELDS, omit),
+            AppEventModel.id,
+            after_id=after_id,
+            before_id=before_id,
+            limit=limit,
+        )
         with session_scope(self.Session) as session:
-            rows = session.scalars(
-                select(AppEventModel).order_by(AppEventModel.id.desc()).limit(limit)
-            ).all()
-        events = [
-            {
-                "id": row.id,
-                "event_type": row.event_type,
-                "payload": row.payload_json,
-                "created_at": row.created_at,
-            }
-            for row in rows
-        ]
-        events.reverse()
+            events = _fetch_records(session, stmt)
+        if newest_first:
+            events.reverse()
         return events
 
     def create_task_event(
@@ -220,18 +350,17 @@ class EventRepository:
         request_id: str | None = None,
         task_id: str | None = None,
     ) -> None:
-        with session_scope(self.Session) as session:
-            session.add(
-                TaskEventModel(
-                    session_id=session_id,
-                    request_id=request_id,
-                    task_id=task_id,
-                    event_type=event_type,
-                    payload_json=payload,
-                    created_at=now_iso(),
-                )
-            )
-            session.commit()
+        self.writes.add(
+            TaskEventModel,
+            {
+                "session_id": session_id,
+                "request_id": request_id,
+                "task_id": task_id,
+                "event_type": event_type,
+                "payload_json": payload,
+                "created_at": now_iso(),
+            },
+        )
 
     def list_task_events(
         self,
@@ -240,36 +369,37 @@ class EventRepository:
         request_id: str | None = None,
         task_id: str | None = None,
         limit: int = 100,
+        after_id: int | None = None,
+        before_id: int | None = None,
+        omit: Collection[str] = (),
     ) -> list[dict[str, Any]]:
+        self.writes.flush()
+        stmt = _project(_TASK_EVENT_FIELDS, omit)
+        if session_id is not None:
+            stmt = stmt.where(TaskEventModel.session_id == session_id)
+        if request_id is not None:
+            stmt = stmt.where(TaskEventModel.request_id == request_id)
+        if task_id is not None:
+            stmt = stmt.where(TaskEventModel.task_id == task_id)
+        stmt, newest_first = _apply_keyset_window(
+            stmt,
+            TaskEventModel.id,
+            after_id=after_id,
+            before_id=before_id,
+            limit=limit,
+        )
         with session_scope(self.Session) as session:
-            stmt = select(TaskEventModel).order_by(TaskEventModel.id.desc()).limit(limit)
-            if session_id is not None:
-                stmt = stmt.where(TaskEventModel.session_id == session_id)
-            if request_id is not None:
-                stmt = stmt.where(TaskEventModel.request_id == request_id)
-            if task_id is not None:
-                stmt = stmt.where(TaskEventModel.task_id == task_id)
-            rows = session.scalars(stmt).all()
-
-        records = [
-            {
-                "id": row.id,
-                "session_id": row.session_id,
-                "request_id": row.request_id,
-                "task_id": row.task_id,
-                "event_type": row.event_type,
-                "payload": row.payload_json,
-                "created_at": row.created_at,
-            }
-            for row in rows
-        ]
-        records.reverse()
+            records = _fetch_records(session, stmt)
+        if newest_first:
+            records.reverse()
         return records
 
 
 class MemoryRepository:
     def __init__(self, session_factory: sessionmaker[Session]) -> None:
         self.Session = session_factory
+        self.writes = get_write_behind_queue(session_factory)
+        self.vectors = get_memory_vector_index(session_factory)
 
     @staticmethod
     def _to_dict(row: MemoryRecordModel) -> dict[str, Any]:
@@ -332,7 +462,10 @@ class MemoryRepository:
             )
             session.add(row)
             session.commit()
-            return self._to_dict(row)
+            created = self._to_dict(row)
+        if self.vectors is not None:
+            self.vectors.mark_dirty(memory_id)
+        return created
 
     def get_memory(self, memory_id: str) -> MemoryRecordModel:
         with session_scope(self.Session) as session:
@@ -355,7 +488,10 @@ class MemoryRepository:
                     setattr(row, key, value)
             row.updated_at = now_iso()
             session.commit()
-            return self._to_dict(row)
+            updated = self._to_dict(row)
+        if self.vectors is not None:
+            self.vectors.mark_dirty(memory_id)
+        return updated
 
     def list_memories(
         self,
@@ -364,6 +500,7 @@ class MemoryRepository:
         status: str | None = "active",
         session_id: str | None = None,
         limit: int = 100,
+        types: Collection[str] | None = None,
     ) -> list[dict[str, Any]]:
         with session_scope(self.Session) as session:
             stmt = select(MemoryRecordModel).where(MemoryRecordModel.owner_id == owner_id)
@@ -376,11 +513,149 @@ class MemoryRepository:
                         MemoryRecordModel.session_id.is_(None),
                     )
                 )
+            if types is not None:
+                stmt = stmt.where(MemoryRecordModel.type.in_(list(types)))
             rows = session.scalars(
                 stmt.order_by(MemoryRecordModel.updated_at.desc()).limit(limit)
             ).all()
         return [self._to_dict(row) for row in rows]
 
+    def search_memories(
+        self,
+        *,
+        owner_id: str,
+        tokens: Iterable[str],
+        status: str | None = "active",
+        session_id: str | None = None,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Return the owner's memories best matching ``tokens`` across all records.
+
+        Uses the memory_records_fts index when present (each dict carries its
+        ``search_score``); otherwise falls back to the newest ``limit`` memories.
+        """
+        engine = self.Session.kw.get("bind")
+        if not isinstance(engine, Engine) or MEMORY_RECORDS_FTS not in fts_tables(engine):
+            return self.list_memories(
+                owner_id=owner_id, status=status, session_id=session_id, limit=limit
+            )
+        with session_scope(self.Session) as session:
+            # Over-fetch: session-scoped memories of other chats are dropped below.
+            hits = search_memory_records(
+                session, owner_id, tokens, status=status, limit=limit * 2
+            )
+            if not hits:
+                return []
+            stmt = select(MemoryRecordModel).where(
+                MemoryRecordModel.id.in_([memory_id for memory_id, _ in hits]),
+                MemoryRecordModel.owner_id == owner_id,
+            )
+            if status is not None:
+                stmt = stmt.where(MemoryRecordModel.status == status)
+            if session_id is not None:
+                stmt = stmt.where(
+                    or_(
+                        MemoryRecordModel.session_id == session_id,
+                        MemoryRecordModel.session_id.is_(None),
+                    )
+                )
+            rows = {row.id: row for row in session.scalars(stmt).all()}
+        results: list[dict[str, Any]] = []
+        for memory_id, score in hits:
+            row = rows.get(memory_id)
+            if row is None:
+                continue
+            results.append({**self._to_dict(row), "search_score": score})
+            if len(results) >= limit:
+                break
+        return results
+
+    def semantic_search_memories(
+        self,
+        *,
+        owner_id: str,
+        query: str,
+        session_id: str | None = None,
+        limit: int = 20,
+        min_similarity: float = 0.0,
+    ) -> list[dict[str, Any]]:
+        """Return active memories whose embeddings are closest to ``query``.
+
+        Empty when the vector index is disabled. Each dict carries its cosine
+        ``semantic_score``; records changed since the last search, by this process
+        or another one, are re-embedded first.
+        """
+        index = self.vectors
+        if index is None or not query.strip():
+            return []
+        self._reconcile_vectors(index)
+        index.refresh(self._embedding_texts)
+        # Over-fetch: the index spans every owner and session.
+        hits = [hit for hit in index.search(query, limit=limit * 4) if hit[1] >= min_similarity]
+        if not hits:
+            return []
+        with session_scope(self.Session) as session:
+            stmt = select(MemoryRecordModel).where(
+                MemoryRecordModel.id.in_([memory_id for memory_id, _ in hits]),
+                MemoryRecordModel.owner_id == owner_id,
+                MemoryRecordModel.status == "active",
+            )
+            if session_id is not None:
+                stmt = stmt.where(
+                    or_(
+                        MemoryRecordModel.session_id == session_id,
+                        MemoryRecordModel.session_id.is_(None),
+                    )
+                )
+            rows = {row.id: row for row in session.scalars(stmt).all()}
+        results: list[dict[str, Any]] = []
+        for memory_id, score in hits:
+            row = rows.get(memory_id)
+            if row is None:
+                continue
+            results.append({**self._to_dict(row), "semantic_score": score})
+            if len(results) >= limit:
+                break
+        return results
+
+    def _reconcile_vectors(self, index: MemoryVectorIndex) -> None:
+        # Count and newest stamp of active rows change on every create, update,
+        # archive or delete, so the id/stamp scan only runs after a change.
+        active = MemoryRecordModel.status == "active"
+        with session_scope(self.Session) as session:
+            signature = tuple(
+                session.execute(
+                    select(func.count(), func.max(MemoryRecordModel.updated_at)).where(active)
+                ).one()
+            )
+            if signature == index.synced_signature:
+                return
+            current = dict(
+                session.execute(
+                    select(MemoryRecordModel.id, MemoryRecordModel.updated_at).where(active)
+                ).all()
+            )
+        index.reconcile(current)
+        index.synced_signature = signature
+
+    def _embedding_texts(self, memory_ids: list[str]) -> dict[str, tuple[str, str]]:
+        with session_scope(self.Session) as session:
+            rows = session.execute(
+                select(
+                    MemoryRecordModel.id,
+                    MemoryRecordModel.subject,
+                    MemoryRecordModel.content,
+                    MemoryRecordModel.updated_at,
+                ).where(
+                    MemoryRecordModel.id.in_(memory_ids),
+                    MemoryRecordModel.status == "active",
+                )
+            ).all()
+        return {
+            memory_id: (f"{subject}: {content}", updated_at)
+            for memory_id, subject, content, updated_at in rows
+        }
+
     def create_memory_event(
         self,
         *,
@@ -391,19 +666,18 @@ class MemoryRepository:
         session_id: str | None = None,
         request_id: str | None = None,
     ) -> None:
-        with session_scope(self.Session) as session:
-            session.add(
-                MemoryEventModel(
-                    memory_id=memory_id,
-                    owner_id=owner_id,
-                    session_id=session_id,
-                    request_id=request_id,
-                    event_type=event_type,
-                    payload_json=payload,
-                    created_at=now_iso(),
-                )
-            )
-            session.commit()
+        self.writes.add(
+            MemoryEventModel,
+            {
+                "memory_id": memory_id,
+                "owner_id": owner_id,
+                "session_id": session_id,
+                "request_id": request_id,
+                "event_type": event_type,
+                "payload_json": payload,
+                "created_at": now_iso(),
+            },
+        )
 
     def list_memory_events(
         self,
@@ -413,6 +687,7 @@ class MemoryRepository:
         request_id: str | None = None,
         limit: int = 100,
     ) -> list[dict[str, Any]]:
+        self.writes.flush()
         with session_scope(self.Session) as session:
             stmt = select(MemoryEventModel).where(MemoryEventModel.owner_id == owner_id)
             if session_id is not None:
@@ -437,6 +712,244 @@ class MemoryRepository:
         return records
 
 
+def _seconds_between(start: str | None, end: str | None) -> float | None:
+    if not start or not end:
+        return None
+    try:
+        return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+    except ValueError:
+        return None
+
+
+class MemoryJobRepository:
+    """Durable queue of long-term memory updates, one pending job per chat session.
+
+    Turns that arrive while a session's job is still pending are folded into it,
+    so a burst of messages costs one memory-manager run. Claims skip sessions
+    that already have a running job, which keeps updates for a session ordered.
+    """
+
+    METRICS_WINDOW = 100
+
+    def __init__(self, session_factory: sessionmaker[Session]) -> None:
+        self.Session = session_factory
+
+    def enqueue(self, *, session_id: str, request_id: str, priority: int = 0) -> dict[str, Any]:
+        ts = now_iso()
+        pending_stmt = (
+            select(
+                MemoryJobModel.id, MemoryJobModel.request_ids_json, MemoryJobModel.priority
+            )
+            .where(
+                MemoryJobModel.session_id == session_id,
+                MemoryJobModel.status == MEMORY_JOB_STATUS_PENDING,
+            )
+            .order_by(MemoryJobModel.id.asc())
+            .limit(1)
+        )
+        with session_scope(self.Session) as session:
+            # A worker may claim the pending job, or another enqueue fold into it,
+            # between the read and the conditional update; look again, then open a
+            # new job once no pending one is left to fold into.
+            for _ in range(3):
+                pending = session.execute(pending_stmt).first()
+                if pending is None:
+                    break
+                job_id, request_ids, current_priority = pending
+                folded = session.execute(
+                    update(MemoryJobModel)
+                    .where(
+                        MemoryJobModel.id == job_id,
+                        MemoryJobModel.status == MEMORY_JOB_STATUS_PENDING,
+                        MemoryJobModel.request_ids_json == request_ids,
+                    )
+                    .values(
+                        request_ids_json=(
+                            request_ids if request_id in request_ids else [*request_ids, request_id]
+                        ),
+                        priority=max(current_priority, priority),
+                        updated_at=ts,
+                    )
+                )
+                session.commit()
+                if folded.rowcount:
+                    row = session.get(MemoryJobModel, job_id)
+                    assert row is not None
+                    session.refresh(row)
+                    return {**self._serialize(row), "coalesced": True}
+            row = MemoryJobModel(
+                session_id=session_id,
+                request_ids_json=[request_id],
+                status=MEMORY_JOB_STATUS_PENDING,
+                priority=priority,
+                attempts=0,
+                enqueued_at=ts,
+                updated_at=ts,
+            )
+            session.add(row)
+            session.commit()
+            return {**self._serialize(row), "coalesced": False}
+
+    def claim_next(self) -> dict[str, Any] | None:
+        """Mark the best pending job as running and return it, or None when idle."""
+        running_sessions = select(MemoryJobModel.session_id).where(
+            MemoryJobModel.status == MEMORY_JOB_STATUS_RUNNING
+        )
+        candidate_stmt = (
+            select(MemoryJobModel.id)
+            .where(
+                MemoryJobModel.status == MEMORY_JOB_STATUS_PENDING,
+                MemoryJobModel.session_id.not_in(running_sessions),
+            )
+            .order_by(MemoryJobModel.priority.desc(), MemoryJobModel.id.asc())
+            .limit(1)
+        )
+        with session_scope(self.Session) as session:
+            # Another worker may win the conditional update; try the next candidate.
+            for _ in range(3):
+                job_id = session.scalar(candidate_stmt)
+                if job_id is None:
+                    return None
+                claimed = session.execute(
+                    update(MemoryJobModel)
+                    .where(
+                        MemoryJobModel.id == job_id,
+                        MemoryJobModel.status == MEMORY_JOB_STATUS_PENDING,
+                    )
+                    .values(
+                        status=MEMORY_JOB_STATUS_RUNNING,
+                        attempts=MemoryJobModel.attempts + 1,
+                        started_at=now_iso(),
+                        updated_at=now_iso(),
+                    )
+                )
+                session.commit()
+                if claimed.rowcount:
+                    row = session.get(MemoryJobModel, job_id)
+                    assert row is not None
+                    session.refresh(row)
+                    return self._serialize(row)
+        return None
+
+    def finish(self, job_id: int, *, error: str | None = None) -> None:
+        ts = now_iso()
+        with session_scope(self.Session) as session:
+            session.execute(
+                update(MemoryJobModel)
+                .where(MemoryJobModel.id == job_id)
+                .values(
+                    status=MEMORY_JOB_STATUS_FAILED if error else MEMORY_JOB_STATUS_DONE,
+                    error=error,
+                    finished_at=ts,
+                    updated_at=ts,
+                )
+            )
+            session.commit()
+
+    def recover_unfinished(self) -> int:
+        """Return jobs left running by a previous process to the pending state."""
+        with session_scope(self.Session) as session:
+            result = session.execute(
+                update(MemoryJobModel)
+                .where(MemoryJobModel.status == MEMORY_JOB_STATUS_RUNNING)
+                .values(status=MEMORY_JOB_STATUS_PENDING, started_at=None, updated_at=now_iso())
+            )
+            session.commit()
+            return int(result.rowcount or 0)
+
+    def has_pending(self) -> bool:
+        with session_scope(self.Session) as session:
+            return (
+                session.scalar(
+                    select(MemoryJobModel.id)
+                    .where(MemoryJobModel.status == MEMORY_JOB_STATUS_PENDING)
+                    .limit(1)
+                )
+                is not None
+            )
+
+    def get_job(self, job_id: int) -> dict[str, Any] | None:
+        with session_scope(self.Session) as session:
+            row = session.get(MemoryJobModel, job_id)
+            return None if row is None else self._serialize(row)
+
+    def metrics(self) -> dict[str, Any]:
+        """Queue depth plus wait and run latency over the most recent finished jobs."""
+        with session_scope(self.Session) as session:
+            counts = dict(
+                session.execute(
+                    select(MemoryJobModel.status, func.count()).group_by(MemoryJobModel.status)
+                ).all()
+            )
+            oldest_pending = session.scalar(
+                select(func.min(MemoryJobModel.enqueued_at)).where(
+                    MemoryJobModel.status == MEMORY_JOB_STATUS_PENDING
+                )
+            )
+            pending_turns = sum(
+                len(request_ids or [])
+                for request_ids in session.scalars(
+                    select(MemoryJobModel.request_ids_json).where(
+                        MemoryJobModel.status == MEMORY_JOB_STATUS_PENDING
+                    )
+                ).all()
+            )
+            recent = session.execute(
+                select(
+                    MemoryJobModel.enqueued_at,
+                    MemoryJobModel.started_at,
+                    MemoryJobModel.finished_at,
+                    MemoryJobModel.request_ids_json,
+                )
+                .where(
+                    MemoryJobModel.status.in_([MEMORY_JOB_STATUS_DONE, MEMORY_JOB_STATUS_FAILED])
+                )
+                .order_by(MemoryJobModel.id.desc())
+                .limit(self.METRICS_WINDOW)
+            ).all()
+        waits = [
+            seconds
+            for enqueued_at, started_at, _, _ in recent
+            if (seconds := _seconds_between(enqueued_at, started_at)) is not None
+        ]
+        runs = [
+            seconds
+            for _, started_at, finished_at, _ in recent
+            if (seconds := _seconds_between(started_at, finished_at)) is not None
+        ]
+        recent_turns = sum(len(request_ids or []) for *_, request_ids in recent)
+        return {
+            "pending": int(counts.get(MEMORY_JOB_STATUS_PENDING, 0)),
+            "pending_turns": pending_turns,
+            "running": int(counts.get(MEMORY_JOB_STATUS_RUNNING, 0)),
+            "done": int(counts.get(MEMORY_JOB_STATUS_DONE, 0)),
+            "failed": int(counts.get(MEMORY_JOB_STATUS_FAILED, 0)),
+            "oldest_pending_age_seconds": _seconds_between(oldest_pending, now_iso()),
+            "recent_jobs": len(recent),
+            "recent_turns_per_job": (recent_turns / len(recent)) if recent else None,
+            "avg_wait_seconds": (sum(waits) / len(waits)) if waits else None,
+            "max_wait_seconds": max(waits) if waits else None,
+            "avg_run_seconds": (sum(runs) / len(runs)) if runs else None,
+            "max_run_seconds": max(runs) if runs else None,
+        }
+
+    @staticmethod
+    def _serialize(row: MemoryJobModel) -> dict[str, Any]:
+        return {
+            "id": row.id,
+            "session_id": row.session_id,
+            "request_ids": list(row.request_ids_json or []),
+            "status": row.status,
+            "priority": row.priority,
+            "attempts": row.attempts,
+            "error": row.error,
+            "enqueued_at": row.enqueued_at,
+            "updated_at": row.updated_at,
+            "started_at": row.started_at,
+            "finished_at": row.finished_at,
+        }
+
+
 class ArtifactRepository:
     def __init__(self, session_factory: sessionmaker[Session]) -> None:
         self.Session = session_factory
@@ -908,24 +1421,11 @@ class RequestRepository:
     def list_requests(
         self, *, session_id: str | None = None, limit: int = 100
     ) -> list[dict[str, Any]]:
+        stmt = _project(_REQUEST_FIELDS).order_by(RequestModel.created_at.desc()).limit(limit)
+        if session_id is not None:
+            stmt = stmt.where(RequestModel.session_id == session_id)
         with session_scope(self.Session) as session:
-            stmt = select(RequestModel).order_by(RequestModel.created_at.desc()).limit(limit)
-            if session_id is not None:
-                stmt = stmt.where(RequestModel.session_id == session_id)
-            rows = session.scalars(stmt).all()
-        records = [
-            {
-                "id": row.id,
-                "session_id": row.session_id,
-                "user_message": row.user_message,
-                "route": row.route,
-                "status": row.status,
-                "root_task_id": row.root_task_id,
-                "created_at": row.created_at,
-                "updated_at": row.updated_at,
-            }
-            for row in rows
-        ]
+            records = _fetch_records(session, stmt)
         records.reverse()
         return records
 
@@ -1027,47 +1527,43 @@ class TaskRepository:
         request_id: str | None = None,
         root_only: bool = False,
         limit: int = 100,
+        omit: Collection[str] = (),
     ) -> list[dict[str, Any]]:
-        with session_scope(self.Session) as session:
-            stmt = select(TaskModel, RequestModel.session_id).join(
-                RequestModel,
-                TaskModel.request_id == RequestModel.id,
-            )
-            if session_id is not None:
-                stmt = stmt.where(RequestModel.session_id == session_id)
-            if request_id is not None:
-                stmt = stmt.where(TaskModel.request_id == request_id)
-            if root_only:
-                stmt = stmt.where(TaskModel.parent_task_id.is_(None))
-            stmt = stmt.order_by(TaskModel.created_at.desc()).limit(limit)
-            rows = session.execute(stmt).all()
-
-        records = [
-            {
-                "id": task.id,
-                "request_id": task.request_id,
-                "session_id": linked_session_id,
-                "parent_task_id": task.parent_task_id,
-                "title": task.title,
-                "summary": task.summary,
-                "status": task.status,
-                "owner_agent_id": task.owner_agent_id,
-                "task_type": task.task_type,
-                "dependencies": task.dependencies_json,
-                "input": task.input_json,
-                "result": task.result_json,
-                "error": task.error_text,
-                "created_at": task.created_at,
-                "updated_at": task.updated_at,
-                "started_at": task.started_at,
-                "finished_at": task.finished_at,
-                "is_root": task.parent_task_id is None,
-            }
-            for task, linked_session_id in rows
-        ]
+        stmt = _project(_TASK_FIELDS, omit).join_from(
+            TaskModel,
+            RequestModel,
+            TaskModel.request_id == RequestModel.id,
+        )
+        if session_id is not None:
+            stmt = stmt.where(RequestModel.session_id == session_id)
+        if request_id is not None:
+            stmt = stmt.where(TaskModel.request_id == request_id)
+        if root_only:
+            stmt = stmt.where(TaskModel.parent_task_id.is_(None))
+        stmt = stmt.order_by(TaskModel.created_at.desc()).limit(limit)
+        with session_scope(self.Session) as session:
+            records = _fetch_records(session, stmt)
         records.reverse()
         return records
 
+    def list_waiting_input(self, session_ids: Collection[str]) -> list[dict[str, Any]]:
+        """Tasks in ``waiting_input`` for these sessions, oldest first.
+
+        Driven by the ``tasks.status`` index, so the cost follows the handful of
+        tasks parked on a user reply rather than the session's task history.
+        """
+        if not session_ids:
+            return []
+        stmt = (
+            _project(_TASK_FIELDS)
+            .join_from(TaskModel, RequestModel, TaskModel.request_id == RequestModel.id)
+            .where(TaskModel.status == TASK_STATUS_WAITING_INPUT)
+            .where(RequestModel.session_id.in_(list(session_ids)))
+            .order_by(TaskModel.created_at.asc())
+        )
+        with session_scope(self.Session) as session:
+            return _fetch_records(session, stmt)
+
     def list_children(
         self,
         parent_task_id: str,
@@ -1118,6 +1614,7 @@ class TaskRepository:
 class ToolInvocationRepository:
     def __init__(self, session_factory: sessionmaker[Session]) -> None:
         self.Session = session_factory
+        self.writes = get_write_behind_queue(session_factory)
 
     def create_tool_invocation(
         self,
@@ -1133,26 +1630,25 @@ class ToolInvocationRepository:
         status: str,
         input_json: dict[str, Any] | None = None,
     ) -> None:
-        with session_scope(self.Session) as session:
-            session.add(
-                ToolInvocationModel(
-                    invocation_id=invocation_id,
-                    request_id=request_id,
-                    session_id=session_id,
-                    agent_id=agent_id,
-                    agent_name=agent_name,
-                    tool_id=tool_id,
-                    tool_name=tool_name,
-                    server_name=server_name,
-                    status=status,
-                    input_json=input_json or {},
-                    output_text=None,
-                    error_text=None,
-                    started_at=now_iso(),
-                    finished_at=None,
-                )
-            )
-            session.commit()
+        self.writes.add(
+            ToolInvocationModel,
+            {
+                "invocation_id": invocation_id,
+                "request_id": request_id,
+                "session_id": session_id,
+                "agent_id": agent_id,
+                "agent_name": agent_name,
+                "tool_id": tool_id,
+                "tool_name": tool_name,
+                "server_name": server_name,
+                "status": status,
+                "input_json": input_json or {},
+                "output_text": None,
+                "error_text": None,
+                "started_at": now_iso(),
+                "finished_at": None,
+            },
+        )
 
     def finish_tool_invocation(
         self,
@@ -1162,19 +1658,18 @@ class ToolInvocationRepository:
         output_text: str | None = None,
         error_text: str | None = None,
     ) -> None:
-        with session_scope(self.Session) as session:
-            row = session.scalars(
-                select(ToolInvocationModel).where(
-                    ToolInvocationModel.invocation_id == invocation_id
-                )
-            ).first()
-            if row is None:
-                return
-            row.status = status
-            row.output_text = output_text
-            row.error_text = error_text
-            row.finished_at = now_iso()
-            session.commit()
+        # Queued behind the matching insert; a missing invocation updates nothing.
+        statement = (
+            update(ToolInvocationModel)
+            .where(ToolInvocationModel.invocation_id == invocation_id)
+            .values(
+                status=status,
+                output_text=output_text,
+                error_text=error_text,
+                finished_at=now_iso(),
+            )
+        )
+        self.writes.apply(lambda session: session.execute(statement))
 
     def list_tool_invocations(
         self,
@@ -1182,35 +1677,20 @@ class ToolInvocationRepository:
         session_id: str | None = None,
         request_id: str | None = None,
         limit: int = 100,
+        omit: Collection[str] = (),
     ) -> list[dict[str, Any]]:
+        self.writes.flush()
+        stmt = (
+            _project(_TOOL_INVOCATION_FIELDS, omit)
+            .order_by(ToolInvocationModel.id.desc())
+            .limit(limit)
+        )
+        if session_id is not None:
+            stmt = stmt.where(ToolInvocationModel.session_id == session_id)
+        if request_id is not None:
+            stmt = stmt.where(ToolInvocationModel.request_id == request_id)
         with session_scope(self.Session) as session:
-            stmt = select(ToolInvocationModel).order_by(ToolInvocationModel.id.desc()).limit(limit)
-            if session_id is not None:
-                stmt = stmt.where(ToolInvocationModel.session_id == session_id)
-            if request_id is not None:
-                stmt = stmt.where(ToolInvocationModel.request_id == request_id)
-            rows = session.scalars(stmt).all()
-
-        records = [
-            {
-                "id": row.id,
-                "invocation_id": row.invocation_id,
-                "request_id": row.request_id,
-                "session_id": row.session_id,
-                "agent_id": row.agent_id,
-                "agent_name": row.agent_name,
-                "tool_id": row.tool_id,
-                "tool_name": row.tool_name,
-                "server_name": row.server_name,
-                "status": row.status,
-                "input": row.input_json,
-                "output": row.output_text,
-                "error": row.error_text,
-                "started_at": row.started_at,
-                "finished_at": row.finished_at,
-            }
-            for row in rows
-        ]
+            records = _fetch_records(session, stmt)
         records.reverse()
         return records
 
@@ -1241,11 +1721,13 @@ class AgentProfileRepository:
                 row.is_active = profile.is_active
                 row.updated_at = profile.updated_at
             session.commit()
+        invalidate_agent_profiles(self.Session, profile.id)
 
     def create_agent_profile(self, profile: AgentProfileModel) -> None:
         with session_scope(self.Session) as session:
             session.add(profile)
             session.commit()
+        invalidate_agent_profiles(self.Session, profile.id)
 
     def update_agent_profile(
         self,
@@ -1280,7 +1762,8 @@ class AgentProfileRepository:
             session.commit()
             session.refresh(row)
             session.expunge(row)
-            return row
+        invalidate_agent_profiles(self.Session, agent_id)
+        return row
 
     def list_agent_profiles(self) -> list[AgentProfileModel]:
         with session_scope(self.Session) as session:
@@ -1290,12 +1773,20 @@ class AgentProfileRepository:
         return cast(list[AgentProfileModel], rows)
 
     def get_agent_profile(self, agent_id: str) -> AgentProfileModel:
-        with session_scope(self.Session) as session:
-            row = session.get(AgentProfileModel, agent_id)
+        cache = get_profile_cache(self.Session)
+        row = (
+            self._load_agent_profile(agent_id)
+            if cache is None
+            else cache.get(agent_id, lambda: self._load_agent_profile(agent_id))
+        )
         if row is None:
             raise KeyError(f"Agent profile not found: {agent_id}")
         return row
 
+    def _load_agent_profile(self, agent_id: str) -> AgentProfileModel | None:
+        with session_scope(self.Session) as session:
+            return session.get(AgentProfileModel, agent_id)
+
     def find_active_agents_by_role(self, role: str) -> list[AgentProfileModel]:
         with session_scope(self.Session) as session:
             rows = session.scalars(
@@ -1360,13 +1851,70 @@ class WorkRepository:
             raise KeyError(f"Work not found: {work_id}")
         return row
 
-    def delete_work(self, work_id: str) -> None:
+    def delete_work(self, work_id: str) -> tuple[list[str], list[str]]:
+        """Delete a work and everything reachable from its agent sessions.
+
+        Runs as a fixed set of ``DELETE ... WHERE ... IN (subquery)`` statements in
+        one transaction, so the write lock is held for a handful of statements no
+        matter how large the work is. Returns the deleted session and artifact ids.
+        """
+        session_ids_sq = select(WorkAgentSessionModel.session_id).where(
+            WorkAgentSessionModel.work_id == work_id
+        )
+        request_ids_sq = select(RequestModel.id).where(RequestModel.session_id.in_(session_ids_sq))
+        task_ids_sq = select(TaskModel.id).where(TaskModel.request_id.in_(request_ids_sq))
+        context_match = (
+            select(WorkAgentSessionModel.id)
+            .where(WorkAgentSessionModel.work_id == work_id)
+            .where(
+                or_(
+                    AgentSessionContextModel.session_id == WorkAgentSessionModel.session_id,
+                    AgentSessionContextModel.session_id.like(
+                        WorkAgentSessionModel.session_id.concat("::target::%")
+                    ),
+                )
+            )
+            .exists()
+        )
+        artifact_filter = or_(
+            ArtifactModel.work_id == work_id,
+            ArtifactModel.session_id.in_(session_ids_sq),
+            ArtifactModel.request_id.in_(request_ids_sq),
+        )
         with session_scope(self.Session) as session:
-            row = session.get(WorkModel, work_id)
-            if row is None:
+            if session.get(WorkModel, work_id) is None:
                 raise KeyError(f"Work not found: {work_id}")
-            session.delete(row)
+            session_ids = list(session.scalars(session_ids_sq.order_by(WorkAgentSessionModel.id)))
+            artifact_ids = list(session.scalars(select(ArtifactModel.id).where(artifact_filter)))
+            # Children before parents: later statements still resolve their
+            # subqueries through work_agent_sessions, which goes last.
+            for stmt in (
+                delete(TaskEventModel).where(
+                    or_(
+                        TaskEventModel.session_id.in_(session_ids_sq),
+                        TaskEventModel.task_id.in_(task_ids_sq),
+                    )
+                ),
+                delete(TemporaryAgentModel).where(
+                    TemporaryAgentModel.parent_task_id.in_(task_ids_sq)
+                ),
+                delete(ToolInvocationModel).where(
+                    ToolInvocationModel.session_id.in_(session_ids_sq)
+                ),
+                delete(ArtifactModel).where(artifact_filter),
+                delete(ChatMessageModel).where(ChatMessageModel.session_id.in_(session_ids_sq)),
+                delete(AgentSessionContextModel).where(context_match),
+                delete(TaskModel).where(TaskModel.id.in_(task_ids_sq)),
+                delete(RequestModel).where(RequestModel.id.in_(request_ids_sq)),
+                delete(ChatSessionModel).where(ChatSessionModel.id.in_(session_ids_sq)),
+                delete(WorkNotificationModel).where(WorkNotificationModel.work_id == work_id),
+                delete(ClassicActiveWorkModel).where(ClassicActiveWorkModel.work_id == work_id),
+                delete(WorkAgentSessionModel).where(WorkAgentSessionModel.work_id == work_id),
+                delete(WorkModel).where(WorkModel.id == work_id),
+            ):
+                session.execute(stmt)
             session.commit()
+        return session_ids, artifact_ids
 
 
 class WorkAgentSessionRepository:
@@ -1729,6 +2277,7 @@ class ChanakyaStore:
         self.tasks = TaskRepository(session_factory)
         self.events = EventRepository(session_factory)
         self.memories = MemoryRepository(session_factory)
+        self.memory_jobs = MemoryJobRepository(session_factory)
         self.session_contexts = AgentSessionContextRepository(session_factory)
         self.notification_settings = NotificationSettingsRepository(session_factory)
         self.tools = ToolInvocationRepository(session_factory)
@@ -1763,83 +2312,10 @@ class ChanakyaStore:
         Returns a tuple of (session_ids, artifact_ids) for the caller to clean
         up in-memory runtime state and artifact files on disk.
         """
-        self.get_work(work_id)
-        session_ids = self.work_agent_sessions.list_session_ids_for_work(work_id)
-        request_ids: list[str] = []
-        task_ids: list[str] = []
-        artifact_ids: list[str] = []
-        with session_scope(self.Session) as session:
-            if session_ids:
-                request_ids = list(
-                    session.scalars(
-                        select(RequestModel.id).where(RequestModel.session_id.in_(session_ids))
-                    ).all()
-                )
-                if request_ids:
-                    task_ids = list(
-                        session.scalars(
-                            select(TaskModel.id).where(TaskModel.request_id.in_(request_ids))
-                        ).all()
-                    )
-                session_artifact_ids = list(
-                    session.scalars(
-                        select(ArtifactModel.id).where(ArtifactModel.session_id.in_(session_ids))
-                    ).all()
-                )
-                artifact_ids.extend(session_artifact_ids)
-                if task_ids:
-                    session.execute(
-                        delete(TaskEventModel).where(TaskEventModel.task_id.in_(task_ids))
-                    )
-                    session.execute(
-                        delete(TemporaryAgentModel).where(
-                            TemporaryAgentModel.parent_task_id.in_(task_ids)
-                        )
-                    )
-                session.execute(
-                    delete(TaskEventModel).where(TaskEventModel.session_id.in_(session_ids))
-                )
-                session.execute(
-                    delete(ChatMessageModel).where(ChatMessageModel.session_id.in_(session_ids))
-                )
-                session.execute(
-                    delete(ArtifactModel).where(ArtifactModel.session_id.in_(session_ids))
-                )
-                session.execute(
-                    delete(ToolInvocationModel).where(
-                        ToolInvocationModel.session_id.in_(session_ids)
-                    )
-                )
-                if task_ids:
-                    session.execute(delete(TaskModel).where(TaskModel.id.in_(task_ids)))
-                if request_ids:
-                    session.execute(delete(RequestModel).where(RequestModel.id.in_(request_ids)))
-                    session.execute(
-                        delete(ArtifactModel).where(ArtifactModel.request_id.in_(request_ids))
-                    )
-                session.execute(
-                    delete(ChatSessionModel).where(ChatSessionModel.id.in_(session_ids))
-                )
-            work_artifact_ids = list(
-                session.scalars(
-                    select(ArtifactModel.id).where(ArtifactModel.work_id == work_id)
-                ).all()
-            )
-            artifact_ids.extend(work_artifact_ids)
-            session.execute(delete(ArtifactModel).where(ArtifactModel.work_id == work_id))
-            session.execute(
-                delete(WorkAgentSessionModel).where(WorkAgentSessionModel.work_id == work_id)
-            )
-            session.execute(
-                delete(WorkNotificationModel).where(WorkNotificationModel.work_id == work_id)
-            )
-            session.execute(
-                delete(ClassicActiveWorkModel).where(ClassicActiveWorkModel.work_id == work_id)
-            )
-            session.execute(delete(WorkModel).where(WorkModel.id == work_id))
-            session.commit()
-        for session_id in session_ids:
-            self.session_contexts.delete(session_id)
+        # Queued telemetry for these sessions must land before it is deleted.
+        self.events.writes.flush()
+        session_ids, artifact_ids = self.works.delete_work(work_id)
+        invalidate_history(self.Session, session_ids)
         return session_ids, artifact_ids
 
     def get_agent_session_context(
@@ -1943,12 +2419,10 @@ class ChanakyaStore:
         )
 
     def find_waiting_input_task(self, session_id: str) -> dict[str, Any] | None:
-        tasks = self.list_tasks(session_id=session_id, limit=200)
         waiting_tasks = [
             task
-            for task in tasks
-            if task.get("status") == "waiting_input"
-            and (task.get("input") or {}).get("maf_pending_request_id")
+            for task in self.tasks.list_waiting_input(self._expand_session_ids(session_id))
+            if (task.get("input") or {}).get("maf_pending_request_id")
         ]
         if len(waiting_tasks) != 1:
             return None
@@ -1986,8 +2460,18 @@ class ChanakyaStore:
             metadata_update=metadata_update,
         )
 
-    def list_messages(self, session_id: str) -> list[dict[str, Any]]:
-        return self.chat.list_messages(session_id)
+    def list_messages(
+        self,
+        session_id: str,
+        *,
+        after_id: int | None = None,
+        before_id: int | None = None,
+        limit: int | None = None,
+        omit: Collection[str] = (),
+    ) -> list[dict[str, Any]]:
+        return self.chat.list_messages(
+            session_id, after_id=after_id, before_id=before_id, limit=limit, omit=omit
+        )
 
     def get_latest_assistant_request_id(self, session_id: str) -> str | None:
         return self.chat.get_latest_assistant_request_id(session_id)
@@ -2019,8 +2503,15 @@ class ChanakyaStore:
     def log_event(self, event_type: str, payload: dict[str, Any]) -> None:
         self.events.log_event(event_type, payload)
 
-    def list_events(self, limit: int = 50) -> list[dict[str, Any]]:
-        return self.events.list_events(limit)
+    def list_events(
+        self,
+        limit: int = 50,
+        *,
+        after_id: int | None = None,
+        before_id: int | None = None,
+        omit: Collection[str] = (),
+    ) -> list[dict[str, Any]]:
+        return self.events.list_events(limit, after_id=after_id, before_id=before_id, omit=omit)
 
     def list_messages_for_request(self, request_id: str) -> list[dict[str, Any]]:
         return self.chat.list_messages_for_request(request_id)
@@ -2041,12 +2532,48 @@ class ChanakyaStore:
         status: str | None = "active",
         session_id: str | None = None,
         limit: int = 100,
+        types: Collection[str] | None = None,
     ) -> list[dict[str, Any]]:
         return self.memories.list_memories(
             owner_id=owner_id,
             status=status,
             session_id=session_id,
             limit=limit,
+            types=types,
+        )
+
+    def search_memories(
+        self,
+        *,
+        owner_id: str,
+        tokens: Iterable[str],
+        status: str | None = "active",
+        session_id: str | None = None,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        return self.memories.search_memories(
+            owner_id=owner_id,
+            tokens=tokens,
+            status=status,
+            session_id=session_id,
+            limit=limit,
+        )
+
+    def semantic_search_memories(
+        self,
+        *,
+        owner_id: str,
+        query: str,
+        session_id: str | None = None,
+        limit: int = 20,
+        min_similarity: float = 0.0,
+    ) -> list[dict[str, Any]]:
+        return self.memories.semantic_search_memories(
+            owner_id=owner_id,
+            query=query,
+            session_id=session_id,
+            limit=limit,
+            min_similarity=min_similarity,
         )
 
     def create_memory_event(
@@ -2083,6 +2610,31 @@ class ChanakyaStore:
             limit=limit,
         )
 
+    def enqueue_memory_job(
+        self, *, session_id: str, request_id: str, priority: int = 0
+    ) -> dict[str, Any]:
+        return self.memory_jobs.enqueue(
+            session_id=session_id, request_id=request_id, priority=priority
+        )
+
+    def claim_memory_job(self) -> dict[str, Any] | None:
+        return self.memory_jobs.claim_next()
+
+    def finish_memory_job(self, job_id: int, *, error: str | None = None) -> None:
+        self.memory_jobs.finish(job_id, error=error)
+
+    def recover_memory_jobs(self) -> int:
+        return self.memory_jobs.recover_unfinished()
+
+    def has_pending_memory_jobs(self) -> bool:
+        return self.memory_jobs.has_pending()
+
+    def memory_job_metrics(self) -> dict[str, Any]:
+        return self.memory_jobs.metrics()
+
+    def write_behind_metrics(self) -> dict[str, Any]:
+        return self.events.writes.metrics()
+
     def get_notification_settings(self, channel_type: str) -> NotificationSettingsModel | None:
         return self.notification_settings.get_settings(channel_type)
 
@@ -2130,6 +2682,9 @@ class ChanakyaStore:
         request_id: str | None = None,
         task_id: str | None = None,
         limit: int = 100,
+        after_id: int | None = None,
+        before_id: int | None = None,
+        omit: Collection[str] = (),
     ) -> list[dict[str, Any]]:
         session_ids = self._expand_session_ids(session_id)
         if len(session_ids) <= 1:
@@ -2138,6 +2693,9 @@ class ChanakyaStore:
                 request_id=request_id,
                 task_id=task_id,
                 limit=limit,
+                after_id=after_id,
+                before_id=before_id,
+                omit=omit,
             )
         merged: list[dict[str, Any]] = []
         seen: set[int] = set()
@@ -2147,6 +2705,9 @@ class ChanakyaStore:
                 request_id=request_id,
                 task_id=task_id,
                 limit=limit,
+                after_id=after_id,
+                before_id=before_id,
+                omit=omit,
             ):
                 event_id = int(event["id"])
                 if event_id in seen:
@@ -2154,6 +2715,8 @@ class ChanakyaStore:
                 seen.add(event_id)
                 merged.append(event)
         merged.sort(key=lambda item: (str(item.get("created_at") or ""), int(item.get("id") or 0)))
+        if after_id is not None and before_id is None:
+            return merged[:limit]
         return merged[-limit:]
 
     def create_request(self, **kwargs: Any) -> None:
@@ -2199,6 +2762,7 @@ class ChanakyaStore:
         request_id: str | None = None,
         root_only: bool = False,
         limit: int = 100,
+        omit: Collection[str] = (),
     ) -> list[dict[str, Any]]:
         session_ids = self._expand_session_ids(session_id)
         if len(session_ids) <= 1:
@@ -2207,6 +2771,7 @@ class ChanakyaStore:
                 request_id=request_id,
                 root_only=root_only,
                 limit=limit,
+                omit=omit,
             )
         merged: list[dict[str, Any]] = []
         seen: set[str] = set()
@@ -2216,6 +2781,7 @@ class ChanakyaStore:
                 request_id=request_id,
                 root_only=root_only,
                 limit=limit,
+                omit=omit,
             ):
                 task_id = str(task["id"])
                 if task_id in seen:
@@ -2252,6 +2818,7 @@ class ChanakyaStore:
         session_id: str | None = None,
         request_id: str | None = None,
         limit: int = 100,
+        omit: Collection[str] = (),
     ) -> list[dict[str, Any]]:
         session_ids = self._expand_session_ids(session_id)
         if len(session_ids) <= 1:
@@ -2259,6 +2826,7 @@ class ChanakyaStore:
                 session_id=session_id,
                 request_id=request_id,
                 limit=limit,
+                omit=omit,
             )
         merged: list[dict[str, Any]] = []
         seen: set[str] = set()
@@ -2267,6 +2835,7 @@ class ChanakyaStore:
                 session_id=item_session_id,
                 request_id=request_id,
                 limit=limit,
+                omit=omit,
             ):
                 invocation_id = str(trace["invocation_id"])
                 if invocation_id in seen:
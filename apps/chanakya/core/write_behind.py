@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import atexit
+import threading
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from chanakya.config import env_flag
+from chanakya.db import session_scope
+from chanakya.debug import debug_log
+
+WRITE_BEHIND_MAX_BATCH = 256
+WRITE_BEHIND_FLUSH_INTERVAL_SECONDS = 0.05
+WRITE_BEHIND_IDLE_EXIT_SECONDS = 5.0
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    model: type[Any] | None
+    values: dict[str, Any] | None = None
+    apply: Callable[[Session], None] | None = None
+
+
+class WriteBehindQueue:
+    """Append-only telemetry writes committed in batches by one writer thread.
+
+    Rows are handed over as plain column values and written in enqueue order, so
+    a chat turn's events land in a handful of transactions instead of one commit
+    (and fsync) each. Readers call ``flush`` first to keep read-your-writes.
+    The writer thread is started on demand and exits after sitting idle, so an
+    unused queue holds no thread.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session],
+        *,
+        threaded: bool = True,
+        max_batch: int = WRITE_BEHIND_MAX_BATCH,
+        flush_interval_seconds: float = WRITE_BEHIND_FLUSH_INTERVAL_SECONDS,
+        idle_exit_seconds: float = WRITE_BEHIND_IDLE_EXIT_SECONDS,
+    ) -> None:
+        self.Session = session_factory
+        self.threaded = threaded
+        self.max_batch = max_batch
+        self.flush_interval_seconds = flush_interval_seconds
+        self.idle_exit_seconds = idle_exit_seconds
+        self._pending: list[_PendingWrite] = []
+        self._condition = threading.Condition()
+        self._enqueued = 0
+        self._written = 0
+        self._failed_batches = 0
+        self._dropped = 0
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._flush_lock = threading.Lock()
+
+    def add(self, model: type[Any], values: dict[str, Any]) -> None:
+        self._enqueue(_PendingWrite(model=model, values=values))
+
+    def apply(self, operation: Callable[[Session], None]) -> None:
+        self._enqueue(_PendingWrite(model=None, apply=operation))
+
+    def _enqueue(self, item: _PendingWrite) -> None:
+        if not self.threaded or self._closed:
+            with self._flush_lock:
+                self._write_batch([item])
+            return
+        with self._condition:
+            self._pending.append(item)
+            self._enqueued += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="chanakya-write-behind", daemon=True
+                )
+                self._thread.start()
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Block until everything enqueued before this call is committed."""
+        with self._condition:
+            target = self._enqueued
+        while True:
+            with self._condition:
+                if self._written >= target:
+                    return
+            self._commit_next()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        while self._commit_next():
+            pass
+
+    def metrics(self) -> dict[str, Any]:
+        with self._condition:
+            return {
+                "threaded": self.threaded,
+                "writer_running": self._thread is not None,
+                "pending": len(self._pending),
+                "enqueued": self._enqueued,
+                "written": self._written,
+                "failed_batches": self._failed_batches,
+                "dropped": self._dropped,
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._pending and not self._closed:
+                    self._condition.wait(self.idle_exit_seconds)
+                if self._closed or not self._pending:
+                    self._thread = None
+                    return
+                if len(self._pending) < self.max_batch:
+                    # Give a burst a moment to accumulate into one transaction.
+                    self._condition.wait(self.flush_interval_seconds)
+            self._commit_next()
+
+    def _commit_next(self) -> bool:
+        # Popping under the flush lock keeps batches committed in enqueue order
+        # whether the writer thread or a flushing caller gets there first.
+        with self._flush_lock:
+            with self._condition:
+                batch = self._pending[: self.max_batch]
+                del self._pending[: len(batch)]
+            if not batch:
+                return False
+            try:
+                self._write_batch(batch)
+            except Exception as exc:
+                with self._condition:
+                    self._failed_batches += 1
+                debug_log("write_behind_batch_failed", {"rows": len(batch), "error": str(exc)})
+                # Retry individually so one bad row does not discard the whole batch.
+                for item in batch:
+                    try:
+                        self._write_batch([item])
+                    except Exception as row_exc:
+                        with self._condition:
+                            self._dropped += 1
+                        debug_log(
+                            "write_behind_row_dropped",
+                            {
+                                "model": getattr(item.model, "__name__", "update"),
+                                "error": str(row_exc),
+                            },
+                        )
+            with self._condition:
+                self._written += len(batch)
+                self._condition.notify_all()
+            return True
+
+    def _write_batch(self, batch: list[_PendingWrite]) -> None:
+        with session_scope(self.Session) as session:
+            index = 0
+            while index < len(batch):
+                item = batch[index]
+                if item.apply is not None:
+                    item.apply(session)
+                    index += 1
+                    continue
+                # Consecutive rows for the same table go out as one executemany.
+                rows = [item.values or {}]
+                index += 1
+                while (
+                    index < len(batch)
+                    and batch[index].model is item.model
+                    and batch[index].apply is None
+                ):
+                    rows.append(batch[index].values or {})
+                    index += 1
+                session.execute(insert(item.model), rows)
+            session.commit()
+
+
+# Held weakly: a queue (and with it the engine key) is released once no store
+# refers to it and its writer thread has exited.
+_QUEUES: weakref.WeakValueDictionary[Engine, WriteBehindQueue] = weakref.WeakValueDictionary()
+_QUEUES_LOCK = threading.Lock()
+
+
+def get_write_behind_queue(session_factory: sessionmaker[Session]) -> WriteBehindQueue:
+    """Return the queue shared by every live store bound to the same engine."""
+    engine = session_factory.kw.get("bind")
+    if not isinstance(engine, Engine):
+        return WriteBehindQueue(session_factory, threaded=False)
+    with _QUEUES_LOCK:
+        queue = _QUEUES.get(engine)
+        if queue is None:
+            # StaticPool hands every thread the same DBAPI connection, so a writer
+            # thread would interleave with the caller's transactions.
+            threaded = env_flag("CHANAKYA_WRITE_BEHIND_ENABLED", default=True) and not isinstance(
+                engine.pool, StaticPool
+            )
+            queue = WriteBehindQueue(session_factory, threaded=threaded)
+            _QUEUES[engine] = queue
+        return queue
+
+
+@atexit.register
+def close_write_behind_queues() -> None:
+    with _QUEUES_LOCK:
+        queues = list(_QUEUES.values())
+    for queue in queues:
+        queue.close()
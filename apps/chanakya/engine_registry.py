@@ -0,0 +1 @@
+from chanakya.core.engine_registry import *  # noqa: F401,F403
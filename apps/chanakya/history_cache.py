@@ -0,0 +1 @@
+from chanakya.core.history_cache import *  # noqa: F401,F403
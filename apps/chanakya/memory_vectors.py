@@ -0,0 +1 @@
+from chanakya.core.memory_vectors import *  # noqa: F401,F403
@@ -0,0 +1 @@
+from chanakya.core.migrations import *  # noqa: F401,F403
@@ -0,0 +1 @@
+from chanakya.core.profile_cache import *  # noqa: F401,F403
@@ -0,0 +1 @@
+from chanakya.core.query_plan import *  # noqa: F401,F403
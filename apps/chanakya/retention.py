@@ -0,0 +1 @@
+from chanakya.core.retention import *  # noqa: F401,F403
@@ -0,0 +1 @@
+from chanakya.core.search_index import *  # noqa: F401,F403
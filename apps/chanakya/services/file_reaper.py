@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import shutil
+import threading
+from collections import deque
+from collections.abc import Iterable
+from pathlib import Path
+
+from chanakya.debug import debug_log
+
+
+class FileReaper:
+    """Removes directory trees on a background thread.
+
+    Deleting a work only drops its rows; the artifact directories left behind are
+    handed to ``schedule`` so the request returns without walking the disk. A
+    single worker is started on demand and exits once the queue is empty.
+    """
+
+    def __init__(self, *, threaded: bool = True) -> None:
+        self.threaded = threaded
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending: deque[Path] = deque()
+        self._running = False
+        self.reaped = 0
+        self.failed = 0
+
+    def schedule(self, paths: Iterable[Path]) -> int:
+        with self._lock:
+            before = len(self._pending)
+            self._pending.extend(paths)
+            added = len(self._pending) - before
+            if not added or self._running:
+                return added
+            self._running = True
+        if self.threaded:
+            threading.Thread(target=self._work, name="file-reaper", daemon=True).start()
+        else:
+            self._work()
+        return added
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Block until the queue is drained; returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._running, timeout=timeout)
+
+    def _work(self) -> None:
+        while True:
+            with self._idle:
+                if not self._pending:
+                    self._running = False
+                    self._idle.notify_all()
+                    return
+                path = self._pending.popleft()
+            self._remove(path)
+
+    def _remove(self, path: Path) -> None:
+        try:
+            if path.is_dir():
+                shutil.rmtree(path)
+            elif path.exists():
+                path.unlink()
+        except OSError as exc:
+            self.failed += 1
+            debug_log("file_reaper_failed", {"path": str(path), "error": str(exc)})
+            return
+        self.reaped += 1
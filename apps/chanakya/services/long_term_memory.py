@@ -8,11 +8,15 @@ from chanakya.config import (
     get_long_term_memory_default_owner_id,
     get_long_term_memory_max_injected_chars,
     get_long_term_memory_max_injected_items,
+    get_memory_embedding_min_similarity,
 )
+from chanakya.debug import debug_log
+from chanakya.domain import STANDING_MEMORY_TYPES
 from chanakya.services.memory_manager_service import run_memory_manager_update_job
 from chanakya.store import ChanakyaStore
 
 _TOKEN_PATTERN = re.compile(r"[a-zA-Z0-9_]{3,}")
+_SEARCH_CANDIDATES = 50
 
 
 class LongTermMemoryService:
@@ -24,11 +28,8 @@ class LongTermMemoryService:
     def build_prompt_addendum(self, *, session_id: str, query: str) -> str | None:
         lowered_query = str(query or "").strip().lower()
         query_tokens = self._tokenize(query)
-        active = self.store.list_memories(
-            owner_id=self.owner_id,
-            status="active",
-            session_id=session_id,
-            limit=100,
+        active = self._candidate_memories(
+            session_id=session_id, query=query, query_tokens=query_tokens
         )
         if not active:
             return None
@@ -44,8 +45,7 @@ class LongTermMemoryService:
             scored = [
                 (self._fallback_memory_score(item, lowered_query), item)
                 for item in active
-                if str(item.get("type") or "").lower()
-                in {"preference", "instruction", "profile", "identity", "attribute"}
+                if str(item.get("type") or "").lower() in STANDING_MEMORY_TYPES
             ]
 
         scored.sort(key=lambda pair: pair[0], reverse=True)
@@ -78,6 +78,52 @@ class LongTermMemoryService:
         )
         return "Relevant long-term memory:\n" + "\n".join(f"- {line}" for line in lines)
 
+    def _candidate_memories(
+        self, *, session_id: str, query: str, query_tokens: set[str]
+    ) -> list[dict[str, Any]]:
+        if not query_tokens:
+            lexical = self.store.list_memories(
+                owner_id=self.owner_id,
+                status="active",
+                session_id=session_id,
+                limit=100,
+            )
+        else:
+            lexical = [
+                *self.store.search_memories(
+                    owner_id=self.owner_id,
+                    tokens=query_tokens,
+                    status="active",
+                    session_id=session_id,
+                    limit=_SEARCH_CANDIDATES,
+                ),
+                *self.store.list_memories(
+                    owner_id=self.owner_id,
+                    status="active",
+                    session_id=session_id,
+                    limit=_SEARCH_CANDIDATES,
+                    types=STANDING_MEMORY_TYPES,
+                ),
+            ]
+        try:
+            semantic = self.store.semantic_search_memories(
+                owner_id=self.owner_id,
+                query=query,
+                session_id=session_id,
+                limit=_SEARCH_CANDIDATES,
+                min_similarity=get_memory_embedding_min_similarity(),
+            )
+        except Exception as exc:
+            debug_log("memory_semantic_search_failed", {"error": str(exc)})
+            semantic = []
+        candidates: dict[str, dict[str, Any]] = {}
+        for item in [*lexical, *semantic]:
+            candidates.setdefault(str(item.get("id") or ""), {}).update(item)
+        # Newest first, as list_memories orders them, so score ties resolve the same way.
+        return sorted(
+            candidates.values(), key=lambda item: str(item.get("updated_at") or ""), reverse=True
+        )
+
     @staticmethod
     def _memory_score(item: dict[str, Any], query_tokens: set[str], lowered_query: str) -> float:
         if str(item.get("status") or "") != "active":
@@ -86,15 +132,24 @@ class LongTermMemoryService:
             f"{str(item.get('subject') or '')} {str(item.get('content') or '')}"
         )
         overlap = len(query_tokens.intersection(item_tokens)) if query_tokens else 0
+        # Cosine similarity from the optional embedding index catches paraphrases.
+        semantic = float(item.get("semantic_score") or 0.0)
         if overlap <= 0 and query_tokens:
             overlap = LongTermMemoryService._soft_query_affinity(item, lowered_query)
-            if overlap <= 0:
+            if overlap <= 0 and semantic <= 0:
                 return 0.0
         importance = float(item.get("importance") or 0)
         confidence = float(item.get("confidence") or 0)
         type_weight = LongTermMemoryService._memory_type_weight(item, lowered_query)
         recency_weight = LongTermMemoryService._recency_weight(str(item.get("updated_at") or ""))
-        return overlap * 3.0 + importance * 0.5 + confidence * 0.25 + type_weight + recency_weight
+        return (
+            overlap * 3.0
+            + semantic * 3.0
+            + importance * 0.5
+            + confidence * 0.25
+            + type_weight
+            + recency_weight
+        )
 
     @staticmethod
     def _fallback_memory_score(item: dict[str, Any], lowered_query: str) -> float:
@@ -172,5 +227,13 @@ class LongTermMemoryService:
         return 0.0
 
 
-def run_memory_update_job(store: ChanakyaStore, *, session_id: str, request_id: str) -> None:
-    run_memory_manager_update_job(store, session_id=session_id, request_id=request_id)
+def run_memory_update_job(
+    store: ChanakyaStore,
+    *,
+    session_id: str,
+    request_id: str,
+    request_ids: list[str] | None = None,
+) -> None:
+    run_memory_manager_update_job(
+        store, session_id=session_id, request_id=request_id, request_ids=request_ids
+    )
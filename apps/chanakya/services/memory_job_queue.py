@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlalchemy.pool import StaticPool
+
+from chanakya.config import get_memory_job_default_priority, get_memory_job_workers
+from chanakya.debug import debug_log
+from chanakya.services.long_term_memory import run_memory_update_job
+from chanakya.store import ChanakyaStore
+
+MemoryJobRunner = Callable[..., None]
+
+
+class MemoryJobQueue:
+    """Runs queued long-term memory updates on a small pool of worker threads.
+
+    Jobs live in the ``memory_jobs`` table, so turns queued before a restart are
+    picked up again by ``start``. Workers are spawned on demand and exit once
+    nothing is claimable, so an idle service holds no threads. On a StaticPool
+    engine every thread shares one connection, so ``enqueue`` and ``start`` drain
+    the queue on the caller's thread instead of a worker.
+    """
+
+    def __init__(
+        self,
+        store: ChanakyaStore,
+        *,
+        workers: int | None = None,
+        run_job: MemoryJobRunner = run_memory_update_job,
+        threaded: bool | None = None,
+    ) -> None:
+        self.store = store
+        self.max_workers = workers if workers is not None else get_memory_job_workers()
+        self.run_job = run_job
+        if threaded is None:
+            engine = store.Session.kw.get("bind")
+            threaded = not (isinstance(engine, Engine) and isinstance(engine.pool, StaticPool))
+        self.threaded = threaded
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._active = 0
+        self._signal = 0
+        self._closed = False
+
+    def start(self) -> int:
+        """Requeue jobs a previous process left running and resume pending work."""
+        recovered = self.store.recover_memory_jobs()
+        if recovered:
+            debug_log("memory_jobs_recovered", {"count": recovered})
+        if self.store.has_pending_memory_jobs():
+            self._wake()
+        return recovered
+
+    def enqueue(
+        self, *, session_id: str, request_id: str, priority: int | None = None
+    ) -> dict[str, Any]:
+        job = self.store.enqueue_memory_job(
+            session_id=session_id,
+            request_id=request_id,
+            priority=get_memory_job_default_priority() if priority is None else priority,
+        )
+        self._wake()
+        return job
+
+    def metrics(self) -> dict[str, Any]:
+        metrics = self.store.memory_job_metrics()
+        with self._lock:
+            metrics["workers_active"] = self._active
+        metrics["workers_max"] = self.max_workers
+        return metrics
+
+    def run_pending(self) -> int:
+        """Run claimable jobs on the calling thread until none is left."""
+        ran = 0
+        while (job := self.store.claim_memory_job()) is not None:
+            self._run(job)
+            ran += 1
+        return ran
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Block until no worker is running; returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._active == 0, timeout=timeout)
+
+    def close(self) -> None:
+        """Stop claiming new jobs; in-flight jobs finish, the rest stay pending."""
+        with self._lock:
+            self._closed = True
+
+    def _wake(self) -> None:
+        with self._lock:
+            self._signal += 1
+            limit = self.max_workers if self.threaded else 1
+            if self._closed or self._active >= limit:
+                return
+            self._active += 1
+        if not self.threaded:
+            # A job enqueued while this drain runs only bumps the signal; the
+            # loop picks it up before returning.
+            self._work()
+            return
+        threading.Thread(target=self._work, name="memory-update", daemon=True).start()
+
+    def _work(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if self._closed:
+                        return
+                    seen = self._signal
+                job = self.store.claim_memory_job()
+                if job is None:
+                    with self._lock:
+                        # An enqueue raced the empty claim; look again before exiting.
+                        if self._signal == seen or self._closed:
+                            return
+                    continue
+                self._run(job)
+        except Exception as exc:
+            debug_log("memory_job_worker_failed", {"error": str(exc)})
+        finally:
+            with self._idle:
+                self._active -= 1
+                self._idle.notify_all()
+
+    def _run(self, job: dict[str, Any]) -> None:
+        request_ids = list(job["request_ids"])
+        error: str | None = None
+        try:
+            self.run_job(
+                store=self.store,
+                session_id=job["session_id"],
+                request_id=request_ids[-1],
+                request_ids=request_ids,
+            )
+        except Exception as exc:
+            error = str(exc) or exc.__class__.__name__
+            debug_log(
+                "memory_job_failed",
+                {"job_id": job["id"], "session_id": job["session_id"], "error": error},
+            )
+        self.store.finish_memory_job(job["id"], error=error)
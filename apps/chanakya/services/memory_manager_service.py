@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from time import perf_counter
 from typing import Any
@@ -9,9 +9,13 @@ from typing import Any
 from agent_framework import Message
 
 from chanakya.agent.runtime import MAFRuntime, build_profile_agent, create_openai_chat_client
-from chanakya.config import get_long_term_memory_default_owner_id
+from chanakya.config import (
+    get_long_term_memory_default_owner_id,
+    get_memory_manager_prompt_candidates,
+)
 from chanakya.debug import debug_log
-from chanakya.domain import make_id, now_iso
+from chanakya.domain import STANDING_MEMORY_TYPES, make_id, now_iso
+from chanakya.history_cache import tokenize_for_relevance
 from chanakya.model import AgentProfileModel
 from chanakya.services.async_loop import run_in_maf_loop
 from chanakya.store import ChanakyaStore
@@ -33,6 +37,18 @@ _MEMORY_MANAGER_SYSTEM_PROMPT = (
     "If the request cannot be processed, return status='failed' with exact error_detail and retryable true or false."
 )
 
+# Memory fields the manager reasons about; the rest is bookkeeping.
+_PROMPT_MEMORY_FIELDS = ("id", "scope", "type", "subject", "content", "importance")
+
+
+def _compact_json(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+def _estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English-heavy JSON; only used for reporting.
+    return (len(text) + 3) // 4
+
 
 @dataclass(slots=True)
 class MemoryManagerResult:
@@ -44,6 +60,75 @@ class MemoryManagerResult:
     error_code: str | None
     error_detail: str | None
     operations: list[dict[str, Any]]
+    prompt_stats: dict[str, Any] = field(default_factory=dict)
+
+
+class _ActiveMemoryIndex:
+    """Active memories keyed by normalized (type, subject[, content]) for one job.
+
+    Built from the memories already loaded for the prompt and kept in step with the
+    job's own writes, so duplicate resolution is a dict lookup instead of a re-list
+    and scan per operation. Among equal keys the most recently updated record wins,
+    matching the updated_at-descending order of ``list_memories``.
+    """
+
+    __slots__ = ("_by_content", "_by_subject", "_keys")
+
+    def __init__(self, memories: list[dict[str, Any]]) -> None:
+        self._by_content: dict[tuple[str, str, str], dict[str, dict[str, Any]]] = {}
+        self._by_subject: dict[tuple[str, str], dict[str, dict[str, Any]]] = {}
+        self._keys: dict[str, tuple[tuple[str, str, str], tuple[str, str]]] = {}
+        for item in reversed(memories):
+            self.put(item)
+
+    @staticmethod
+    def _subject_key(memory_type: str, subject: str) -> tuple[str, str]:
+        normalize = MemoryManagerService._normalize_text
+        return normalize(memory_type), normalize(subject)
+
+    def put(self, record: dict[str, Any]) -> None:
+        memory_id = str(record.get("id") or "")
+        if not memory_id:
+            return
+        self.remove(memory_id)
+        if str(record.get("status") or "") != "active":
+            return
+        subject_key = self._subject_key(
+            str(record.get("type") or ""), str(record.get("subject") or "")
+        )
+        content_key = (
+            *subject_key,
+            MemoryManagerService._normalize_text(str(record.get("content") or "")),
+        )
+        self._by_content.setdefault(content_key, {})[memory_id] = record
+        self._by_subject.setdefault(subject_key, {})[memory_id] = record
+        self._keys[memory_id] = (content_key, subject_key)
+
+    def remove(self, memory_id: str) -> None:
+        keys = self._keys.pop(memory_id, None)
+        if keys is None:
+            return
+        content_key, subject_key = keys
+        content_bucket = self._by_content[content_key]
+        content_bucket.pop(memory_id, None)
+        if not content_bucket:
+            del self._by_content[content_key]
+        subject_bucket = self._by_subject[subject_key]
+        subject_bucket.pop(memory_id, None)
+        if not subject_bucket:
+            del self._by_subject[subject_key]
+
+    def find_exact(self, *, subject: str, memory_type: str, content: str) -> dict[str, Any] | None:
+        key = (
+            *self._subject_key(memory_type, subject),
+            MemoryManagerService._normalize_text(content),
+        )
+        bucket = self._by_content.get(key)
+        return next(reversed(bucket.values())) if bucket else None
+
+    def find_by_subject(self, *, subject: str, memory_type: str) -> dict[str, Any] | None:
+        bucket = self._by_subject.get(self._subject_key(memory_type, subject))
+        return next(reversed(bucket.values())) if bucket else None
 
 
 class MemoryManagerService:
@@ -53,26 +138,63 @@ class MemoryManagerService:
         self.owner_id = configured_owner or "default_user"
         self._repo_root = Path(__file__).resolve().parents[3]
 
-    def process_request_turn(self, *, session_id: str, request_id: str) -> MemoryManagerResult:
-        messages = self.store.list_messages_for_request(request_id)
+    def process_request_turn(
+        self,
+        *,
+        session_id: str,
+        request_id: str,
+        request_ids: list[str] | None = None,
+    ) -> MemoryManagerResult:
+        """Update memory from one turn, or from several coalesced turns (oldest first).
+
+        ``request_id`` is the turn the result is recorded against; ``request_ids``
+        lists every turn whose messages should be considered.
+        """
+        turn_ids = list(request_ids or [request_id])
+        messages: list[dict[str, Any]] = []
+        for turn_id in turn_ids:
+            messages.extend(self.store.list_messages_for_request(turn_id))
         active_memories = self.store.list_memories(
             owner_id=self.owner_id,
             status="active",
             session_id=session_id,
             limit=200,
         )
-        prompt = self._build_background_prompt(
+        candidates = self._select_prompt_candidates(
+            active_memories,
+            messages,
+            limit=get_memory_manager_prompt_candidates(),
+        )
+        payload = self._build_background_payload(
             session_id=session_id,
             request_id=request_id,
             messages=messages,
-            active_memories=active_memories,
+            active_memories=candidates,
+            turn_count=len(turn_ids),
         )
+        prompt = _compact_json(payload)
+        started_clock = perf_counter()
         result = self._run_memory_manager(prompt_text=prompt, session_id=session_id)
+        prompt_tokens = _estimate_tokens(prompt)
+        # The same turn as it used to be sent: every active memory, pretty-printed.
+        baseline_tokens = _estimate_tokens(
+            json.dumps({**payload, "active_memories": active_memories}, indent=2, ensure_ascii=True)
+        )
+        result.prompt_stats = {
+            "active_memory_count": len(active_memories),
+            "candidate_count": len(candidates),
+            "prompt_chars": len(prompt),
+            "prompt_tokens_estimate": prompt_tokens,
+            "baseline_prompt_tokens_estimate": baseline_tokens,
+            "prompt_tokens_saved_estimate": max(baseline_tokens - prompt_tokens, 0),
+            "llm_duration_ms": int(max((perf_counter() - started_clock) * 1000, 0.0)),
+        }
         self._apply_result(
             result,
             session_id=session_id,
             request_id=request_id,
             source_messages=messages,
+            active_memories=active_memories,
         )
         return result
 
@@ -115,6 +237,7 @@ class MemoryManagerService:
             session_id=effective_session_id,
             request_id=effective_request_id,
             source_messages=[],
+            active_memories=active_memories,
         )
         return {
             "status": result.status,
@@ -127,14 +250,50 @@ class MemoryManagerService:
             "operations": result.operations,
         }
 
-    def _build_background_prompt(
+    @staticmethod
+    def _select_prompt_candidates(
+        active_memories: list[dict[str, Any]],
+        messages: list[dict[str, Any]],
+        *,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Pick the memories a turn could plausibly touch, at most ``limit``.
+
+        Memories sharing words with the turn rank by overlap (subject words count
+        double); standing types such as identity and preferences fill any room
+        left. The full listing still backs duplicate resolution in _apply_result,
+        so a memory left out here is never duplicated, only not shown.
+        """
+        turn_tokens = tokenize_for_relevance(
+            " ".join(str(item.get("content") or "") for item in messages)
+        )
+        ranked: list[tuple[float, int, dict[str, Any]]] = []
+        for position, item in enumerate(active_memories):
+            subject_tokens = tokenize_for_relevance(str(item.get("subject") or ""))
+            content_tokens = tokenize_for_relevance(str(item.get("content") or ""))
+            overlap = len(turn_tokens & content_tokens) + 2 * len(turn_tokens & subject_tokens)
+            standing = str(item.get("type") or "").strip().lower() in STANDING_MEMORY_TYPES
+            if overlap <= 0 and not standing:
+                continue
+            score = overlap * 3.0 + (1.0 if standing else 0.0) + float(item.get("importance") or 0)
+            ranked.append((score, position, item))
+        ranked.sort(key=lambda entry: (-entry[0], entry[1]))
+        chosen = sorted(ranked[:limit], key=lambda entry: entry[1])
+        return [
+            {key: item.get(key) for key in _PROMPT_MEMORY_FIELDS} for _, _, item in chosen
+        ]
+
+    def _build_background_payload(
         self,
         *,
         session_id: str,
         request_id: str,
         messages: list[dict[str, Any]],
         active_memories: list[dict[str, Any]],
-    ) -> str:
+        turn_count: int = 1,
+    ) -> dict[str, Any]:
+        # Coalesced jobs cover several turns; widen the slice so none is dropped.
+        window = min(8 * max(turn_count, 1), 24)
         recent_messages = [
             {
                 "id": item.get("id"),
@@ -142,9 +301,9 @@ class MemoryManagerService:
                 "content": item.get("content"),
                 "created_at": item.get("created_at"),
             }
-            for item in messages[-8:]
+            for item in messages[-window:]
         ]
-        payload = {
+        return {
             "mode": "background_turn_update",
             "owner_id": self.owner_id,
             "session_id": session_id,
@@ -153,10 +312,10 @@ class MemoryManagerService:
             "recent_messages": recent_messages,
             "instruction": (
                 "Inspect the recent conversation slice and decide whether durable memory should be added, "
-                "updated, deleted, or left unchanged."
+                "updated, deleted, or left unchanged. active_memories lists only the existing "
+                "memories related to this conversation slice."
             ),
         }
-        return json.dumps(payload, indent=2, ensure_ascii=True)
 
     def _build_user_request_prompt(
         self,
@@ -183,7 +342,7 @@ class MemoryManagerService:
                 "Use recent_messages to resolve references like 'it', 'that', or 'my old name'."
             ),
         }
-        return json.dumps(payload, indent=2, ensure_ascii=True)
+        return _compact_json(payload)
 
     def _run_memory_manager(self, *, prompt_text: str, session_id: str) -> MemoryManagerResult:
         raw = self._run_memory_manager_text(prompt_text=prompt_text, session_id=session_id)
@@ -269,6 +428,7 @@ class MemoryManagerService:
         session_id: str | None,
         request_id: str | None,
         source_messages: list[dict[str, Any]],
+        active_memories: list[dict[str, Any]] | None = None,
     ) -> None:
         source_message_ids = [
             str(item.get("id") or "") for item in source_messages if item.get("id")
@@ -310,12 +470,21 @@ class MemoryManagerService:
             return
         changed_ids: list[str] = []
         applied_operations: list[dict[str, Any]] = []
+        if active_memories is None and result.operations:
+            active_memories = self.store.list_memories(
+                owner_id=self.owner_id,
+                status="active",
+                session_id=session_id,
+                limit=200,
+            )
+        index = _ActiveMemoryIndex(active_memories or [])
         for item in result.operations:
             op = str(item.get("op") or "noop")
             if op == "add":
                 if not item.get("subject") or not item.get("content"):
                     continue
                 record, event_type = self._apply_add_operation(
+                    index,
                     item=item,
                     session_id=session_id,
                     request_id=request_id,
@@ -358,8 +527,8 @@ class MemoryManagerService:
                     )
                     continue
                 memory_id = self._resolve_existing_memory_id(
+                    index,
                     memory_id=str(item.get("memory_id") or "").strip() or None,
-                    session_id=session_id,
                     subject=subject,
                     memory_type=str(item.get("type") or "fact").strip() or "fact",
                     content=content,
@@ -380,6 +549,7 @@ class MemoryManagerService:
                     )
                 except KeyError:
                     continue
+                index.put(updated)
                 changed_ids.append(str(updated.get("id") or ""))
                 self.store.create_memory_event(
                     owner_id=self.owner_id,
@@ -404,8 +574,8 @@ class MemoryManagerService:
                 )
             elif op == "delete":
                 memory_id = self._resolve_existing_memory_id(
+                    index,
                     memory_id=str(item.get("memory_id") or "").strip() or None,
-                    session_id=session_id,
                     subject=str(item.get("subject") or "").strip(),
                     memory_type=str(item.get("type") or "fact").strip() or "fact",
                     content=str(item.get("content") or "").strip(),
@@ -416,6 +586,7 @@ class MemoryManagerService:
                     self.store.update_memory(memory_id, status="deleted")
                 except KeyError:
                     continue
+                index.remove(memory_id)
                 changed_ids.append(memory_id)
                 self.store.create_memory_event(
                     owner_id=self.owner_id,
@@ -466,6 +637,7 @@ class MemoryManagerService:
 
     def _apply_add_operation(
         self,
+        index: _ActiveMemoryIndex,
         *,
         item: dict[str, Any],
         session_id: str | None,
@@ -477,18 +649,7 @@ class MemoryManagerService:
         memory_type = str(item.get("type") or "fact").strip() or "fact"
         subject = str(item.get("subject") or "").strip()
         content = str(item.get("content") or "").strip()
-        active = self.store.list_memories(
-            owner_id=self.owner_id,
-            status="active",
-            session_id=session_id,
-            limit=200,
-        )
-        exact_match = self._find_exact_active_match(
-            active,
-            subject=subject,
-            memory_type=memory_type,
-            content=content,
-        )
+        exact_match = index.find_exact(subject=subject, memory_type=memory_type, content=content)
         if exact_match is not None:
             updated = self.store.update_memory(
                 str(exact_match.get("id") or ""),
@@ -509,6 +670,7 @@ class MemoryManagerService:
                     source_request_ids,
                 ),
             )
+            index.put(updated)
             self.store.create_memory_event(
                 owner_id=self.owner_id,
                 session_id=session_id,
@@ -525,11 +687,10 @@ class MemoryManagerService:
             )
             return updated, "merged_duplicate_add"
 
-        prior = self._find_subject_type_active_match(
-            active, subject=subject, memory_type=memory_type
-        )
+        prior = index.find_by_subject(subject=subject, memory_type=memory_type)
         if prior is not None:
             self.store.update_memory(str(prior.get("id") or ""), status="superseded")
+            index.remove(str(prior.get("id") or ""))
             record = self.store.create_memory(
                 memory_id=make_id("memory"),
                 owner_id=self.owner_id,
@@ -544,6 +705,7 @@ class MemoryManagerService:
                 source_request_ids=source_request_ids,
                 supersedes_memory_id=str(prior.get("id") or ""),
             )
+            index.put(record)
             self.store.create_memory_event(
                 owner_id=self.owner_id,
                 session_id=session_id,
@@ -573,6 +735,7 @@ class MemoryManagerService:
             source_message_ids=source_message_ids,
             source_request_ids=source_request_ids,
         )
+        index.put(record)
         self.store.create_memory_event(
             owner_id=self.owner_id,
             session_id=session_id,
@@ -590,82 +753,20 @@ class MemoryManagerService:
 
     def _resolve_existing_memory_id(
         self,
+        index: _ActiveMemoryIndex,
         *,
         memory_id: str | None,
-        session_id: str | None,
         subject: str,
         memory_type: str,
         content: str,
     ) -> str | None:
         if memory_id:
             return memory_id
-        active = self.store.list_memories(
-            owner_id=self.owner_id,
-            status="active",
-            session_id=session_id,
-            limit=200,
-        )
-        exact = self._find_exact_active_match(
-            active, subject=subject, memory_type=memory_type, content=content
-        )
-        if exact is not None:
-            return str(exact.get("id") or "") or None
-        by_subject = self._find_subject_type_active_match(
-            active, subject=subject, memory_type=memory_type
-        )
-        if by_subject is not None:
-            return str(by_subject.get("id") or "") or None
-        return None
-
-    @staticmethod
-    def _find_exact_active_match(
-        memories: list[dict[str, Any]],
-        *,
-        subject: str,
-        memory_type: str,
-        content: str,
-    ) -> dict[str, Any] | None:
-        normalized_subject = MemoryManagerService._normalize_text(subject)
-        normalized_type = MemoryManagerService._normalize_text(memory_type)
-        normalized_content = MemoryManagerService._normalize_text(content)
-        for item in memories:
-            if str(item.get("status") or "") != "active":
-                continue
-            if MemoryManagerService._normalize_text(str(item.get("type") or "")) != normalized_type:
-                continue
-            if (
-                MemoryManagerService._normalize_text(str(item.get("subject") or ""))
-                != normalized_subject
-            ):
-                continue
-            if (
-                MemoryManagerService._normalize_text(str(item.get("content") or ""))
-                != normalized_content
-            ):
-                continue
-            return item
-        return None
-
-    @staticmethod
-    def _find_subject_type_active_match(
-        memories: list[dict[str, Any]],
-        *,
-        subject: str,
-        memory_type: str,
-    ) -> dict[str, Any] | None:
-        normalized_subject = MemoryManagerService._normalize_text(subject)
-        normalized_type = MemoryManagerService._normalize_text(memory_type)
-        for item in memories:
-            if str(item.get("status") or "") != "active":
-                continue
-            if MemoryManagerService._normalize_text(str(item.get("type") or "")) != normalized_type:
-                continue
-            if (
-                MemoryManagerService._normalize_text(str(item.get("subject") or ""))
-                != normalized_subject
-            ):
-                continue
-            return item
+        match = index.find_exact(
+            subject=subject, memory_type=memory_type, content=content
+        ) or index.find_by_subject(subject=subject, memory_type=memory_type)
+        if match is not None:
+            return str(match.get("id") or "") or None
         return None
 
     @staticmethod
@@ -747,20 +848,29 @@ class MemoryManagerService:
 
 
 def run_memory_manager_update_job(
-    store: ChanakyaStore, *, session_id: str, request_id: str
+    store: ChanakyaStore,
+    *,
+    session_id: str,
+    request_id: str,
+    request_ids: list[str] | None = None,
 ) -> None:
     service = MemoryManagerService(store)
     started_at = now_iso()
     started_clock = perf_counter()
+    started_payload: dict[str, Any] = {"started_at": started_at}
+    if request_ids and len(request_ids) > 1:
+        started_payload["coalesced_request_ids"] = list(request_ids)
     store.create_memory_event(
         owner_id=service.owner_id,
         session_id=session_id,
         request_id=request_id,
         event_type="memory_background_job_started",
-        payload={"started_at": started_at},
+        payload=started_payload,
     )
     try:
-        result = service.process_request_turn(session_id=session_id, request_id=request_id)
+        result = service.process_request_turn(
+            session_id=session_id, request_id=request_id, request_ids=request_ids
+        )
         duration_ms = int(max((perf_counter() - started_clock) * 1000, 0.0))
         store.create_memory_event(
             owner_id=service.owner_id,
@@ -775,6 +885,7 @@ def run_memory_manager_update_job(
                 "operations_count": len(result.operations),
                 "needs_clarification": result.needs_clarification,
                 "retryable": result.retryable,
+                **result.prompt_stats,
             },
         )
     except Exception as exc:
@@ -14,6 +14,9 @@ _loaded_tools: list[MCPStdioTool] = []
 _tools_availability: list[dict[str, Any]] = []
 _tools_catalog: list[dict[str, Any]] = []
 _tools_initialized = False
+# Bumped whenever the loaded tool set changes, so prompt and tool-list caches
+# built from it know to rebuild.
+_tools_generation = 0
 
 
 def _wrap_command(command: str, args: list[str]) -> tuple[str, list[str]]:
@@ -126,7 +129,9 @@ async def _close_loaded_tools_async() -> None:
 
 async def _reload_tools_async() -> None:
     global _loaded_tools, _tools_availability, _tools_catalog, _tools_initialized
+    global _tools_generation
     await _close_loaded_tools_async()
+    _tools_generation += 1
 
     # Ensure availability reflects only the latest initialization attempt
     _tools_availability.clear()
@@ -233,6 +238,7 @@ async def _reload_tools_async() -> None:
             _tools_catalog.append(entry)
             debug_log("mcp_tool_connection_failed", {"server": server_id, "error": str(e)})
     _tools_initialized = True
+    _tools_generation += 1
 
 
 def initialize_all_tools() -> None:
@@ -248,6 +254,10 @@ def reload_all_tools() -> list[dict[str, Any]]:
     return get_tools_availability()
 
 
+def get_tools_generation() -> int:
+    return _tools_generation
+
+
 def get_cached_tools() -> list[MCPStdioTool]:
     return list(_loaded_tools)
 
@@ -26,6 +26,7 @@ from chanakya.domain import (
     TASK_STATUS_WAITING_INPUT,
 )
 from chanakya.model import AgentProfileModel
+from chanakya.profile_cache import invalidate_agent_profiles
 from chanakya.store import ChanakyaStore
 from chanakya.subagents import WorkerSubagentOrchestrator, can_create_temporary_subagents
 
@@ -665,6 +666,64 @@ def test_manager_profile_prompt_extracts_text_from_structured_response(
     assert "# Implementation Handoff" in result
 
 
+def test_manager_profile_prompts_reuse_pooled_agents_until_profile_changes(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    store = _build_store()
+    _seed_full_hierarchy(store)
+    manager_profile = store.get_agent_profile("agent_manager")
+    manager = AgentManager(store, store.Session, manager_profile)
+    developer_profile = store.get_agent_profile("agent_developer")
+    run_options: list[dict[str, object]] = []
+    builds: list[dict[str, object]] = []
+
+    class _FakeAgent:
+        def create_session(self, *, session_id: str | None = None):
+            return type("Session", (), {"session_id": session_id, "state": {}})()
+
+        async def run(self, message, session=None, options=None):
+            run_options.append(dict(options or {}))
+            return type("Response", (), {"text": "done"})()
+
+    def _fake_build_profile_agent(*args, **kwargs):
+        builds.append(kwargs)
+        return _FakeAgent(), object()
+
+    monkeypatch.setattr(
+        "chanakya.core.agent_manager.build_profile_agent", _fake_build_profile_agent
+    )
+    client = object()
+    monkeypatch.setattr(manager, "_resolve_client", lambda: client)
+
+    for _ in range(3):
+        manager._run_profile_prompt_with_options(
+            developer_profile,
+            "Implement hello world",
+            include_history=False,
+            store=False,
+            use_work_session=False,
+        )
+
+    assert len(builds) == 1
+    assert builds[0]["runtime_context"] is False
+    assert manager.agent_pool.stats()["hits"] == 2
+    assert all(
+        str(options["instructions"]).startswith("# Runtime Context\n")
+        for options in run_options
+    )
+
+    invalidate_agent_profiles(store.Session, developer_profile.id)
+    manager._run_profile_prompt_with_options(
+        developer_profile,
+        "Implement hello world",
+        include_history=False,
+        store=False,
+        use_work_session=False,
+    )
+
+    assert len(builds) == 2
+
+
 def test_normal_chat_uses_classic_runtime_prompt_addendum_for_direct_runs() -> None:
     store = _build_store()
     chanakya = _seed_agent(
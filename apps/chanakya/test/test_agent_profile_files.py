@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+from chanakya.agent import profile_files
 from chanakya.agent.profile_files import (
     FileAccessGuard,
     ensure_agent_profile_files,
@@ -105,3 +106,51 @@ def test_parse_agent_and_skills_markdown() -> None:
     assert agent.skill_names == ["polish_output", "structure_for_readability"]
     assert len(skills) == 1
     assert selected[0].name == "polish_output"
+
+
+def test_load_agent_prompt_reparses_files_only_when_they_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    profile = _profile()
+    ensure_agent_profile_files(profile, tmp_path)
+    parses: list[str] = []
+    original_parse = profile_files.parse_agent_md
+
+    def counting_parse(content: str):
+        parses.append(content)
+        return original_parse(content)
+
+    monkeypatch.setattr(profile_files, "parse_agent_md", counting_parse)
+
+    first = load_agent_prompt(profile, repo_root=tmp_path, usage_text="fact gathering")
+    second = load_agent_prompt(profile, repo_root=tmp_path, usage_text="fact gathering")
+    other = load_agent_prompt(profile, repo_root=tmp_path, usage_text="writer handoff")
+    assert first == second
+    assert "prepare_writer_handoff" in other
+    assert len(parses) == 1
+
+    agent_md = tmp_path / "chanakya_data" / "agents" / profile.id / "AGENT.md"
+    agent_md.write_text(
+        agent_md.read_text(encoding="utf-8").replace("Researcher", "Lead Researcher"),
+        encoding="utf-8",
+    )
+    updated = load_agent_prompt(profile, repo_root=tmp_path, usage_text="fact gathering")
+    assert "You are Lead Researcher." in updated
+    assert len(parses) == 2
+
+
+def test_load_agent_prompt_rechecks_guard_after_file_is_swapped_for_symlink(
+    tmp_path: Path,
+) -> None:
+    profile = _profile()
+    ensure_agent_profile_files(profile, tmp_path)
+    load_agent_prompt(profile, repo_root=tmp_path, usage_text="fact gathering")
+
+    outside = tmp_path / "outside.md"
+    outside.write_text("# Identity\n- Name: Intruder\n", encoding="utf-8")
+    agent_md = tmp_path / "chanakya_data" / "agents" / profile.id / "AGENT.md"
+    agent_md.unlink()
+    agent_md.symlink_to(outside)
+
+    with pytest.raises(PermissionError):
+        load_agent_prompt(profile, repo_root=tmp_path, usage_text="fact gathering")
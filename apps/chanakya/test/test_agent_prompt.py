@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from chanakya.agent import prompt as prompt_module
+from chanakya.agent.prompt import inject_tools_into_prompt, render_tool_section
+from chanakya.model import AgentProfileModel
+
+
+def _profile() -> AgentProfileModel:
+    return AgentProfileModel(
+        id="agent_developer",
+        name="Developer",
+        role="developer",
+        system_prompt="You are a developer.",
+        personality="",
+        tool_ids_json=["mcp_code"],
+        workspace=None,
+        heartbeat_enabled=False,
+        heartbeat_interval_seconds=300,
+        heartbeat_file_path=None,
+        is_active=True,
+        created_at="2026-04-03T00:00:00+00:00",
+        updated_at="2026-04-03T00:00:00+00:00",
+    )
+
+
+class _CountingTool:
+    def __init__(self, name: str, functions: list[SimpleNamespace]) -> None:
+        self.name = name
+        self._functions = functions
+        self.reads = 0
+
+    @property
+    def functions(self) -> list[SimpleNamespace]:
+        self.reads += 1
+        return self._functions
+
+
+def test_tool_section_is_stable_prefix_and_rerendered_after_tool_reload(monkeypatch) -> None:
+    generation = [1]
+    monkeypatch.setattr(prompt_module, "get_tools_generation", lambda: generation[0])
+    tool = _CountingTool(
+        "mcp_code",
+        [SimpleNamespace(name="mcp_code_run", description="Run code in the sandbox.")],
+    )
+
+    first = inject_tools_into_prompt(_profile(), [tool])
+    second = inject_tools_into_prompt(_profile(), [tool])
+
+    section = render_tool_section([tool])
+    stable_prefix = "You are a developer." + section
+    assert first.startswith(stable_prefix)
+    assert second.startswith(stable_prefix)
+    assert "- Tool Name: `mcp_code_run`" in section
+    assert first[len(stable_prefix) :].startswith("\n\n# Runtime Context\n")
+    assert tool.reads == 1
+
+    generation[0] = 2
+    tool._functions.append(SimpleNamespace(name="mcp_code_stop", description=""))
+    assert "mcp_code_stop" in render_tool_section([tool])
+    assert tool.reads == 2
+    assert render_tool_section([]) == ""
@@ -14,6 +14,7 @@ from chanakya.domain import (
     TASK_STATUS_DONE,
     TASK_STATUS_FAILED,
     TASK_STATUS_IN_PROGRESS,
+    TASK_STATUS_WAITING_INPUT,
 )
 from chanakya.history_provider import SQLAlchemyHistoryProvider
 from chanakya.model import AgentProfileModel
@@ -977,6 +978,32 @@ def test_update_task_preserves_error_until_non_failed_transition() -> None:
     assert store.list_tasks(session_id="session_3", root_only=True)[0]["error"] is None
 
 
+def test_find_waiting_input_task_sees_past_recent_task_window() -> None:
+    store = _build_store()
+    store.create_request(
+        request_id="req_wait", session_id="session_wait", user_message="Ask", status="created"
+    )
+    for index in range(205):
+        store.create_task(
+            task_id=f"task_{index}",
+            request_id="req_wait",
+            parent_task_id=None,
+            title="step",
+            summary=None,
+            status="created",
+            owner_agent_id=None,
+            task_type="step",
+            input_json={"maf_pending_request_id": "pending_1"} if index == 0 else None,
+        )
+    assert store.find_waiting_input_task("session_wait") is None
+
+    store.update_task("task_0", status=TASK_STATUS_WAITING_INPUT)
+    assert store.find_waiting_input_task("session_wait")["id"] == "task_0"
+
+    store.update_task("task_0", status=TASK_STATUS_IN_PROGRESS)
+    assert store.find_waiting_input_task("session_wait") is None
+
+
 def test_history_provider_filters_control_json_messages() -> None:
     row = type(
         "Row",
@@ -1111,3 +1138,301 @@ def test_history_context_stats_are_persisted_in_message_metadata() -> None:
     assert "history_context" in metadata
     assert metadata["history_context"]["selected_messages"] == 5
     assert metadata["history_context"]["relevance_hits"] == 2
+
+
+def test_history_provider_extends_cached_window_and_invalidates_on_rewrite() -> None:
+    from sqlalchemy import event
+
+    store = _build_store()
+    provider = SQLAlchemyHistoryProvider(store.Session)
+    store.add_message("session_hist_cache", "user", "how does the billing retry work")
+    store.add_message("session_hist_cache", "assistant", '{"needs_input": false}')
+    store.add_message("session_hist_cache", "assistant", "retries back off exponentially")
+
+    first = provider._load_history_rows("session_hist_cache")
+    assert [row.content for row in first] == [
+        "how does the billing retry work",
+        "retries back off exponentially",
+    ]
+    assert first.overlap_scores({"billing", "retry"}) == {0: 2}
+
+    store.add_message("session_hist_cache", "user", "and the billing timeout?")
+    fetched: list[int] = []
+
+    def _count_rows(_conn, _cursor, statement, parameters, _context, _executemany) -> None:
+        if "FROM chat_messages" in statement:
+            fetched.append(int(parameters[1]))
+
+    engine = store.Session.kw["bind"]
+    event.listen(engine, "before_cursor_execute", _count_rows)
+    try:
+        second = provider._load_history_rows("session_hist_cache")
+    finally:
+        event.remove(engine, "before_cursor_execute", _count_rows)
+    # Only rows after the last cached id are read back.
+    assert fetched == [3]
+    assert len(first) == 2
+    assert [row.content for row in second][-1] == "and the billing timeout?"
+    assert second.overlap_scores({"billing"}) == {0: 1, 2: 1}
+
+    store.rewrite_latest_assistant_message(
+        "session_hist_cache", content="retries use a fixed five second delay"
+    )
+    third = provider._load_history_rows("session_hist_cache")
+    assert [row.content for row in third][1] == "retries use a fixed five second delay"
+    selected, _ = SQLAlchemyHistoryProvider._compress_history_rows_with_stats(
+        third,
+        query_text="fixed delay",
+        recent_window=1,
+        max_messages=2,
+        max_chars=2000,
+        max_message_chars=500,
+    )
+    assert [content for _, content in selected] == [
+        "retries use a fixed five second delay",
+        "and the billing timeout?",
+    ]
+
+
+def test_history_provider_ranks_backfill_with_fts_index(monkeypatch) -> None:
+    from chanakya.search_index import search_chat_history
+
+    store = _build_store()
+    provider = SQLAlchemyHistoryProvider(store.Session)
+    store.add_message("session_fts", "user", "the invoice_export job keeps timing out")
+    for index in range(6):
+        store.add_message("session_fts", "assistant", f"status update {index} about the job")
+    store.add_message("session_other", "user", "invoice_export in another chat")
+    store.add_message("session_fts", "user", "latest question")
+
+    with store.Session() as session:
+        hits = search_chat_history(session, "session_fts", {"invoice_export", "job"}, limit=3)
+    # The rare token outranks the one every message shares; other sessions never match.
+    assert hits[0][0] == 1
+    assert len(hits) == 3
+
+    import chanakya.core.history_provider as history_module
+
+    monkeypatch.setattr(history_module, "get_history_recent_window_messages", lambda: 1)
+    monkeypatch.setattr(history_module, "get_history_max_messages", lambda: 2)
+    state = {"history_query_text": "invoice_export job"}
+    messages = run_in_maf_loop(provider.get_messages("session_fts", state=state))
+    assert [message.text for message in messages] == [
+        "the invoice_export job keeps timing out",
+        "latest question",
+    ]
+    assert state["history_context_stats"]["relevance_hits"] == 1
+
+    store.rewrite_latest_assistant_message("session_fts", content="invoice_export fixed")
+    with store.Session() as session:
+        rewritten = search_chat_history(session, "session_fts", {"fixed"}, limit=5)
+    assert [row_id for row_id, _ in rewritten] == [7]
+
+
+def test_build_engine_applies_sqlite_profile_to_file_database(tmp_path) -> None:
+    from sqlalchemy import text
+    from sqlalchemy.pool import QueuePool, StaticPool
+
+    from chanakya.db import SQLiteProfile
+
+    profile = SQLiteProfile(busy_timeout_ms=1234, cache_size_kib=4096, mmap_size_bytes=1 << 20)
+    engine = build_engine(f"sqlite:///{tmp_path / 'chanakya.db'}", sqlite_profile=profile)
+    assert isinstance(engine.pool, QueuePool)
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        assert connection.execute(text("PRAGMA cache_size")).scalar() == -4096
+        assert connection.execute(text("PRAGMA mmap_size")).scalar() == 1 << 20
+        assert connection.execute(text("PRAGMA auto_vacuum")).scalar() == 2
+
+    memory_engine = build_engine("sqlite:///:memory:", sqlite_profile=profile)
+    assert isinstance(memory_engine.pool, StaticPool)
+    with memory_engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "memory"
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+
+
+def test_write_behind_queue_batches_telemetry_and_keeps_read_your_writes(tmp_path) -> None:
+    from chanakya.write_behind import WriteBehindQueue
+
+    engine = build_engine(f"sqlite:///{tmp_path / 'chanakya.db'}")
+    init_database(engine)
+    store = ChanakyaStore(build_session_factory(engine))
+    writes = store.events.writes
+    assert writes.threaded is True
+    assert store.tools.writes is writes
+
+    for index in range(20):
+        store.log_event("turn", {"index": index})
+    store.create_task_event(session_id="s1", event_type="task_created", payload={})
+    store.create_tool_invocation(
+        invocation_id="inv_1",
+        request_id="req_1",
+        session_id="s1",
+        agent_id=None,
+        agent_name="Chanakya",
+        tool_id="tool_x",
+        tool_name="x",
+        server_name="srv",
+        status="running",
+    )
+    store.finish_tool_invocation("inv_1", status="succeeded", output_text="ok")
+
+    events = store.list_events(limit=50)
+    assert [event["payload"]["index"] for event in events] == list(range(20))
+    assert [event["event_type"] for event in store.list_task_events(session_id="s1")] == [
+        "task_created"
+    ]
+    traces = store.list_tool_invocations(session_id="s1")
+    assert traces[0]["status"] == "succeeded"
+    assert traces[0]["output"] == "ok"
+
+    writes.close()
+    store.log_event("after_close", {})
+    assert store.list_events(limit=1)[0]["event_type"] == "after_close"
+
+    memory_store = _build_store()
+    assert isinstance(memory_store.events.writes, WriteBehindQueue)
+    assert memory_store.events.writes.threaded is False
+
+
+def test_write_behind_queue_counts_dropped_rows_and_is_released_with_its_stores(
+    tmp_path,
+) -> None:
+    import gc
+    import time
+    import weakref
+
+    from chanakya.model import AppEventModel
+    from chanakya.core.write_behind import _QUEUES
+
+    engine = build_engine(f"sqlite:///{tmp_path / 'chanakya.db'}")
+    init_database(engine)
+    store = ChanakyaStore(build_session_factory(engine))
+    writes = store.events.writes
+    writes.idle_exit_seconds = 0.01
+
+    store.log_event("kept", {})
+    writes.add(AppEventModel, {"event_type": None, "payload_json": {}, "created_at": "now"})
+    store.log_event("also_kept", {})
+    assert [event["event_type"] for event in store.list_events(limit=10)] == [
+        "kept",
+        "also_kept",
+    ]
+    metrics = store.write_behind_metrics()
+    assert metrics["failed_batches"] == 1
+    assert metrics["dropped"] == 1
+    assert metrics["written"] == metrics["enqueued"] == 3
+
+    deadline = time.monotonic() + 5
+    while writes.metrics()["writer_running"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writes.metrics()["writer_running"] is False
+    queue_ref = weakref.ref(writes)
+    del store, writes
+    gc.collect()
+    assert queue_ref() is None
+    assert engine not in _QUEUES
+    engine.dispose()
+
+
+def test_per_engine_caches_are_released_with_their_engine() -> None:
+    import gc
+    import weakref
+
+    from chanakya.core.history_cache import _CACHES, HistoryCache, get_history_cache
+    from chanakya.core.profile_cache import _CACHES as _PROFILE_CACHES
+    from chanakya.core.profile_cache import get_profile_cache
+    from chanakya.core.search_index import _FTS_TABLES, fts_tables
+
+    engine = build_engine("sqlite:///:memory:")
+    init_database(engine)
+    cache = get_history_cache(build_session_factory(engine))
+    assert isinstance(cache, HistoryCache)
+    assert engine in _CACHES
+    assert fts_tables(engine)
+    assert engine in _FTS_TABLES
+    store = ChanakyaStore(build_session_factory(engine))
+    assert get_profile_cache(store.Session) is not None
+    assert engine in _PROFILE_CACHES
+    cache_ref = weakref.ref(cache)
+    engine_ref = weakref.ref(engine)
+    del cache, engine, store
+    gc.collect()
+    # Dropping the last store frees the engine along with every per-engine cache.
+    assert engine_ref() is None
+    assert cache_ref() is None
+
+
+def test_retention_archives_expired_rows_and_reclaims_space(tmp_path, monkeypatch) -> None:
+    import gzip
+    import json
+    from datetime import datetime, timedelta, timezone
+
+    from sqlalchemy import func, select
+
+    from chanakya.model import AppEventModel, TaskEventModel, ToolInvocationModel
+    from chanakya.retention import RetentionManager, list_retention_rollups
+
+    monkeypatch.setenv("CHANAKYA_RETENTION_TASK_EVENTS_KEEP_PER_GROUP", "3")
+    engine = build_engine(f"sqlite:///{tmp_path / 'chanakya.db'}")
+    init_database(engine)
+    session_factory = build_session_factory(engine)
+    now = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    old = (now - timedelta(days=45)).isoformat()
+    recent = (now - timedelta(days=1)).isoformat()
+    with session_factory() as session:
+        for index in range(200):
+            session.add(
+                AppEventModel(
+                    event_type="turn" if index % 2 else "startup",
+                    payload_json={"blob": "x" * 2000, "index": index},
+                    created_at=old if index < 150 else recent,
+                )
+            )
+        for index in range(5):
+            session.add(
+                TaskEventModel(
+                    session_id="s1", event_type="task_created", payload_json={}, created_at=recent
+                )
+            )
+        session.add(
+            ToolInvocationModel(
+                invocation_id="inv_running",
+                request_id="req_1",
+                session_id="s1",
+                agent_name="Chanakya",
+                tool_id="tool_x",
+                tool_name="x",
+                server_name="srv",
+                status="running",
+                input_json={},
+                started_at=(now - timedelta(days=400)).isoformat(),
+            )
+        )
+        session.commit()
+
+    manager = RetentionManager(
+        session_factory, archive_dir=tmp_path / "archive", batch_size=40, pause_seconds=0
+    )
+    report = manager.run_once(now=now)
+
+    assert report.archived == {"app_events": 150, "task_events": 2}
+    assert report.vacuumed_pages > 0
+    with session_factory() as session:
+        assert session.scalar(select(func.count()).select_from(AppEventModel)) == 50
+        remaining = session.scalars(select(TaskEventModel.id).order_by(TaskEventModel.id)).all()
+        assert remaining == [3, 4, 5]
+        assert session.scalar(select(func.count()).select_from(ToolInvocationModel)) == 1
+    archived_ids = []
+    for path in sorted((tmp_path / "archive" / "app_events").glob("*.ndjson.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            archived_ids.extend(json.loads(line)["id"] for line in handle)
+    assert sorted(archived_ids) == list(range(1, 151))
+    rollups = list_retention_rollups(session_factory, table_name="app_events")
+    assert {(row["day"], row["dimension"]): row["row_count"] for row in rollups} == {
+        (old[:10], "startup"): 75,
+        (old[:10], "turn"): 75,
+    }
+    assert manager.run_once(now=now).archived == {}
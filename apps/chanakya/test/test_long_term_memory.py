@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from typing import Any, cast
 
+import pytest
+
 from chanakya.chat_service import ChatService
-from chanakya.db import build_engine, build_session_factory, init_database
-from chanakya.model import AgentProfileModel
+from chanakya.db import build_engine, build_session_factory, init_database, session_scope
+from chanakya.model import AgentProfileModel, MemoryRecordModel
 from chanakya.services.long_term_memory import LongTermMemoryService, run_memory_update_job
+from chanakya.services.memory_job_queue import MemoryJobQueue
 from chanakya.services.memory_manager_service import MemoryManagerResult, MemoryManagerService
 from chanakya.store import ChanakyaStore
 
@@ -545,3 +549,515 @@ def test_memory_events_record_proposed_and_applied_operations(monkeypatch) -> No
         "memory_superseded",
     }
     assert finished["payload"]["result_status"] == "ok"
+
+
+def test_retrieval_searches_beyond_the_newest_hundred_memories() -> None:
+    store = _build_store()
+    store.create_memory(
+        memory_id="memory_old_vendor",
+        owner_id="default_user",
+        session_id=None,
+        scope="user",
+        type="fact",
+        subject="billing vendor",
+        content="The team pays invoices through Zylofax.",
+        importance=3,
+        confidence=0.9,
+    )
+    for index in range(120):
+        store.create_memory(
+            memory_id=f"memory_filler_{index}",
+            owner_id="default_user",
+            session_id=None,
+            scope="user",
+            type="fact",
+            subject=f"note {index}",
+            content=f"Unrelated note number {index}.",
+        )
+    service = LongTermMemoryService(store)
+
+    addendum = service.build_prompt_addendum(session_id="session_1", query="Who is zylofax?")
+    assert addendum is not None
+    assert "Zylofax" in addendum
+
+    hits = store.search_memories(owner_id="default_user", tokens={"zylofax"})
+    assert [item["id"] for item in hits] == ["memory_old_vendor"]
+
+    store.update_memory("memory_old_vendor", status="superseded")
+    assert store.search_memories(owner_id="default_user", tokens={"zylofax"}) == []
+    assert store.search_memories(
+        owner_id="default_user", tokens={"zylofax"}, status="superseded"
+    )[0]["id"] == "memory_old_vendor"
+    assert service.build_prompt_addendum(session_id="session_1", query="Who is zylofax?") is None
+
+
+def test_memory_search_never_returns_another_owners_memories() -> None:
+    store = _build_store()
+    for memory_id, owner_id in (("memory_smith", "alice.smith"), ("memory_alice", "alice")):
+        store.create_memory(
+            memory_id=memory_id,
+            owner_id=owner_id,
+            session_id=None,
+            scope="user",
+            type="fact",
+            subject="salary",
+            content=f"Salary details for {owner_id}.",
+        )
+    store.update_memory("memory_alice", status="archived")
+
+    assert store.search_memories(owner_id="alice", tokens={"salary"}) == []
+    assert [
+        item["id"]
+        for item in store.search_memories(owner_id="alice", tokens={"salary"}, status=None)
+    ] == ["memory_alice"]
+    assert [
+        item["id"] for item in store.search_memories(owner_id="alice.smith", tokens={"salary"})
+    ] == ["memory_smith"]
+
+
+_FAKE_CONCEPTS = {"car": 0, "automobile": 0, "vehicle": 0, "drive": 1, "coffee": 2, "espresso": 2}
+
+
+def _fake_embedder(texts: list[str]) -> list[list[float]]:
+    vectors = []
+    for text in texts:
+        vector = [0.0] * 3
+        for word in text.lower().replace("?", " ").replace(".", " ").split():
+            if word in _FAKE_CONCEPTS:
+                vector[_FAKE_CONCEPTS[word]] += 1.0
+        vectors.append(vector)
+    return vectors
+
+
+def test_semantic_memory_search_matches_paraphrases_and_tracks_updates() -> None:
+    from chanakya.memory_vectors import MemoryVectorIndex, set_memory_vector_index
+
+    engine = build_engine("sqlite:///:memory:")
+    init_database(engine)
+    session_factory = build_session_factory(engine)
+    calls: list[int] = []
+
+    def embedder(texts: list[str]) -> list[list[float]]:
+        calls.append(len(texts))
+        return _fake_embedder(texts)
+
+    set_memory_vector_index(session_factory, MemoryVectorIndex(embedder))
+    store = ChanakyaStore(session_factory)
+    store.create_memory(
+        memory_id="memory_auto",
+        owner_id="default_user",
+        session_id=None,
+        scope="user",
+        type="fact",
+        subject="transport",
+        content="Owns an automobile",
+    )
+    store.create_memory(
+        memory_id="memory_coffee",
+        owner_id="default_user",
+        session_id=None,
+        scope="user",
+        type="fact",
+        subject="drinks",
+        content="Likes espresso",
+    )
+
+    addendum = LongTermMemoryService(store).build_prompt_addendum(
+        session_id="session_1", query="Which car is mine?"
+    )
+    assert addendum is not None
+    assert "Owns an automobile" in addendum
+    assert "espresso" not in addendum
+    # Both memories in one batch, then one call per query.
+    assert calls == [2, 1]
+
+    store.update_memory("memory_auto", status="superseded")
+    hits = store.semantic_search_memories(owner_id="default_user", query="my vehicle")
+    assert all(item["id"] != "memory_auto" for item in hits)
+    # The superseded record is dropped without re-embedding; only the query is embedded.
+    assert calls == [2, 1, 1]
+
+
+def test_memory_vector_index_persists_memory_mapped_matrix(tmp_path) -> None:
+    from chanakya.memory_vectors import MemoryVectorIndex
+
+    path = tmp_path / "chanakya.db.memory_vectors"
+    index = MemoryVectorIndex(_fake_embedder, path=path, model="fake")
+    memory_ids = [f"memory_{number}" for number in range(300)]
+    index.mark_dirty(memory_ids)
+    index.refresh(
+        lambda ids: {
+            memory_id: ("coffee" if memory_id == "memory_7" else "car", "t1") for memory_id in ids
+        }
+    )
+    assert len(index) == 300
+    index.mark_dirty("memory_8")
+    index.refresh(lambda ids: {})
+    assert {item.name for item in tmp_path.iterdir()} >= {
+        "chanakya.db.memory_vectors.f32",
+        "chanakya.db.memory_vectors.json",
+        "chanakya.db.memory_vectors.lock",
+    }
+
+    # Another process opening the same files while they are owned keeps a RAM index.
+    follower = MemoryVectorIndex(_fake_embedder, path=path, model="fake")
+    assert follower.path is None
+    assert len(follower) == 0
+    follower.close()
+    index.close()
+
+    reopened = MemoryVectorIndex(_fake_embedder, path=path, model="fake")
+    assert len(reopened) == 299
+    assert reopened.search("espresso", limit=1) == [("memory_7", pytest.approx(1.0))]
+    # Stamps survive the reopen: only the changed, new and deleted ids are marked.
+    removed = {"memory_8", "memory_10"}
+    current = {memory_id: "t1" for memory_id in memory_ids if memory_id not in removed}
+    current["memory_9"] = "t2"
+    current["memory_300"] = "t1"
+    assert reopened.reconcile(current) == 3
+    reopened.close()
+
+    stale = MemoryVectorIndex(_fake_embedder, path=path, model="other-model")
+    assert len(stale) == 0
+    assert stale.reconcile(current) == len(current)
+    stale.close()
+
+
+def test_memory_vector_index_is_released_with_its_engine(tmp_path) -> None:
+    import gc
+    import weakref
+
+    from chanakya.core.memory_vectors import _INDEXES
+    from chanakya.memory_vectors import MemoryVectorIndex, set_memory_vector_index
+
+    engine = build_engine(f"sqlite:///{tmp_path / 'chanakya.db'}")
+    path = tmp_path / "chanakya.db.memory_vectors"
+    index = MemoryVectorIndex(_fake_embedder, path=path, model="fake")
+    set_memory_vector_index(build_session_factory(engine), index)
+    assert engine in _INDEXES
+    index_ref = weakref.ref(index)
+    engine.dispose()
+    del index, engine
+    gc.collect()
+    assert index_ref() is None
+
+    # The dead index's file lock went with it, so a new one owns the files.
+    successor = MemoryVectorIndex(_fake_embedder, path=path, model="fake")
+    assert successor.path == path
+    successor.close()
+
+
+def test_semantic_memory_search_reconciles_rows_written_elsewhere() -> None:
+    from chanakya.memory_vectors import MemoryVectorIndex, set_memory_vector_index
+
+    engine = build_engine("sqlite:///:memory:")
+    init_database(engine)
+    session_factory = build_session_factory(engine)
+    set_memory_vector_index(session_factory, MemoryVectorIndex(_fake_embedder))
+    store = ChanakyaStore(session_factory)
+    store.create_memory(
+        memory_id="memory_coffee",
+        owner_id="default_user",
+        session_id=None,
+        scope="user",
+        type="fact",
+        subject="drinks",
+        content="Likes espresso",
+    )
+    hits = store.semantic_search_memories(owner_id="default_user", query="coffee", min_similarity=0.5)
+    assert [item["id"] for item in hits] == ["memory_coffee"]
+
+    # Another process rewrites the row and adds one; this store is never told.
+    with session_scope(session_factory) as session:
+        row = session.get(MemoryRecordModel, "memory_coffee")
+        row.content = "Owns an automobile"
+        row.updated_at = "2999-01-01T00:00:00+00:00"
+        session.add(
+            MemoryRecordModel(
+                id="memory_tea",
+                owner_id="default_user",
+                session_id=None,
+                scope="user",
+                type="fact",
+                subject="drinks",
+                content="Likes espresso",
+                importance=3,
+                confidence=0.8,
+                status="active",
+                source_message_ids_json=[],
+                source_request_ids_json=[],
+                created_at="2999-01-01T00:00:00+00:00",
+                updated_at="2999-01-01T00:00:00+00:00",
+            )
+        )
+        session.commit()
+
+    hits = store.semantic_search_memories(owner_id="default_user", query="coffee", min_similarity=0.5)
+    assert [item["id"] for item in hits] == ["memory_tea"]
+
+
+def test_memory_job_resolves_duplicates_from_one_listing(monkeypatch) -> None:
+    store = _build_store()
+    store.create_session("session_1", "Test")
+    store.add_message("session_1", "user", "Several memory updates.", request_id="req_dedup")
+    store.create_memory(
+        memory_id="memory_city",
+        owner_id="default_user",
+        session_id="session_1",
+        scope="user",
+        type="attribute",
+        subject="Home City",
+        content="Lives in Pune.",
+    )
+
+    def _operation(op: str, subject: str, content: str, memory_type: str = "attribute") -> dict:
+        return {
+            "op": op,
+            "memory_id": None,
+            "scope": "user",
+            "type": memory_type,
+            "subject": subject,
+            "content": content,
+            "importance": 3,
+            "confidence": 0.9,
+        }
+
+    monkeypatch.setattr(
+        MemoryManagerService,
+        "_run_memory_manager",
+        lambda self, prompt_text, session_id: MemoryManagerResult(
+            status="ok",
+            summary="Several changes.",
+            needs_clarification=False,
+            clarification_question=None,
+            retryable=False,
+            error_code=None,
+            error_detail=None,
+            operations=[
+                _operation("add", "home city", "  lives in   PUNE. "),
+                _operation("add", "Editor", "Uses Vim.", "preference"),
+                _operation("add", "editor", "Uses Helix.", "preference"),
+                _operation("update", "home city", "Lives in Mumbai."),
+                _operation("delete", "EDITOR", "", "preference"),
+            ],
+        ),
+    )
+    listings: list[str | None] = []
+    original_list = ChanakyaStore.list_memories
+
+    def _counting_list(self, **kwargs):
+        listings.append(kwargs.get("session_id"))
+        return original_list(self, **kwargs)
+
+    monkeypatch.setattr(ChanakyaStore, "list_memories", _counting_list)
+
+    run_memory_update_job(store, session_id="session_1", request_id="req_dedup")
+
+    assert listings == ["session_1"]
+    monkeypatch.setattr(ChanakyaStore, "list_memories", original_list)
+    memories = store.list_memories(owner_id="default_user", session_id="session_1", status=None)
+    by_content = {item["content"]: item for item in memories}
+    assert by_content["Lives in Mumbai."]["id"] == "memory_city"
+    assert by_content["Uses Vim."]["status"] == "superseded"
+    helix = by_content["Uses Helix."]
+    assert helix["status"] == "deleted"
+    assert helix["supersedes_memory_id"] == by_content["Uses Vim."]["id"]
+    assert len(memories) == 3
+
+
+def test_memory_jobs_coalesce_per_session_and_recover_after_restart() -> None:
+    store = _build_store()
+
+    first = store.enqueue_memory_job(session_id="session_1", request_id="req_1")
+    second = store.enqueue_memory_job(session_id="session_1", request_id="req_2")
+    urgent = store.enqueue_memory_job(session_id="session_2", request_id="req_3", priority=5)
+
+    assert second["coalesced"] is True
+    assert second["id"] == first["id"]
+    assert second["request_ids"] == ["req_1", "req_2"]
+    assert urgent["coalesced"] is False
+
+    claimed = store.claim_memory_job()
+    assert claimed is not None
+    assert claimed["session_id"] == "session_2"
+    assert claimed["attempts"] == 1
+    store.finish_memory_job(claimed["id"])
+
+    interrupted = store.claim_memory_job()
+    assert interrupted is not None
+    assert interrupted["id"] == first["id"]
+    # A turn arriving while the job runs opens a new job that waits its turn.
+    follow_up = store.enqueue_memory_job(session_id="session_1", request_id="req_4")
+    assert follow_up["coalesced"] is False
+    assert store.claim_memory_job() is None
+
+    assert store.recover_memory_jobs() == 1
+    metrics = store.memory_job_metrics()
+    assert metrics["pending"] == 2
+    assert metrics["pending_turns"] == 3
+    assert metrics["done"] == 1
+    assert metrics["avg_wait_seconds"] is not None
+
+
+def test_memory_job_enqueue_never_folds_into_a_job_claimed_mid_enqueue() -> None:
+    from sqlalchemy import event
+
+    store = _build_store()
+    first = store.enqueue_memory_job(session_id="session_1", request_id="req_1")
+    engine = store.Session.kw["bind"]
+    raced: list[str] = []
+
+    def _claim_before_update(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not raced and statement.startswith("UPDATE memory_jobs"):
+            # A worker claims the job between the enqueue's read and its write.
+            cursor.connection.execute(
+                "UPDATE memory_jobs SET status = 'running' WHERE id = ?", (first["id"],)
+            )
+            raced.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _claim_before_update)
+    try:
+        second = store.enqueue_memory_job(session_id="session_1", request_id="req_2")
+    finally:
+        event.remove(engine, "before_cursor_execute", _claim_before_update)
+
+    assert raced
+    assert second["coalesced"] is False
+    assert second["id"] != first["id"]
+    assert second["request_ids"] == ["req_2"]
+    store.finish_memory_job(first["id"])
+    metrics = store.memory_job_metrics()
+    assert metrics["pending"] == 1
+    assert metrics["pending_turns"] == 1
+
+
+def test_memory_job_queue_runs_coalesced_turns_in_priority_order() -> None:
+    store = _build_store()
+    store.enqueue_memory_job(session_id="session_1", request_id="req_1")
+    store.enqueue_memory_job(session_id="session_1", request_id="req_2")
+    store.enqueue_memory_job(session_id="session_2", request_id="req_3", priority=5)
+    calls: list[tuple[str, str, list[str]]] = []
+
+    def _run_job(*, store, session_id, request_id, request_ids) -> None:
+        calls.append((session_id, request_id, request_ids))
+        if session_id == "session_1":
+            raise RuntimeError("model unavailable")
+
+    queue = MemoryJobQueue(store, workers=1, run_job=_run_job)
+    assert not queue.threaded
+    # In-memory engines drain on the caller's thread.
+    queue.start()
+
+    assert queue.run_pending() == 0
+    assert calls == [
+        ("session_2", "req_3", ["req_3"]),
+        ("session_1", "req_2", ["req_1", "req_2"]),
+    ]
+    metrics = queue.metrics()
+    assert metrics["pending"] == 0
+    assert metrics["done"] == 1
+    assert metrics["failed"] == 1
+    assert metrics["recent_turns_per_job"] == 1.5
+    assert metrics["workers_active"] == 0
+
+    queue.enqueue(session_id="session_3", request_id="req_4")
+    assert calls[-1] == ("session_3", "req_4", ["req_4"])
+    assert queue.metrics()["pending"] == 0
+
+
+def test_memory_job_queue_workers_drain_a_file_database(tmp_path) -> None:
+    engine = build_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    init_database(engine)
+    store = ChanakyaStore(build_session_factory(engine))
+    seen: list[list[str]] = []
+    queue = MemoryJobQueue(
+        store, workers=2, run_job=lambda **kwargs: seen.append(kwargs["request_ids"])
+    )
+    assert queue.threaded
+
+    for index in range(3):
+        queue.enqueue(session_id=f"session_{index}", request_id=f"req_{index}")
+
+    assert queue.wait_idle(timeout=10)
+    assert sorted(ids[0] for ids in seen) == ["req_0", "req_1", "req_2"]
+    assert queue.metrics()["done"] == 3
+    engine.dispose()
+
+
+def test_memory_job_prompt_lists_only_relevant_memories(monkeypatch) -> None:
+    store = _build_store()
+    store.create_session("session_1", "Test")
+    store.add_message(
+        "session_1", "user", "We moved the deploy pipeline to GitHub Actions.", request_id="req_1"
+    )
+    store.add_message("session_1", "assistant", "Noted.", request_id="req_1")
+    for index in range(60):
+        store.create_memory(
+            memory_id=f"memory_noise_{index}",
+            owner_id="default_user",
+            session_id="session_1",
+            scope="shared",
+            type="fact",
+            subject=f"trivia {index}",
+            content=f"Unrelated detail number {index} about gardening.",
+        )
+    store.create_memory(
+        memory_id="memory_pipeline",
+        owner_id="default_user",
+        session_id="session_1",
+        scope="shared",
+        type="project",
+        subject="deploy pipeline",
+        content="Deploys run on Jenkins.",
+    )
+    store.create_memory(
+        memory_id="memory_name",
+        owner_id="default_user",
+        session_id="session_1",
+        scope="user",
+        type="identity",
+        subject="name",
+        content="User is called Asha.",
+    )
+    store.create_memory(
+        memory_id="memory_home_city",
+        owner_id="default_user",
+        session_id="session_1",
+        scope="user",
+        type="attribute",
+        subject="home city",
+        content="User lives in Pune.",
+    )
+    prompts: list[str] = []
+
+    def _capture(self, prompt_text, session_id):
+        prompts.append(prompt_text)
+        return MemoryManagerResult(
+            status="ok",
+            summary="Nothing new.",
+            needs_clarification=False,
+            clarification_question=None,
+            retryable=False,
+            error_code=None,
+            error_detail=None,
+            operations=[],
+        )
+
+    monkeypatch.setattr(MemoryManagerService, "_run_memory_manager", _capture)
+
+    run_memory_update_job(store, session_id="session_1", request_id="req_1")
+
+    assert len(prompts) == 1
+    assert "\n" not in prompts[0]
+    listed = [item["id"] for item in json.loads(prompts[0])["active_memories"]]
+    assert sorted(listed) == ["memory_home_city", "memory_name", "memory_pipeline"]
+    finished = [
+        event
+        for event in store.list_memory_events(owner_id="default_user", request_id="req_1")
+        if event["event_type"] == "memory_background_job_finished"
+    ]
+    stats = finished[0]["payload"]
+    assert stats["active_memory_count"] == 63
+    assert stats["candidate_count"] == 3
+    assert stats["prompt_tokens_saved_estimate"] > stats["prompt_tokens_estimate"]
+    assert "llm_duration_ms" in stats
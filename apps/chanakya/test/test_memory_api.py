@@ -92,3 +92,17 @@ def test_memory_debug_endpoints(monkeypatch, tmp_path: Path) -> None:
     assert session_payload["counts_by_type"]["project"] == 1
     assert session_payload["event_counts_by_type"]["memory_retrieved"] == 1
     assert session_payload["latest_retrieval"]["event_type"] == "memory_retrieved"
+
+    store.enqueue_memory_job(session_id="session_memory_api", request_id="req_memory_api")
+    jobs_response = client.get("/api/memory/jobs/metrics")
+    assert jobs_response.status_code == 200
+    jobs_payload = jobs_response.get_json()
+    assert jobs_payload["pending"] == 1
+    assert jobs_payload["workers_max"] >= 1
+
+    retention_response = client.get("/api/retention")
+    assert retention_response.status_code == 200
+    assert retention_response.get_json() == {"last_run": None, "rollups": []}
+    run_response = client.post("/api/retention/run")
+    assert run_response.status_code == 200
+    assert run_response.get_json()["archived"] == {}
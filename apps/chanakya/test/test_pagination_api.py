@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import chanakya.core.app as app_module
+from chanakya.services import tool_loader
+
+
+class _RuntimeStub:
+    def __init__(self, *args, **kwargs) -> None:
+        self.profile = type("Profile", (), {"name": "Chanakya"})()
+
+    def clear_session_state(self, session_id: str) -> None:
+        return None
+
+
+class _ManagerStub:
+    def __init__(self, *args, **kwargs) -> None:
+        return None
+
+
+class _NotificationStub:
+    def __init__(self, *args, **kwargs) -> None:
+        return None
+
+
+def _build_app(monkeypatch, tmp_path: Path):
+    data_dir = tmp_path / "data"
+    database_path = tmp_path / "pagination.db"
+
+    monkeypatch.setattr(app_module, "load_local_env", lambda: None)
+    monkeypatch.setattr(app_module, "get_data_dir", lambda: data_dir)
+    monkeypatch.setattr(app_module, "get_database_url", lambda: f"sqlite:///{database_path}")
+    monkeypatch.setattr(tool_loader, "initialize_all_tools", lambda: None)
+    monkeypatch.setattr(app_module, "MAFRuntime", _RuntimeStub)
+    monkeypatch.setattr(app_module, "AgentManager", _ManagerStub)
+    monkeypatch.setattr(app_module, "NtfyNotificationDispatcher", _NotificationStub)
+    return app_module.create_app()
+
+
+def test_session_messages_page_from_tail_and_fetch_deltas(monkeypatch, tmp_path: Path) -> None:
+    app = _build_app(monkeypatch, tmp_path)
+    store = app.extensions["chanakya_store"]
+    for index in range(7):
+        store.add_message("session_page", "user", f"message {index}")
+    client = app.test_client()
+
+    full = client.get("/api/sessions/session_page").get_json()
+    assert [item["content"] for item in full["messages"]] == [f"message {i}" for i in range(7)]
+    assert "page" not in full
+
+    tail = client.get("/api/sessions/session_page?limit=3").get_json()
+    assert [item["content"] for item in tail["messages"]] == ["message 4", "message 5", "message 6"]
+    assert tail["page"]["has_more"] is True
+
+    older = client.get(
+        f"/api/sessions/session_page?before_id={tail['page']['first_id']}&limit=3"
+    ).get_json()
+    assert [item["content"] for item in older["messages"]] == ["message 1", "message 2", "message 3"]
+    assert older["page"]["has_more"] is True
+
+    store.add_message("session_page", "assistant", "reply")
+    delta = client.get(
+        f"/api/sessions/session_page?after_id={tail['page']['last_id']}&limit=10"
+    ).get_json()
+    assert [item["content"] for item in delta["messages"]] == ["reply"]
+    assert delta["page"]["has_more"] is False
+
+    assert client.get("/api/sessions/session_page?after_id=abc").status_code == 400
+
+
+def test_task_events_and_app_events_accept_cursors(monkeypatch, tmp_path: Path) -> None:
+    app = _build_app(monkeypatch, tmp_path)
+    store = app.extensions["chanakya_store"]
+    for index in range(5):
+        store.create_task_event(
+            session_id="session_events", event_type=f"step_{index}", payload={}
+        )
+    client = app.test_client()
+
+    first = client.get("/api/task-events?session_id=session_events&limit=2").get_json()
+    assert [item["event_type"] for item in first["events"]] == ["step_3", "step_4"]
+    assert first["page"]["has_more"] is True
+
+    delta = client.get(
+        f"/api/task-events?session_id=session_events&after_id={first['events'][0]['id']}"
+    ).get_json()
+    assert [item["event_type"] for item in delta["events"]] == ["step_4"]
+
+    store.log_event("first", {})
+    store.log_event("second", {})
+    events = client.get("/api/events?limit=1").get_json()
+    assert [item["event_type"] for item in events["events"]] == ["second"]
+    assert events["page"]["has_more"] is True
+
+
+def test_list_endpoints_can_omit_bulky_fields(monkeypatch, tmp_path: Path) -> None:
+    app = _build_app(monkeypatch, tmp_path)
+    store = app.extensions["chanakya_store"]
+    store.add_message("session_omit", "user", "x" * 2000, metadata={"k": "v"})
+    store.create_task_event(session_id="session_omit", event_type="step", payload={"big": "y"})
+    client = app.test_client()
+
+    light = client.get("/api/sessions/session_omit?omit=content,metadata").get_json()
+    assert light["messages"][0]["role"] == "user"
+    assert "content" not in light["messages"][0]
+    assert "metadata" not in light["messages"][0]
+
+    full = client.get("/api/sessions/session_omit").get_json()
+    assert full["messages"][0]["metadata"] == {"k": "v"}
+
+    events = client.get("/api/task-events?session_id=session_omit&omit=payload").get_json()
+    assert events["events"][0]["event_type"] == "step"
+    assert "payload" not in events["events"][0]
+
+    assert client.get("/api/sessions/session_omit?omit=role").status_code == 400
+    assert client.get("/api/task-events?session_id=session_omit&omit=content").status_code == 400
+
+
+def test_work_history_pages_messages_and_task_flow(monkeypatch, tmp_path: Path) -> None:
+    app = _build_app(monkeypatch, tmp_path)
+    store = app.extensions["chanakya_store"]
+    store.create_work(work_id="work_page", title="Paged", description="")
+    for agent_id, session_id in (
+        ("agent_chanakya", "session_work_main"),
+        ("agent_developer", "session_work_dev"),
+    ):
+        store.ensure_work_agent_session(
+            work_id="work_page", agent_id=agent_id, session_id=session_id, session_title=agent_id
+        )
+        for index in range(4):
+            store.add_message(session_id, "user", f"{agent_id} {index}")
+            store.create_task_event(
+                session_id=session_id, event_type=f"{agent_id}_{index}", payload={}
+            )
+    client = app.test_client()
+
+    full = client.get("/api/works/work_page/history").get_json()
+    assert all("page" not in group for group in full["agent_histories"])
+    assert len(full["task_flow"]) == 8
+    assert full["task_flow_page"]["has_more"] is False
+
+    tail = client.get("/api/works/work_page/history?limit=2&event_limit=3").get_json()
+    by_agent = {group["agent_id"]: group for group in tail["agent_histories"]}
+    assert [item["content"] for item in by_agent["agent_developer"]["messages"]] == [
+        "agent_developer 2",
+        "agent_developer 3",
+    ]
+    assert by_agent["agent_developer"]["page"]["has_more"] is True
+    assert tail["conversation"]["page"]["has_more"] is True
+    assert [item["event_type"] for item in tail["task_flow"]] == [
+        "agent_developer_1",
+        "agent_developer_2",
+        "agent_developer_3",
+    ]
+    assert tail["task_flow_page"]["has_more"] is True
+
+    older = client.get(
+        "/api/works/work_page/history?event_limit=3"
+        f"&event_before_id={tail['task_flow_page']['first_id']}"
+    ).get_json()
+    assert [item["event_type"] for item in older["task_flow"]] == [
+        "agent_chanakya_2",
+        "agent_chanakya_3",
+        "agent_developer_0",
+    ]
+    assert older["task_flow_page"]["has_more"] is True
+
+    assert client.get("/api/works/work_page/history?event_after_id=x").status_code == 400
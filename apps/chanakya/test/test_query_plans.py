@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from sqlalchemy import inspect
+
+from chanakya.db import build_engine, build_session_factory, init_database
+from chanakya.migrations import MIGRATIONS, apply_migrations
+from chanakya.query_plan import QueryPlanRecorder
+from chanakya.store import ChanakyaStore
+
+# Unfiltered "latest N" listings ordered by the integer primary key walk the
+# rowid b-tree backwards and stop at LIMIT; that is the cheapest plan available.
+ROWID_ORDERED_TABLES = {"app_events", "agent_profiles"}
+
+
+def _build_file_store(tmp_path) -> tuple[ChanakyaStore, object]:
+    engine = build_engine(f"sqlite:///{tmp_path / 'chanakya.db'}")
+    init_database(engine)
+    return ChanakyaStore(build_session_factory(engine)), engine
+
+
+def test_init_database_applies_index_migrations_once(tmp_path) -> None:
+    _store, engine = _build_file_store(tmp_path)
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("chat_messages")}
+    assert "ix_chat_messages_request_id" in indexes
+    assert apply_migrations(engine) == []
+    assert max(migration.version for migration in MIGRATIONS) == len(MIGRATIONS)
+
+
+def test_repository_queries_do_not_scan_full_tables(tmp_path) -> None:
+    store, engine = _build_file_store(tmp_path)
+    recorder = QueryPlanRecorder(engine)
+
+    with recorder.recording():
+        store.list_messages("s1")
+        store.list_messages_for_request("r1")
+        store.get_latest_assistant_request_id("s1")
+        store.list_events(limit=10)
+        store.list_task_events(session_id="s1")
+        store.list_task_events(request_id="r1")
+        store.list_task_events(task_id="t1")
+        store.list_memories(owner_id="o1")
+        store.list_memories(owner_id="o1", session_id="s1")
+        store.list_memory_events(owner_id="o1", session_id="s1")
+        store.list_artifacts_for_request("r1")
+        store.list_artifacts_for_work("w1")
+        store.list_artifacts_for_session("s1")
+        store.list_recent_artifacts()
+        store.list_requests(session_id="s1")
+        store.list_requests()
+        store.list_tasks()
+        store.list_tasks(session_id="s1")
+        store.list_tasks(request_id="r1", root_only=True)
+        store.list_task_children("t1")
+        store.find_waiting_input_task("s1")
+        store.list_tool_invocations(session_id="s1")
+        store.list_tool_invocations(request_id="r1")
+        store.find_active_agents_by_role("developer")
+        store.list_works()
+        store.list_works(status="active")
+        store.list_work_agent_sessions("w1")
+        store.list_session_ids_for_work("w1")
+        store.find_work_id_by_session(agent_id="a1", session_id="s1")
+        store.list_temporary_agents(session_id="s1")
+        store.list_temporary_agents()
+        store.work_notifications.list_pending(work_id="w1")
+
+    assert recorder.statements
+    scans = recorder.full_scans(allowed_tables=ROWID_ORDERED_TABLES)
+    assert scans == [], "\n\n".join(
+        f"{scan.table}: {scan.statement}\n  " + "\n  ".join(scan.plan) for scan in scans
+    )
@@ -6,6 +6,7 @@ import chanakya.agent.runtime as runtime_module
 from chanakya.agent.runtime import MAFRuntime
 from chanakya.db import build_engine, build_session_factory, init_database
 from chanakya.model import AgentProfileModel, ChatMessageModel, ChatSessionModel
+from chanakya.store import ChanakyaStore
 
 
 class _FakeA2AResponse:
@@ -581,3 +582,43 @@ def test_extract_local_response_text_ignores_function_calls() -> None:
     )
 
     assert MAFRuntime._extract_local_response_text(response) == "Here is the answer."
+
+
+def test_runtime_rebuilds_profile_config_only_after_profile_writes(monkeypatch) -> None:
+    engine = build_engine("sqlite:///:memory:")
+    init_database(engine)
+    session_factory = build_session_factory(engine)
+    store = ChanakyaStore(session_factory)
+    store.upsert_agent_profile(_build_profile())
+    runtime = MAFRuntime(store.get_agent_profile("agent_chanakya"), session_factory)
+    builds: list[str] = []
+    original_build = runtime_module.build_profile_agent_config_for_usage
+
+    def counting_build(profile, **kwargs):
+        builds.append(profile.name)
+        return original_build(profile, **kwargs)
+
+    monkeypatch.setattr(runtime_module, "build_profile_agent_config_for_usage", counting_build)
+
+    runtime._refresh_profile_and_tools()
+    runtime._refresh_profile_and_tools()
+    assert builds == []
+
+    store.update_agent_profile(
+        "agent_chanakya",
+        name="Chanakya Prime",
+        role="assistant",
+        system_prompt="You are Chanakya.",
+        personality="",
+        tool_ids=[],
+        workspace=None,
+        heartbeat_enabled=False,
+        heartbeat_interval_seconds=300,
+        heartbeat_file_path=None,
+        is_active=True,
+    )
+    runtime._refresh_profile_and_tools()
+    runtime._refresh_profile_and_tools()
+    assert builds == ["Chanakya Prime"]
+    assert runtime.profile.name == "Chanakya Prime"
+    assert store.get_agent_profile("agent_chanakya") is store.get_agent_profile("agent_chanakya")
@@ -1,6 +1,9 @@
+import time
 from unittest.mock import patch
 
+from chanakya.agent.clients import DefaultModelCache
 from chanakya.agent.runtime import create_openai_chat_client
+from chanakya.services.async_loop import run_in_maf_loop
 
 
 def test_create_openai_chat_client_forwards_default_headers():
@@ -21,3 +24,72 @@ def test_create_openai_chat_client_forwards_default_headers():
         "x-chanakya-request-id": "req-1",
         "x-session-id": "sess-1",
     }
+
+
+def test_create_openai_chat_client_reuses_clients_and_connection_pool(monkeypatch):
+    monkeypatch.setenv("AIR_ENABLED", "false")
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://127.0.0.1:9/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+    first = create_openai_chat_client(model_id="pool-model")
+    second = create_openai_chat_client(model_id="pool-model")
+    tagged = create_openai_chat_client(
+        model_id="pool-model", default_headers={"x-request-id": "req-2"}
+    )
+
+    assert first is second
+    assert tagged is not first
+    assert tagged.client._client is first.client._client
+    assert tagged.client.default_headers["x-request-id"] == "req-2"
+
+
+def test_default_model_cache_serves_stale_value_while_refreshing():
+    now = [0.0]
+    answers = iter(["model-a", "model-b"])
+    fetched: list[str] = []
+
+    def fetch(base_url: str) -> str:
+        fetched.append(base_url)
+        return next(answers)
+
+    cache = DefaultModelCache(fetch=fetch, ttl_seconds=60, clock=lambda: now[0])
+
+    assert cache.get("http://models") == "model-a"
+    assert cache.get("http://models") == "model-a"
+    assert fetched == ["http://models"]
+
+    now[0] = 61.0
+    assert cache.get("http://models") == "model-a"
+    deadline = time.monotonic() + 5
+    while cache.get("http://models") != "model-b" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.get("http://models") == "model-b"
+    assert len(fetched) == 2
+
+    cold = DefaultModelCache(fetch=lambda base_url: "model-c", ttl_seconds=60)
+
+    async def lookup_on_loop() -> str | None:
+        return cold.get("http://cold")
+
+    assert run_in_maf_loop(lookup_on_loop()) is None
+    deadline = time.monotonic() + 5
+    while cold.get("http://cold") != "model-c" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cold.get("http://cold") == "model-c"
+
+
+def test_default_model_cache_retries_after_a_failed_lookup(monkeypatch):
+    answers = iter([None, "model-d"])
+    cache = DefaultModelCache(fetch=lambda base_url: next(answers), ttl_seconds=300)
+
+    assert cache.get("http://flaky") is None
+    # The failure is not cached for the TTL; the next build fetches again inline.
+    assert cache.get("http://flaky") == "model-d"
+
+    monkeypatch.setattr(
+        "chanakya.agent.runtime.get_openai_compatible_config",
+        lambda: {"base_url": "http://127.0.0.1:9/v1", "api_key": "test-key", "model": None},
+    )
+    fresh = DefaultModelCache(fetch=lambda base_url: "model-e", ttl_seconds=300)
+    monkeypatch.setattr("chanakya.agent.runtime.get_default_model_cache", lambda: fresh)
+    assert create_openai_chat_client().model == "model-e"
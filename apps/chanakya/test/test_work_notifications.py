@@ -7,6 +7,7 @@ from typing import Any
 import pytest
 
 from chanakya.db import build_engine, build_session_factory, init_database
+from chanakya.services.file_reaper import FileReaper
 from chanakya.store import ChanakyaStore
 
 
@@ -156,6 +157,75 @@ def test_delete_work_cascades_to_notifications() -> None:
     assert len(pending) == 0
 
 
+def test_delete_work_removes_session_graph_but_not_other_works(tmp_path) -> None:
+    store = _build_store()
+    for work_id in ("w1", "w2"):
+        store.create_work(work_id=work_id, title=work_id, description="")
+        session_id = f"{work_id}_session"
+        store.ensure_work_agent_session(
+            work_id=work_id, agent_id="agent", session_id=session_id, session_title=work_id
+        )
+        store.add_message(session_id, "user", "hello")
+        store.create_request(
+            request_id=f"{work_id}_req", session_id=session_id, user_message="hi", status="done"
+        )
+        store.create_task(
+            task_id=f"{work_id}_task",
+            request_id=f"{work_id}_req",
+            parent_task_id=None,
+            title="task",
+            summary=None,
+            status="done",
+            owner_agent_id=None,
+            task_type="root",
+        )
+        store.create_task_event(
+            session_id=session_id, task_id=f"{work_id}_task", event_type="step", payload={}
+        )
+        for target_key in (None, "remote"):
+            store.save_agent_session_context(
+                session_id,
+                backend="a2a",
+                remote_context_id="ctx",
+                remote_agent_url=None,
+                target_key=target_key,
+            )
+        store.create_artifact(
+            artifact_id=f"{work_id}_artifact",
+            request_id=f"{work_id}_req",
+            session_id=session_id,
+            work_id=work_id,
+            name="a.txt",
+            path="a.txt",
+            mime_type="text/plain",
+            kind="text",
+            size_bytes=1,
+        )
+
+    session_ids, artifact_ids = store.delete_work("w1")
+
+    assert session_ids == ["w1_session"]
+    assert artifact_ids == ["w1_artifact"]
+    assert store.list_messages("w1_session") == []
+    assert store.list_tasks(session_id="w1_session") == []
+    assert store.list_task_events(session_id="w1_session") == []
+    assert store.get_agent_session_context("w1_session", target_key="remote")["backend"] is None
+    assert [task["id"] for task in store.list_tasks(session_id="w2_session")] == ["w2_task"]
+    assert len(store.list_messages("w2_session")) == 1
+    assert store.get_agent_session_context("w2_session", target_key="remote")["backend"] == "a2a"
+    with pytest.raises(KeyError):
+        store.delete_work("w1")
+
+    artifact_dir = tmp_path / "w1_artifact"
+    (artifact_dir / "nested").mkdir(parents=True)
+    (artifact_dir / "nested" / "a.txt").write_text("x")
+    reaper = FileReaper()
+    assert reaper.schedule([artifact_dir, tmp_path / "missing"]) == 2
+    assert reaper.wait_idle(5)
+    assert not artifact_dir.exists()
+    assert reaper.reaped == 2
+
+
 def test_list_pending_since_filter() -> None:
     store = _build_store()
     n1 = store.work_notifications.create_notification(
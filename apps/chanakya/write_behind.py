@@ -0,0 +1 @@
+from chanakya.core.write_behind import *  # noqa: F401,F403
@@ -12,6 +12,7 @@ from sqlalchemy.orm import sessionmaker
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "apps")))
 
 from chanakya.config import get_database_url, load_local_env
+from chanakya.migrations import apply_migrations
 from chanakya.model import (
     AgentProfileModel,
     AppEventModel,
@@ -109,6 +110,10 @@ def update_database() -> None:
                     session.rollback()
                     logger.error("      -> Failed to add column: %s", exc)
 
+        logger.info("Applying pending schema migrations...")
+        applied = apply_migrations(engine)
+        logger.info("  -> Applied: %s", ", ".join(str(version) for version in applied) or "none")
+
         logger.info("Chanakya database update complete.")
     except Exception as exc:
         logger.error("Update failed: %s", exc)